@@ -0,0 +1,296 @@
+"""ASGI entry point: `uvicorn asgi:application`.
+
+The two routes that touch the question bank on every game, /start_game and
+/api/game, are handled natively here: the question is fetched through
+async_db (aiosqlite or aiomysql) and the bot moves run on the event loop,
+so waiting on the database doesn't tie up a worker thread. Rows prefetched
+by the question cache are used first, and the async sampler shares the sync
+sampler's index, so notify_questions_changed() reaches both. Everything else
+(the HTML pages, /game, /result, /metrics) is the unchanged Flask app, run
+through asgiref's WSGI adapter with each request on its own thread, and
+`python app.py` or any WSGI server still runs the app without any of this.
+
+Both sides share the Flask session cookie and the game store. The game
+store is synchronous (SQLite or files), so its calls run in a thread.
+"""
+import asyncio
+import json
+import logging
+import time
+from urllib.parse import parse_qsl
+
+from asgiref.sync import ThreadSensitiveContext
+from asgiref.wsgi import WsgiToAsgi
+from itsdangerous import BadSignature
+from werkzeug.http import dump_cookie, parse_cookie
+
+import app as web
+import game_engine
+import metrics
+from async_db import async_pool_from_env
+from game_engine import GameState, InvalidMove
+from game_store import get_game_store
+from question_cache import get_question_cache
+from question_sampler import AsyncQuestionSampler
+
+logger = logging.getLogger(__name__)
+
+
+class ConcurrentWsgiToAsgi(WsgiToAsgi):
+    """WsgiToAsgi with a ThreadSensitiveContext per request.
+
+    asgiref runs WSGI calls as thread-sensitive, which outside such a context
+    means one shared thread for the whole process and Flask pages served one
+    at a time. Django's ASGI handler opens the same context per request.
+    """
+
+    async def __call__(self, scope, receive, send):
+        async with ThreadSensitiveContext():
+            await super().__call__(scope, receive, send)
+
+
+flask_app = web.app
+wsgi_application = ConcurrentWsgiToAsgi(flask_app)
+
+_pool = None
+_sampler = None
+
+
+def get_sampler():
+    """The sampler for this event loop, created on first use if the server skipped lifespan."""
+    global _pool, _sampler
+    if _sampler is None:
+        _pool = async_pool_from_env()
+        # Shares the sync sampler's index: the question cache invalidates it when the stamp file changes
+        _sampler = AsyncQuestionSampler(_pool, index=get_question_cache().sampler.index)
+    return _sampler
+
+
+async def lifespan(receive, send):
+    global _pool, _sampler
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            try:
+                # Build the question index before the first player is waiting on it
+                await get_sampler().refresh()
+            except Exception as e:
+                logger.exception("Async startup failed")
+                await send({'type': 'lifespan.startup.failed', 'message': str(e)})
+                return
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            if _pool is not None:
+                await _pool.close()
+            _pool = _sampler = None
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+# Flask's session cookie, read and written the way SecureCookieSessionInterface does
+
+def load_session(scope):
+    interface = flask_app.session_interface
+    serializer = interface.get_signing_serializer(flask_app)
+    if serializer is None:
+        raise RuntimeError("SECRET_KEY must be set to use sessions")
+    cookies = parse_cookie(b'; '.join(value for name, value in scope['headers'] if name == b'cookie').decode('latin-1'))
+    value = cookies.get(interface.get_cookie_name(flask_app))
+    if not value:
+        return interface.session_class()
+    try:
+        data = serializer.loads(value, max_age=int(flask_app.permanent_session_lifetime.total_seconds()))
+    except BadSignature:
+        return interface.session_class()
+    return interface.session_class(data)
+
+
+def session_headers(session):
+    if not session.modified:
+        return []
+    interface = flask_app.session_interface
+    cookie_args = dict(domain=interface.get_cookie_domain(flask_app),
+                       path=interface.get_cookie_path(flask_app),
+                       secure=interface.get_cookie_secure(flask_app),
+                       httponly=interface.get_cookie_httponly(flask_app),
+                       samesite=interface.get_cookie_samesite(flask_app))
+    name = interface.get_cookie_name(flask_app)
+    if session:
+        value = interface.get_signing_serializer(flask_app).dumps(dict(session))
+        cookie = dump_cookie(name, value, expires=interface.get_expiration_time(flask_app, session), **cookie_args)
+    else:
+        cookie = dump_cookie(name, '', expires=0, max_age=0, **cookie_args)
+    return [(b'set-cookie', cookie.encode('latin-1')), (b'vary', b'Cookie')]
+
+
+def flash(session, message, category):
+    session.setdefault('_flashes', []).append((category, message))
+    session.modified = True
+
+
+def pop_flashes(session):
+    flashes = session.pop('_flashes', [])
+    if flashes:
+        session.modified = True
+    return [tuple(entry) for entry in flashes]
+
+
+async def read_body(receive):
+    chunks = []
+    while True:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            break
+        chunks.append(message.get('body', b''))
+        if not message.get('more_body'):
+            break
+    return b''.join(chunks)
+
+
+async def read_form(scope, receive):
+    """The request body as a dict: JSON objects as-is, anything else parsed as a urlencoded form."""
+    body = await read_body(receive)
+    content_type = dict(scope['headers']).get(b'content-type', b'')
+    if content_type.startswith(b'application/json'):
+        try:
+            data = json.loads(body)
+        except ValueError:
+            return {}
+        return data if isinstance(data, dict) else {}
+    return dict(parse_qsl(body.decode('utf-8', 'replace'), keep_blank_values=True))
+
+
+async def respond(send, status, headers, body=b''):
+    await send({'type': 'http.response.start', 'status': status,
+                'headers': headers + [(b'content-length', str(len(body)).encode())]})
+    await send({'type': 'http.response.body', 'body': body})
+
+
+async def redirect(scope, send, session, path):
+    location = (scope.get('root_path', '') + path).encode('latin-1')
+    await respond(send, 302, [(b'location', location)] + session_headers(session))
+    return 302
+
+
+async def respond_json(send, session, data, status=200):
+    body = flask_app.json.dumps(data).encode()
+    await respond(send, status, [(b'content-type', b'application/json')] + session_headers(session), body)
+    return status
+
+
+async def load_game_state(session, route):
+    game_id = session.get('game_id')
+    if game_id is None:
+        return None
+    with web.PHASE_SECONDS.time(route, 'store_load'):
+        data = await asyncio.to_thread(get_game_store().load, game_id)
+    if not data:
+        return None
+    with web.PHASE_SECONDS.time(route, 'deserialize'):
+        return GameState.from_dict(data)
+
+
+async def save_game_state(session, game_state, route):
+    with web.PHASE_SECONDS.time(route, 'serialize'):
+        data = game_state.to_dict()
+    with web.PHASE_SECONDS.time(route, 'store_save'):
+        if session.get('game_id') is None:
+            session['game_id'] = await asyncio.to_thread(get_game_store().create, data)
+        else:
+            await asyncio.to_thread(get_game_store().save, session['game_id'], data)
+
+
+async def fetch_question(route):
+    """A random question, from the question cache's prefetched rows when it has one ready."""
+    with web.PHASE_SECONDS.time(route, 'db_fetch'):
+        cache = get_question_cache()
+        question_data = cache.take_prefetched()
+        if question_data is None:
+            question_data = await get_sampler().sample()
+            if question_data is not None:
+                cache.store(question_data)
+        return question_data
+
+
+async def start_game(scope, receive, send):
+    """Async version of app.start_game."""
+    session = load_session(scope)
+    form = await read_form(scope, receive)
+    if 'game_mode' not in form or 'bot_type' not in form:
+        await respond(send, 400, [(b'content-type', b'text/plain')], b"Bad Request\n")
+        return 400
+    game_mode = form['game_mode']
+
+    if game_mode == 'single':
+        game_state = web.new_single_game(await fetch_question('start_game'))
+    elif game_mode == 'battle':
+        game_state = web.new_battle_game(await fetch_question('start_game'), form['bot_type'])
+    else:
+        flash(session, "Invalid game mode selected.", 'error')
+        return await redirect(scope, send, session, '/')
+
+    if not game_state:
+        flash(session, "Failed to initialize game.", 'error')
+        return await redirect(scope, send, session, '/')
+
+    session.pop('game_id', None)
+    await save_game_state(session, game_state, 'start_game')
+    return await redirect(scope, send, session, '/game')
+
+
+async def api_game(scope, receive, send):
+    """Async version of app.api_game: same JSON, same messages."""
+    session = load_session(scope)
+    form = await read_form(scope, receive) if scope['method'] == 'POST' else {}
+    game_state = await load_game_state(session, 'api_game')
+    if not game_state:
+        return await respond_json(send, session, {'error': 'No game in progress.'}, 404)
+
+    # Flashes left over from earlier requests come out first, as get_flashed_messages() would return them
+    messages = pop_flashes(session)
+    accepted = False
+    if not game_state.game_over:
+        if game_state.current_mover == 'player' and scope['method'] == 'POST':
+            try:
+                accepted = web.apply_move(game_state, form)
+            except InvalidMove as e:
+                messages.append(('error', str(e)))
+
+        async def next_round(state):
+            return web.next_round(state, await fetch_question('api_game'))
+
+        with web.PHASE_SECONDS.time('api_game', 'bot_decision'):
+            messages.extend(await game_engine.advance_async(game_state, next_round))
+        await save_game_state(session, game_state, 'api_game')
+
+    return await respond_json(send, session, {
+        'accepted': accepted,
+        'game_state': web.public_state(game_state),
+        'messages': messages,
+        'result_url': scope.get('root_path', '') + '/result' if game_state.game_over else None,
+    })
+
+
+ROUTES = {
+    ('POST', '/start_game'): start_game,
+    ('GET', '/api/game'): api_game,
+    ('POST', '/api/game'): api_game,
+}
+
+
+async def application(scope, receive, send):
+    if scope['type'] == 'lifespan':
+        return await lifespan(receive, send)
+    handler = ROUTES.get((scope.get('method'), scope.get('path'))) if scope['type'] == 'http' else None
+    if handler is None:
+        return await wsgi_application(scope, receive, send)
+
+    # The Flask hooks time the delegated routes; these get the same histogram (no cProfile: it can't follow a coroutine)
+    started = time.perf_counter()
+    status = 500
+    try:
+        status = await handler(scope, receive, send)
+    finally:
+        if metrics.enabled:
+            web.REQUEST_SECONDS.observe(time.perf_counter() - started,
+                                        handler.__name__, scope['method'], str(status))
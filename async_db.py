@@ -0,0 +1,133 @@
+"""Async counterpart of db_pool for the ASGI app (asgi.py).
+
+The engine and its settings come from db_pool.backend_from_env(), but
+connections come from aiosqlite or aiomysql and every query is awaited, so
+a request waiting on the database doesn't hold a thread. The drivers are
+only imported when a connection is opened; install requirements-async.txt
+to use them.
+"""
+import asyncio
+import os
+from contextlib import asynccontextmanager
+
+from db_pool import PoolTimeout, _dict_factory, backend_from_env
+
+
+class AsyncBackend:
+    """Async connections for the engine a db_pool StorageBackend is configured for.
+
+    Takes its settings (and name, param and random_func) from that backend,
+    so the sync and async servers read the same configuration.
+    """
+
+    def __init__(self, backend):
+        self.config = backend
+        self.name = backend.name
+        self.param = backend.param
+        self.random_func = backend.random_func
+
+
+class AsyncSQLiteBackend(AsyncBackend):
+    async def connect(self):
+        import aiosqlite  # only needed when the async app is actually in use
+        conn = await aiosqlite.connect(self.config.path, timeout=self.config.busy_timeout)
+        conn.row_factory = _dict_factory
+        # Like SQLiteBackend: WAL is left to init_db, which switches the file over once
+        async with conn.execute("PRAGMA journal_mode") as cursor:
+            if (await cursor.fetchone())['journal_mode'] == 'wal':
+                await conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    async def fetchall(self, conn, sql, params=()):
+        async with conn.execute(sql, params) as cursor:
+            return await cursor.fetchall()
+
+    async def close(self, conn):
+        await conn.close()
+
+
+class AsyncMySQLBackend(AsyncBackend):
+    async def connect(self):
+        import aiomysql  # only needed when the async app is actually in use
+        config = self.config
+        return await aiomysql.connect(host=config.host, user=config.user, password=config.password or '',
+                                      db=config.database, autocommit=True)
+
+    async def fetchall(self, conn, sql, params=()):
+        import aiomysql
+        async with conn.cursor(aiomysql.DictCursor) as cursor:
+            await cursor.execute(sql, params)
+            return await cursor.fetchall()
+
+    async def close(self, conn):
+        conn.close()
+
+
+ASYNC_BACKENDS = {'sqlite': AsyncSQLiteBackend, 'mysql': AsyncMySQLBackend}
+
+
+class AsyncConnectionPool:
+    """Fixed-size pool of async connections; waiting for one suspends the task instead of blocking a thread."""
+
+    def __init__(self, backend, pool_size=5, timeout=5.0):
+        if pool_size < 1:
+            raise ValueError("pool_size must be at least 1")
+        self.backend = backend
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self._idle = []
+        self._slots = asyncio.Semaphore(pool_size)
+        self._closed = False
+
+    @asynccontextmanager
+    async def connection(self):
+        if self._closed:
+            raise PoolTimeout("Connection pool is closed")
+        try:
+            await asyncio.wait_for(self._slots.acquire(), self.timeout)
+        except asyncio.TimeoutError:
+            raise PoolTimeout(f"No {self.backend.name} connection available after {self.timeout}s")
+        conn = None
+        healthy = False
+        try:
+            conn = self._idle.pop() if self._idle else await self.backend.connect()
+            yield conn
+            healthy = True
+        finally:
+            # Only a connection whose caller finished normally goes back. One that raised, or was
+            # cancelled mid-query (CancelledError isn't an Exception), may be mid-protocol
+            try:
+                if conn is not None:
+                    if healthy and not self._closed:
+                        self._idle.append(conn)
+                    else:
+                        await self.backend.close(conn)
+            finally:
+                self._slots.release()
+
+    async def fetchall(self, sql, params=()):
+        async with self.connection() as conn:
+            return await self.backend.fetchall(conn, sql, params)
+
+    async def close(self):
+        self._closed = True
+        while self._idle:
+            await self.backend.close(self._idle.pop())
+
+
+def async_backend(backend):
+    """The async counterpart of a db_pool StorageBackend."""
+    if backend.name not in ASYNC_BACKENDS:
+        raise ValueError(f"No async driver for the {backend.name} backend")
+    return ASYNC_BACKENDS[backend.name](backend)
+
+
+def async_backend_from_env():
+    return async_backend(backend_from_env())
+
+
+def async_pool_from_env():
+    """A new pool for the running event loop, sized by DB_POOL_SIZE and DB_POOL_TIMEOUT like the sync one."""
+    return AsyncConnectionPool(async_backend_from_env(),
+                               pool_size=int(os.environ.get('DB_POOL_SIZE', 5)),
+                               timeout=float(os.environ.get('DB_POOL_TIMEOUT', 5.0)))
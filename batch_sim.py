@@ -0,0 +1,178 @@
+"""Vectorized bot-vs-bot rounds for parameter sweeps.
+
+simulate_rounds() plays N independent rounds in lockstep, one array entry
+per round, following the same rules as simulation.play_round(): the
+player seat is driven by one bot class and the engine's bot by another.
+BatchBot is the NumPy mirror of the decision kernel in bot_strategies.py
+and reads the same Persona for each class, so it can't drift from the
+scalar bots when a persona is tuned or added. Random
+draws differ, so results match the scalar classes in distribution, not
+game by game.
+"""
+import numpy as np
+from bot_strategies import BOT_CLASSES
+
+# create_bot() passes these to every class unless told otherwise
+DEFAULT_PARAMS = {
+    'initial_estimate_noise': 0.5,
+    'width_reduction_multiplier': 0.9,
+    'market_willingness': 0.5,
+    'std_dev_multiplier': 4.0,
+}
+
+# Who was asked to quote when the round's market was made
+PLAYER_ASKED = 1  # the player called for a market, so the engine's bot quoted
+BOT_ASKED = 2  # the engine's bot called for a market, so the player seat quoted
+
+MAX_STEPS = 10000
+
+
+class BatchBot:
+    """One bot class with its parameters, applied to arrays of estimates."""
+
+    def __init__(self, bot_type_name, params=None):
+        if bot_type_name not in BOT_CLASSES:
+            raise ValueError(f"Unknown bot type: {bot_type_name}")
+        self.bot_type_name = bot_type_name
+        self.persona = BOT_CLASSES[bot_type_name].persona
+        params = dict(DEFAULT_PARAMS, **(params or {}))
+        self.noise = params['initial_estimate_noise']
+        self.width_reduction_multiplier = params['width_reduction_multiplier']
+        self.market_willingness = params['market_willingness']
+        self.std_dev_multiplier = params['std_dev_multiplier']
+
+    def initial_estimate(self, true_values, rng):
+        return true_values * (1 + rng.uniform(-self.noise, self.noise, len(true_values)))
+
+    def initial_width(self, estimates):
+        return np.rint(np.abs(estimates) * 2)
+
+    def validate_market(self, estimates, bid, ask):
+        min_value = np.maximum(0, np.rint(estimates - self.std_dev_multiplier * (np.abs(estimates) * self.noise)))
+        bid = np.maximum(np.rint(bid), min_value)
+        ask = np.maximum(np.rint(ask), np.rint(min_value + 1))
+        ask = np.where(bid >= ask, bid + 1, ask)
+        return bid, ask
+
+    def choose_market(self, estimates, true_values, widths, rng):
+        """Returns True where the bot calls for a market instead of reducing the width."""
+        if self.persona.threshold_factor is None:
+            return rng.random(len(estimates)) < 0.5
+        potential_bid = np.rint(estimates - widths / 2)
+        potential_ask = np.rint(estimates + widths / 2)
+        potential_loss = np.where(estimates > true_values, np.abs(estimates - potential_bid),
+                                  np.where(estimates < true_values, np.abs(potential_ask - estimates), widths / 2))
+        risk_threshold = np.abs(estimates) * self.noise * self.market_willingness
+        return potential_loss < risk_threshold * self.persona.threshold_factor
+
+    def make_market(self, estimates, widths, rng):
+        bid = np.rint(estimates - widths * self._draw(self.persona.market_factor, len(estimates), rng))
+        ask = np.rint(estimates + widths * self._draw(self.persona.market_factor, len(estimates), rng))
+        return self.validate_market(estimates, bid, ask)
+
+    @staticmethod
+    def _draw(value, n, rng):
+        return rng.uniform(value[0], value[1], n) if isinstance(value, tuple) else value
+
+    def trade_buys(self, estimates, bid, ask, rng):
+        """Returns True where the bot buys at the ask, False where it sells at the bid."""
+        coin = rng.random(len(estimates)) < 0.5
+        return np.where(bid < 1, estimates >= ask * 2,
+                        np.where(estimates > ask, True, np.where(estimates < bid, False, coin)))
+
+
+def simulate_rounds(player_type, opponent_type, true_values, player_params=None, opponent_params=None, rng=None):
+    """Plays one round per entry of true_values and returns a dict of per-round arrays.
+
+    player_damage/opponent_damage are the capital each side lost,
+    market_asked is PLAYER_ASKED or BOT_ASKED, width/bid/ask describe
+    the market that was traded and buys is True where the side that traded
+    on it bought.
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    true_values = np.asarray(true_values, dtype=float)
+    n = len(true_values)
+    player = BatchBot(player_type, player_params)
+    opponent = BatchBot(opponent_type, opponent_params)
+    player_estimates = player.initial_estimate(true_values, rng)
+    opponent_estimates = opponent.initial_estimate(true_values, rng)
+
+    # Whoever moves first sets the width, then the other side is on
+    player_moves = rng.random(n) < 0.5
+    width = np.where(player_moves, np.maximum(1, player.initial_width(player_estimates)),
+                     opponent.initial_width(opponent_estimates))
+    player_moves = ~player_moves
+    market_asked = np.zeros(n, dtype=np.int8)
+    active = np.ones(n, dtype=bool)
+
+    for _ in range(MAX_STEPS):
+        if not active.any():
+            break
+        player_turn = np.flatnonzero(active & player_moves)
+        opponent_turn = np.flatnonzero(active & ~player_moves)
+
+        if len(player_turn):
+            w = width[player_turn]
+            max_width = np.floor(w * 0.9)
+            calls = (max_width < 1) | player.choose_market(player_estimates[player_turn], true_values[player_turn], w, rng)
+            reduced = np.maximum(1, np.minimum(np.rint(w * player.width_reduction_multiplier), max_width))
+            width[player_turn] = np.where(calls, w, reduced)
+            market_asked[player_turn[calls]] = PLAYER_ASKED
+            active[player_turn[calls]] = False
+
+        if len(opponent_turn):
+            w = width[opponent_turn]
+            calls = opponent.choose_market(opponent_estimates[opponent_turn], true_values[opponent_turn], w, rng)
+            reduced = np.maximum(1, np.rint(w * opponent.width_reduction_multiplier))
+            width[opponent_turn] = np.where(calls, w, reduced)
+            market_asked[opponent_turn[calls]] = BOT_ASKED
+            active[opponent_turn[calls]] = False
+
+        player_moves = ~player_moves
+    else:
+        raise RuntimeError("Rounds did not finish within MAX_STEPS moves")
+
+    bid = np.zeros(n)
+    ask = np.zeros(n)
+    player_damage = np.zeros(n)
+    opponent_damage = np.zeros(n)
+    traded_buys = np.zeros(n, dtype=bool)
+
+    # Player called: the engine's bot quotes and the player trades on it
+    idx = np.flatnonzero(market_asked == PLAYER_ASKED)
+    if len(idx):
+        b, a = opponent.make_market(opponent_estimates[idx], width[idx], rng)
+        buys = player.trade_buys(player_estimates[idx], b, a, rng)
+        tv = true_values[idx]
+        price = np.where(buys, a, b)
+        damage = np.abs(tv - price)
+        player_loses = np.where(buys, tv < price, tv > price)
+        player_damage[idx] = np.where(player_loses, damage, 0)
+        opponent_damage[idx] = np.where(player_loses, 0, damage)
+        bid[idx], ask[idx] = b, a
+        traded_buys[idx] = buys
+
+    # Engine's bot called: the player quotes exactly the current width and the bot trades on it
+    idx = np.flatnonzero(market_asked == BOT_ASKED)
+    if len(idx):
+        b, _ = player.make_market(player_estimates[idx], width[idx], rng)
+        a = b + width[idx]
+        buys = opponent.trade_buys(opponent_estimates[idx], b, a, rng)
+        tv = true_values[idx]
+        price = np.where(buys, a, b)
+        damage = np.abs(tv - price)
+        opponent_loses = np.where(buys, price > tv, price < tv)
+        player_damage[idx] = np.where(opponent_loses, 0, damage)
+        opponent_damage[idx] = np.where(opponent_loses, damage, 0)
+        bid[idx], ask[idx] = b, a
+        traded_buys[idx] = buys
+
+    return {
+        'player_damage': player_damage,
+        'opponent_damage': opponent_damage,
+        'market_asked': market_asked,
+        'width': width,
+        'bid': bid,
+        'ask': ask,
+        'buys': traded_buys,
+    }
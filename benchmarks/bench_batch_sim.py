@@ -0,0 +1,72 @@
+"""Checks batch_sim against the scalar engine and times both.
+
+For each pairing, plays --scalar-rounds rounds through simulation.play_round()
+and --batch-rounds through batch_sim.simulate_rounds() on the same question
+distribution, then prints mean damage and market-call rates side by side.
+
+Usage: python benchmarks/bench_batch_sim.py [--batch-rounds 1000000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from batch_sim import simulate_rounds, PLAYER_ASKED
+from simulation import play_round
+
+PAIRINGS = [
+    ('AggressiveBot', 'PassiveBot'),
+    ('MarketLoverBot', 'MarketHaterBot'),
+    ('RandomBot', 'AggressiveBot'),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--scalar-rounds', type=int, default=20000)
+    parser.add_argument('--batch-rounds', type=int, default=1000000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    random.seed(args.seed)
+
+    print(f"{'pairing':<30} {'engine':>7} {'rounds/s':>12} {'player dmg':>12} {'opp dmg':>12} {'player calls':>13}")
+    for player_type, opponent_type in PAIRINGS:
+        # Log-uniform answers between 100 and 10M cover every question category's scale
+        scalar_values = np.exp(rng.uniform(np.log(100), np.log(1e7), args.scalar_rounds))
+        batch_values = np.exp(rng.uniform(np.log(100), np.log(1e7), args.batch_rounds))
+
+        started = time.perf_counter()
+        rounds = [play_round(player_type, opponent_type, {'question': 'Q', 'answer': float(v), 'units': 'x'})
+                  for v in scalar_values]
+        scalar_elapsed = time.perf_counter() - started
+        scalar = {
+            'player_damage': np.mean([r['player_damage'] for r in rounds]),
+            'opponent_damage': np.mean([r['opponent_damage'] for r in rounds]),
+            'player_calls': np.mean([r['market_asked'] == 'player' for r in rounds]),
+        }
+
+        started = time.perf_counter()
+        result = simulate_rounds(player_type, opponent_type, batch_values, rng=rng)
+        batch_elapsed = time.perf_counter() - started
+        batch = {
+            'player_damage': result['player_damage'].mean(),
+            'opponent_damage': result['opponent_damage'].mean(),
+            'player_calls': (result['market_asked'] == PLAYER_ASKED).mean(),
+        }
+
+        label = f"{player_type} v {opponent_type}"
+        for engine, stats, elapsed, count in (('scalar', scalar, scalar_elapsed, args.scalar_rounds),
+                                              ('batch', batch, batch_elapsed, args.batch_rounds)):
+            print(f"{label:<30} {engine:>7} {count / elapsed:>12,.0f} {stats['player_damage']:>12,.1f} "
+                  f"{stats['opponent_damage']:>12,.1f} {stats['player_calls']:>13.3f}")
+
+
+if __name__ == '__main__':
+    main()
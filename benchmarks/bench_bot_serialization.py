@@ -0,0 +1,62 @@
+"""Micro-benchmark of the per-request bot round trip.
+
+Compares Bot.to_dict()/from_dict() (the old session format, log included)
+with Bot.to_tuple()/from_tuple(), including the JSON encode/decode the game
+store does, and reports time, peak traced memory and encoded size per cycle.
+
+Usage: python benchmarks/bench_bot_serialization.py [--cycles 100000]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bot_strategies import Bot, MarketHaterBot
+
+
+def dict_cycle(bot):
+    return Bot.from_dict(json.loads(json.dumps(bot.to_dict())))
+
+
+def tuple_cycle(bot):
+    return Bot.from_tuple(json.loads(json.dumps(bot.to_tuple())))
+
+
+def measure(cycle, bot, cycles):
+    started = time.perf_counter()
+    for _ in range(cycles):
+        cycle(bot)
+    elapsed = time.perf_counter() - started
+
+    tracemalloc.start()
+    for _ in range(1000):
+        cycle(bot)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed / cycles * 1e6, peak
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--cycles', type=int, default=100000)
+    args = parser.parse_args()
+
+    bot = MarketHaterBot(1234567.0)
+    # A mid-round bot has a few decisions logged
+    for width in (100000, 80000, 64000):
+        bot.choose_action(width)
+    bot.make_market(64000)
+
+    print(f"{'format':<8} {'us/cycle':>9} {'bytes':>6} {'peak alloc (1k cycles)':>24}")
+    for name, cycle, encoded in (('dict', dict_cycle, json.dumps(bot.to_dict())),
+                                 ('tuple', tuple_cycle, json.dumps(bot.to_tuple()))):
+        per_cycle, peak = measure(cycle, bot, args.cycles)
+        print(f"{name:<8} {per_cycle:>9.2f} {len(encoded):>6} {peak:>24}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+"""Cookie size and serialization cost of keeping game_state in the session vs the game store.
+
+Plays a simulated 50-round battle (bot moves plus log growth like /bot_turn
+produces) and, after every turn, measures:
+  - the signed Flask session cookie holding the whole game_state (old behaviour)
+  - the signed cookie holding only a game id, plus a save to each GameStore backend
+
+Usage: python benchmarks/bench_game_state.py [--rounds 50]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+from bot_strategies import AggressiveBot
+from game_store import MemoryGameStore, SQLiteGameStore, FileGameStore, new_game_id
+
+
+def play_turns(game_state, rounds, rng):
+    """Yields game_state after every bot move of a simulated battle."""
+    for _ in range(rounds):
+        true_answer = rng.uniform(100, 10000000)
+        bot = AggressiveBot(true_answer)
+        game_state.update({
+            'question': f"What is the population of City{rng.randint(0, 1000)}? (in people)",
+            'true_answer': true_answer,
+            'current_width': bot.generate_initial_width(),
+            'market_made': False,
+            'bid': None,
+            'ask': None,
+        })
+        game_state['bot_log'].append(f"Bot set initial width: {game_state['current_width']}")
+        while game_state['current_width'] > 1:
+            bot.update_belief('reduce_width', game_state['current_width'])
+            action = bot.choose_action(game_state['current_width'])
+            game_state['bot_log'].append(f"Bot chooses to: {action}")
+            game_state['current_width'] = max(1, int(game_state['current_width'] * 0.8))
+            game_state['bot'] = bot.to_dict()
+            yield game_state
+            if action == 'make_market':
+                break
+        bid, ask = bot.make_market(game_state['current_width'])
+        game_state.update({'bid': bid, 'ask': ask, 'market_made': True})
+        game_state['bot_log'].append(f"Bot made market: Bid={bid}, Ask={ask}")
+        game_state['bot'] = bot.to_dict()
+        yield game_state
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rounds', type=int, default=50)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    app.secret_key = 'benchmark'
+    serializer = app.session_interface.get_signing_serializer(app)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        stores = {
+            'memory': MemoryGameStore(),
+            'sqlite': SQLiteGameStore(os.path.join(tmp, 'games.db')),
+            'file': FileGameStore(os.path.join(tmp, 'games')),
+        }
+        game_id = new_game_id()
+        id_cookie = serializer.dumps({'game_id': game_id})
+
+        game_state = {'mode': 'battle', 'player_capital': 10000, 'bot_capital': 10000, 'bot_log': []}
+        turns = 0
+        cookie_time = 0.0
+        store_time = {name: 0.0 for name in stores}
+        sizes = []
+        for state in play_turns(game_state, args.rounds, random.Random(args.seed)):
+            turns += 1
+            started = time.perf_counter()
+            cookie = serializer.dumps({'game_state': state})
+            serializer.loads(cookie)
+            cookie_time += time.perf_counter() - started
+            sizes.append(len(cookie))
+            for name, store in stores.items():
+                started = time.perf_counter()
+                store.save(game_id, state)
+                store.load(game_id)
+                store_time[name] += time.perf_counter() - started
+
+    print(f"{args.rounds} rounds, {turns} bot turns")
+    print(f"cookie bytes, full game_state: first {sizes[0]}, median {sorted(sizes)[len(sizes) // 2]}, last {sizes[-1]} "
+          f"(browsers cap cookies at ~4096)")
+    print(f"cookie bytes, game id only:    {len(id_cookie)}")
+    print(f"{'backend':<22} {'us per turn (encode+decode / save+load)':>40}")
+    print(f"{'cookie session':<22} {cookie_time / turns * 1e6:>40.1f}")
+    for name, elapsed in store_time.items():
+        print(f"{'store: ' + name:<22} {elapsed / turns * 1e6:>40.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,331 @@
+"""Load test: concurrent players driving whole games through the web app.
+
+Each virtual user plays games back to back: GET / -> POST /start_game ->
+(POST /game with a move, GET /api/game to see the result) until the game is
+over -> GET /result. Moves are picked at random from the public game state,
+like a player who doesn't know the answer. Bot turns and round changes
+happen inside /game, so there are no /bot_turn redirects to follow any more.
+
+Targets:
+- default: the Flask test client, in this process (one worker, no network)
+- --serve: the app on a local threaded HTTP server, driven over real sockets
+- --url: an already running server (it must have questions and SECRET_KEY)
+
+Unless --url is given, the app runs on a temporary SQLite question bank of
+--questions synthetic rows (or --sqlite PATH) with a SQLite game store, so
+nothing outside this process is needed.
+
+Reports throughput, p50/p95/p99 latency per route and error rates; --json
+writes the same numbers to a file for tracking across commits.
+
+Usage:
+    python benchmarks/bench_load.py --users 8 --duration 30
+    python benchmarks/bench_load.py --serve --users 32 --mode battle --json load.json
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from http.cookiejar import CookieJar
+from urllib.error import HTTPError, URLError
+from urllib.parse import urlencode, urljoin
+from urllib.request import HTTPCookieProcessor, HTTPRedirectHandler, build_opener
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'scripts'))
+
+BOT_TYPES = ['AggressiveBot', 'PassiveBot', 'RandomBot', 'MarketLoverBot', 'MarketHaterBot']
+TAGS = [('population,city', 'people'), ('length,river', 'km'), ('elevation,mountain', 'meters'),
+        ('employees,company', 'employees')]
+MAX_MOVES = 500
+
+
+class TestClientTransport:
+    """One Flask test client per user: cookies persist, redirects aren't followed."""
+
+    def __init__(self, app):
+        self.client = app.test_client()
+
+    def request(self, method, path, form=None):
+        response = self.client.open(path, method=method, data=form)
+        return response.status_code, response.headers.get('Location'), response.get_data()
+
+
+class _NoRedirect(HTTPRedirectHandler):
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+class HTTPTransport:
+    """urllib with a cookie jar per user; redirects come back as responses so each hop is timed."""
+
+    def __init__(self, base_url, timeout=30):
+        self.base_url = base_url
+        self.timeout = timeout
+        self.opener = build_opener(HTTPCookieProcessor(CookieJar()), _NoRedirect)
+
+    def request(self, method, path, form=None):
+        data = urlencode(form).encode() if form is not None else None
+        try:
+            with self.opener.open(urljoin(self.base_url, path), data=data, timeout=self.timeout) as response:
+                return response.status, response.headers.get('Location'), response.read()
+        except HTTPError as e:
+            return e.code, e.headers.get('Location'), e.read()
+
+
+class Stats:
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.statuses = defaultdict(lambda: defaultdict(int))
+        self.errors = defaultdict(int)
+        self.games = 0
+        self.failed_games = 0
+        self._lock = threading.Lock()
+
+    def record(self, route, seconds, status):
+        with self._lock:
+            self.latencies[route].append(seconds)
+            self.statuses[route][status] += 1
+
+    def error(self, kind):
+        with self._lock:
+            self.errors[kind] += 1
+
+    def game_done(self, ok):
+        with self._lock:
+            self.games += 1
+            if not ok:
+                self.failed_games += 1
+
+
+class GameFailed(Exception):
+    pass
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+def choose_move(state, rng):
+    """A form for /game: a random but legal move given the public state."""
+    width = state['current_width']
+    if width is None:
+        return {'initial_width': rng.randint(50, 5000000)}
+    if state['market_made']:
+        return {'action': 'trade', 'trade_action': rng.choice(['buy', 'sell'])}
+    if state['market_maker'] == 'bot':
+        bid = rng.randint(0, 1000000)
+        return {'action': 'provide_market', 'bid': bid, 'ask': bid + width}
+    if rng.random() < 0.3 or width <= 1:
+        return {'action': 'make_market'}
+    return {'action': 'reduce_width', 'width': max(1, int(width * 0.8))}
+
+
+class VirtualUser:
+    def __init__(self, transport, stats, rng, mode):
+        self.transport = transport
+        self.stats = stats
+        self.rng = rng
+        self.mode = mode
+
+    def call(self, route, method, path, form=None, expect=(200, 302)):
+        started = time.perf_counter()
+        try:
+            status, location, body = self.transport.request(method, path, form)
+        except (URLError, OSError) as e:
+            self.stats.error(type(e).__name__)
+            raise GameFailed(route)
+        self.stats.record(route, time.perf_counter() - started, status)
+        if status not in expect:
+            self.stats.error(f"{route} {status}")
+            raise GameFailed(route)
+        return status, location, body
+
+    def play_game(self):
+        mode = self.mode if self.mode != 'mixed' else self.rng.choice(['single', 'battle'])
+        self.call('/', 'GET', '/')
+        _, location, _ = self.call('/start_game', 'POST', '/start_game',
+                                   {'game_mode': mode, 'bot_type': self.rng.choice(BOT_TYPES)})
+        if not location or not location.rstrip('/').endswith('/game'):
+            self.stats.error('start_game failed')
+            raise GameFailed('/start_game')
+        self.call('/game', 'GET', '/game')
+        for _ in range(MAX_MOVES):
+            _, _, body = self.call('/api/game', 'GET', '/api/game', expect=(200,))
+            payload = json.loads(body)
+            if payload['result_url']:
+                self.call('/result', 'GET', '/result', expect=(200,))
+                return
+            self.call('/game', 'POST', '/game', choose_move(payload['game_state'], self.rng))
+        self.stats.error('move limit')
+        raise GameFailed('move limit')
+
+    def run(self, deadline, games_left):
+        while time.perf_counter() < deadline and games_left():
+            try:
+                self.play_game()
+                self.stats.game_done(True)
+            except GameFailed:
+                self.stats.game_done(False)
+
+
+def make_question_bank(path, rows, seed):
+    from db_pool import ConnectionPool, SQLiteBackend
+    from load_questions import ensure_schema, bulk_load
+    rng = random.Random(seed)
+    pool = ConnectionPool(SQLiteBackend(path), pool_size=1)
+    ensure_schema(pool)
+    questions = []
+    for i in range(rows):
+        tags, units = TAGS[i % len(TAGS)]
+        questions.append((f"How big is load test thing {i}?", round(10 ** rng.uniform(2, 7), 1), units, tags))
+    bulk_load(pool, questions, batch_size=5000)
+    pool.close()
+
+
+def configure_app_env(tmp, args):
+    """Points the app at temporary SQLite files; must run before app is imported."""
+    sqlite_path = args.sqlite or os.path.join(tmp, 'questions.db')
+    if not args.sqlite:
+        make_question_bank(sqlite_path, args.questions, args.seed)
+    os.environ.update({
+        'DB_BACKEND': 'sqlite',
+        'SQLITE_PATH': sqlite_path,
+        'GAME_STORE': args.game_store,
+        'GAME_STORE_PATH': os.path.join(tmp, 'games.db' if args.game_store == 'sqlite' else 'games'),
+        'QUESTION_CACHE_STAMP': os.path.join(tmp, 'questions_version'),
+        'LOG_FILE': os.path.join(tmp, 'app.log'),
+        'TRADE_LOG': os.path.join(tmp, 'trades.jsonl'),
+    })
+    os.environ.setdefault('SECRET_KEY', 'load-test')
+
+
+def serve(app):
+    from werkzeug.serving import make_server
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+def summarize(stats, elapsed):
+    routes = {}
+    for route, values in sorted(stats.latencies.items()):
+        values = sorted(values)
+        errors = sum(count for status, count in stats.statuses[route].items() if status >= 400)
+        routes[route] = {
+            'requests': len(values),
+            'errors': errors,
+            'p50_ms': percentile(values, .50) * 1000,
+            'p95_ms': percentile(values, .95) * 1000,
+            'p99_ms': percentile(values, .99) * 1000,
+        }
+    everything = sorted(v for values in stats.latencies.values() for v in values)
+    total = len(everything)
+    return {
+        'seconds': elapsed,
+        'games': stats.games,
+        'failed_games': stats.failed_games,
+        'requests': total,
+        'requests_per_s': total / elapsed if elapsed else 0.0,
+        'games_per_s': stats.games / elapsed if elapsed else 0.0,
+        'error_rate': sum(stats.errors.values()) / total if total else 0.0,
+        'p50_ms': percentile(everything, .50) * 1000,
+        'p95_ms': percentile(everything, .95) * 1000,
+        'p99_ms': percentile(everything, .99) * 1000,
+        'errors': dict(stats.errors),
+        'routes': routes,
+    }
+
+
+def print_report(summary, label):
+    print(f"{label}: {summary['games']} games ({summary['failed_games']} failed), {summary['requests']} requests "
+          f"in {summary['seconds']:.1f}s")
+    print(f"throughput {summary['requests_per_s']:,.0f} req/s, {summary['games_per_s']:,.1f} games/s, "
+          f"error rate {summary['error_rate']:.2%}")
+    print(f"{'route':<12} {'requests':>9} {'errors':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for route, row in summary['routes'].items():
+        print(f"{route:<12} {row['requests']:>9} {row['errors']:>7} {row['p50_ms']:>8.2f} {row['p95_ms']:>8.2f} "
+              f"{row['p99_ms']:>8.2f}")
+    print(f"{'all':<12} {summary['requests']:>9} {'':>7} {summary['p50_ms']:>8.2f} {summary['p95_ms']:>8.2f} "
+          f"{summary['p99_ms']:>8.2f}")
+    for kind, count in sorted(summary['errors'].items()):
+        print(f"  error: {kind} x{count}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Drive concurrent games through the web app")
+    parser.add_argument('--users', type=int, default=8, help="concurrent virtual players")
+    parser.add_argument('--duration', type=float, default=20, help="seconds to run")
+    parser.add_argument('--games', type=int, help="stop after this many games instead of at --duration")
+    parser.add_argument('--mode', choices=['single', 'battle', 'mixed'], default='mixed')
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument('--serve', action='store_true', help="run the app on a local HTTP server")
+    target.add_argument('--url', help="load an already running server instead")
+    parser.add_argument('--questions', type=int, default=1000, help="synthetic questions in the temporary bank")
+    parser.add_argument('--sqlite', help="use this questions database instead of a synthetic one")
+    parser.add_argument('--game-store', choices=['sqlite', 'memory', 'file'], default='sqlite')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', help="also write the summary to this file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        server = None
+        if args.url:
+            base_url = args.url
+            label = args.url
+        else:
+            configure_app_env(tmp, args)
+            from app import app
+            if args.serve:
+                server, base_url = serve(app)
+                label = f"local HTTP server {base_url}"
+            else:
+                label = "Flask test client"
+
+        def transport():
+            return HTTPTransport(base_url) if (args.url or args.serve) else TestClientTransport(app)
+
+        stats = Stats()
+        remaining = [args.games]
+        remaining_lock = threading.Lock()
+
+        def games_left():
+            if remaining[0] is None:
+                return True
+            with remaining_lock:
+                if remaining[0] <= 0:
+                    return False
+                remaining[0] -= 1
+                return True
+
+        deadline = time.perf_counter() + (args.duration if args.games is None else float('inf'))
+        users = [VirtualUser(transport(), stats, random.Random(args.seed * 1000 + i), args.mode)
+                 for i in range(args.users)]
+        threads = [threading.Thread(target=user.run, args=(deadline, games_left)) for user in users]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+        if server:
+            server.shutdown()
+
+        summary = summarize(stats, elapsed)
+        summary['config'] = {key: value for key, value in vars(args).items() if key != 'json'}
+        print_report(summary, f"{label}, {args.users} users, {args.mode}")
+        if args.json:
+            with open(args.json, 'w') as f:
+                json.dump(summary, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,134 @@
+"""Compares streamed question export/import with row-by-row SELECT/INSERT.
+
+Builds a SQLite questions table, then times moving it to a file and back
+into a fresh table: one query per row against scripts/question_bank.py's
+chunked export and bulk import, in both file formats. Peak Python memory is
+measured in a second, tracemalloc-instrumented run of each.
+
+Usage: python benchmarks/bench_question_io.py [--rows 100000]
+"""
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'scripts'))
+
+from db_pool import ConnectionPool, SQLiteBackend
+from load_questions import ensure_schema
+from question_bank import export_questions, import_questions
+
+TAGS = ['population,city', 'length,river', 'elevation,mountain', 'employees,company']
+
+
+def build_db(path, rows):
+    pool = ConnectionPool(SQLiteBackend(path), pool_size=1)
+    ensure_schema(pool)
+    pool.close()
+    conn = sqlite3.connect(path)
+    conn.executemany(
+        "INSERT INTO questions (question, answer, units, tags) VALUES (?, ?, ?, ?)",
+        ((f"What is the size of thing {i}?", float(i + 1), 'units', TAGS[i % len(TAGS)]) for i in range(rows))
+    )
+    conn.commit()
+    conn.close()
+
+
+def row_by_row_export(db_path, out_path):
+    conn = sqlite3.connect(db_path)
+    ids = [row[0] for row in conn.execute("SELECT id FROM questions ORDER BY id")]
+    with open(out_path, 'w') as f:
+        for question_id in ids:
+            question, answer, units, tags = conn.execute(
+                "SELECT question, answer, units, tags FROM questions WHERE id = ?", (question_id,)).fetchone()
+            f.write(json.dumps({'question': question, 'answer': answer, 'units': units, 'tags': tags}) + '\n')
+    conn.close()
+
+
+def row_by_row_import(in_path, db_path):
+    # The old populate_db pattern: look each question up, then insert it
+    conn = sqlite3.connect(db_path)
+    with open(in_path) as f:
+        for line in f:
+            row = json.loads(line)
+            if not conn.execute("SELECT id FROM questions WHERE question = ?", (row['question'],)).fetchone():
+                conn.execute("INSERT INTO questions (question, answer, units, tags) VALUES (?, ?, ?, ?)",
+                             (row['question'], row['answer'], row['units'], row['tags']))
+    conn.commit()
+    conn.close()
+
+
+def fresh_pool(path):
+    if os.path.exists(path):
+        os.remove(path)
+    return ConnectionPool(SQLiteBackend(path), pool_size=1)
+
+
+def measure(fn):
+    started = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - started
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--row-by-row-limit', type=int, default=20000,
+                        help="row-by-row import is quadratic without an index, so it only runs up to this many rows")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, 'source.db')
+        build_db(source, args.rows)
+        source_pool = ConnectionPool(SQLiteBackend(source), pool_size=1)
+        target = os.path.join(tmp, 'target.db')
+        files = {name: os.path.join(tmp, f"questions{ext}") for name, ext in (('jsonl', '.jsonl'), ('binary', '.ttqb'))}
+
+        def streamed_import(path):
+            def run():
+                pool = fresh_pool(target)
+                import_questions(pool, path, batch_size=10000)
+                pool.close()
+            return run
+
+        def plain_import():
+            fresh_pool(target).close()
+            conn = sqlite3.connect(target)
+            conn.execute("CREATE TABLE questions (id INTEGER PRIMARY KEY AUTOINCREMENT, question TEXT NOT NULL, "
+                         "answer REAL NOT NULL, units TEXT NOT NULL, tags TEXT)")
+            conn.commit()
+            conn.close()
+            row_by_row_import(files['jsonl'], target)
+
+        cases = [
+            ('export', 'row-by-row SELECT', lambda: row_by_row_export(source, files['jsonl'])),
+            ('export', 'streamed jsonl', lambda: export_questions(source_pool, files['jsonl'])),
+            ('export', 'streamed binary', lambda: export_questions(source_pool, files['binary'])),
+            ('import', 'streamed jsonl', streamed_import(files['jsonl'])),
+            ('import', 'streamed binary', streamed_import(files['binary'])),
+        ]
+        if args.rows <= args.row_by_row_limit:
+            cases.insert(3, ('import', 'row-by-row INSERT', plain_import))
+
+        print(f"{args.rows} rows")
+        print(f"{'direction':<10} {'method':<20} {'seconds':>9} {'rows/s':>12} {'peak MiB':>9}")
+        for direction, method, fn in cases:
+            elapsed, peak = measure(fn)
+            print(f"{direction:<10} {method:<20} {elapsed:>9.2f} {args.rows / elapsed:>12,.0f} {peak / 2 ** 20:>9.2f}")
+        print(f"file sizes: jsonl {os.path.getsize(files['jsonl']):,} bytes, binary {os.path.getsize(files['binary']):,} bytes")
+        source_pool.close()
+
+
+if __name__ == '__main__':
+    main()
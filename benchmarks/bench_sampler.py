@@ -0,0 +1,80 @@
+"""Compares ORDER BY RANDOM() with QuestionSampler as the questions table grows.
+
+Usage: python benchmarks/bench_sampler.py [--sizes 1000 10000 100000 1000000]
+"""
+import argparse
+import os
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db_pool import ConnectionPool, SQLiteBackend
+from question_sampler import QuestionSampler
+
+TAGS = ['population,city', 'length,river', 'elevation,mountain', 'employees,company']
+
+
+def build_db(path, rows):
+    conn = sqlite3.connect(path)
+    conn.execute("""
+        CREATE TABLE questions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            question TEXT NOT NULL,
+            answer REAL NOT NULL,
+            units TEXT NOT NULL,
+            tags TEXT
+        )
+    """)
+    conn.executemany(
+        "INSERT INTO questions (question, answer, units, tags) VALUES (?, ?, ?, ?)",
+        ((f"What is the size of thing {i}?", float(i + 1), 'units', TAGS[i % len(TAGS)]) for i in range(rows))
+    )
+    conn.commit()
+    conn.close()
+
+
+def time_calls(fn, iterations):
+    timings = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000, 1000000])
+    parser.add_argument('--iterations', type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'ORDER BY RANDOM() us':>22} {'sampler us':>12} {'sampler+tag us':>16} {'index build ms':>16}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in args.sizes:
+            path = os.path.join(tmp, f"questions_{rows}.db")
+            build_db(path, rows)
+            pool = ConnectionPool(SQLiteBackend(path), pool_size=1)
+            sampler = QuestionSampler(pool, refresh_interval=3600)
+
+            def order_by_random():
+                with pool.connection() as conn:
+                    conn.execute("SELECT * FROM questions ORDER BY RANDOM() LIMIT 1").fetchone()
+
+            started = time.perf_counter()
+            sampler.refresh()
+            build_ms = (time.perf_counter() - started) * 1000
+
+            # ORDER BY RANDOM() is a full scan + sort; cap its iterations so big tables finish
+            naive = time_calls(order_by_random, max(3, min(args.iterations, 2000000 // rows)))
+            sampled = time_calls(sampler.sample, args.iterations)
+            tagged = time_calls(lambda: sampler.sample('river'), args.iterations)
+            print(f"{rows:>10} {naive:>22.1f} {sampled:>12.1f} {tagged:>16.1f} {build_ms:>16.1f}")
+            pool.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,397 @@
+"""Micro-benchmarks of the hot paths, with saved baselines and regression checks.
+
+Covers question sampling (QuestionCache.random_question and the sampler's
+database path), create_bot, bot and game state serialization, every bot's
+choose_action/make_market/trade/update_belief/observe, and each damage
+formula (damage.FORMULAS, which replaced app.calculate_damage and the
+damage-calc.py options) both per trade and over a batch.
+
+Each benchmark is timed as --repeat samples of enough calls to last
+--min-time seconds, taken round-robin across benchmarks. --save writes a
+summary of each benchmark's samples to the baseline file: the sample count
+and deciles, one line per benchmark. --compare turns those back into the
+same number of evenly spaced baseline quantiles, runs a one-sided
+Mann-Whitney U test (scipy.stats.mannwhitneyu) of the new samples against
+them and flags a regression when the difference is significant (at --alpha,
+Holm-corrected across benchmarks) and the median is more than --threshold
+slower. It exits 1 if anything regressed.
+
+Every round also times a fixed pure-Python loop, and comparisons use each
+sample relative to that round's loop time, so a machine that is uniformly
+slower or faster than when the baseline was recorded (CPU frequency, a noisy
+neighbour) doesn't read as a regression. --absolute compares raw times.
+
+Baselines are only comparable on the machine and package versions that
+recorded them (both are saved with it, and --compare warns about any
+difference); record the committed one with requirements.txt installed, or
+record your own before a change and compare after it.
+
+Usage:
+    python benchmarks/microbench.py --save
+    python benchmarks/microbench.py --compare
+    python benchmarks/microbench.py --filter bot. --compare
+"""
+import argparse
+import gc
+import importlib.metadata
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+import numpy as np
+from scipy.stats import mannwhitneyu
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'scripts'))
+
+REQUIREMENTS = os.path.join(ROOT, 'requirements.txt')
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines', 'microbench.json')
+TAGS = [('population,city', 'people'), ('length,river', 'km'), ('elevation,mountain', 'meters'),
+        ('employees,company', 'employees')]
+BATCH = 10000
+REFERENCE = 'reference.python_loop'
+DECILES = list(range(0, 101, 10))
+
+
+def reference_loop():
+    # Fixed pure-Python work: tracks how fast the machine is running right now, not the code
+    total = 0
+    for i in range(200):
+        total += i * i
+    return total
+
+
+def question_benchmarks(tmp):
+    from db_pool import ConnectionPool, SQLiteBackend
+    from load_questions import ensure_schema, bulk_load
+    from question_sampler import QuestionSampler
+    from question_cache import QuestionCache
+
+    pool = ConnectionPool(SQLiteBackend(os.path.join(tmp, 'questions.db')), pool_size=2)
+    ensure_schema(pool)
+    bulk_load(pool, ((f"How big is thing {i}?", float(i + 1), units, tags)
+                     for i, (tags, units) in ((i, TAGS[i % len(TAGS)]) for i in range(10000))), batch_size=5000)
+    sampler = QuestionSampler(pool, rng=random.Random(0))
+    # Every row cached and no prefetch thread: the in-memory path a request normally takes, without a
+    # background thread refilling (and timing) at random
+    cache = QuestionCache(QuestionSampler(pool, rng=random.Random(0)), capacity=10000,
+                          stamp_path=os.path.join(tmp, 'questions_version'))
+    cache.random_question()
+    cache.stop()
+    for question_id in range(1, 10001):
+        cache.get(question_id)
+    return {
+        'questions.cache_random_question': lambda: cache.random_question(),
+        'questions.cache_random_question_tag': lambda: cache.random_question('river'),
+        'questions.sampler_sample': lambda: sampler.sample(),
+    }
+
+
+def engine_benchmarks():
+    import game_engine
+    from bot_strategies import Bot, BOT_CLASSES
+    from game_engine import GameState, create_bot
+
+    question = {'question': "How long is the Nile?", 'answer': 6650.0, 'units': 'km', 'tags': 'length,river'}
+    blind = create_bot(None, 'MarketHaterBot', question_data=question)
+    for width in (20000, 15000, 11000):
+        blind.observe('reduce_width', width)
+        blind.choose_action(width)
+    state = game_engine.new_game('battle', question, blind)
+    bot_dict, bot_tuple, state_dict = blind.to_dict(), blind.to_tuple(), state.to_dict()
+
+    benchmarks = {
+        'engine.create_bot_blind': lambda: create_bot(None, 'AggressiveBot', question_data=question),
+        'engine.create_bot_informed': lambda: create_bot(6650.0, 'AggressiveBot'),
+        'bot.to_dict': blind.to_dict,
+        'bot.from_dict': lambda: Bot.from_dict(bot_dict),
+        'bot.to_tuple': blind.to_tuple,
+        'bot.from_tuple': lambda: Bot.from_tuple(bot_tuple),
+        'game_state.to_dict': state.to_dict,
+        'game_state.from_dict': lambda: GameState.from_dict(state_dict),
+    }
+    for name, cls in sorted(BOT_CLASSES.items()):
+        informed = cls(6650.0)
+        blind = create_bot(None, name, question_data=question)
+        benchmarks.update({
+            f"bot.{name}.choose_action": lambda bot=informed: bot.choose_action(8000),
+            f"bot.{name}.choose_action_blind": lambda bot=blind: bot.choose_action(8000),
+            f"bot.{name}.make_market": lambda bot=informed: bot.make_market(8000),
+            f"bot.{name}.trade": lambda bot=informed: bot.trade(6000.0, 7000.0),
+            f"bot.{name}.update_belief": lambda bot=informed: bot.update_belief('reduce_width', 8000),
+            f"bot.{name}.observe": lambda bot=blind: bot.observe('reduce_width', 8000),
+        })
+    return benchmarks
+
+
+def damage_benchmarks():
+    from damage import FORMULAS
+
+    rng = np.random.default_rng(0)
+    answers = np.exp(rng.uniform(np.log(100), np.log(1e7), BATCH))
+    bids = answers * rng.uniform(0.5, 1.2, BATCH)
+    asks = bids * rng.uniform(1.01, 1.5, BATCH)
+    buys = rng.random(BATCH) < 0.5
+    benchmarks = {}
+    for name, formula in FORMULAS.items():
+        benchmarks[f"damage.{name}"] = lambda f=formula: f(6650.0, 6000.0, 7000.0, True)
+        benchmarks[f"damage.{name}.batch_{BATCH}"] = lambda f=formula: f(answers, bids, asks, buys)
+    return benchmarks
+
+
+def calibrate(fn, min_time):
+    """Calls per sample: doubled until a sample lasts at least min_time."""
+    # The first call can pay one-off costs (the sampler loading its index) that would fool the calibration
+    fn()
+    loops = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        if time.perf_counter() - started >= min_time:
+            return loops
+        loops *= 2
+
+
+def run_benchmarks(benchmarks, repeat, min_time):
+    """Returns {name: (samples of ns per call, calls per sample)}.
+
+    Samples are taken round-robin, one per benchmark per round, so a slow
+    stretch on a busy machine is spread over every benchmark instead of
+    landing on whichever one happened to be running.
+    """
+    loops = {}
+    for name, fn in benchmarks.items():
+        random.seed(0)
+        loops[name] = calibrate(fn, min_time)
+    samples = {name: [] for name in benchmarks}
+    # Like timeit: a collection landing in one sample and not another is noise, not a regression
+    gc_was_enabled = gc.isenabled()
+    try:
+        for _ in range(repeat):
+            for name, fn in benchmarks.items():
+                n = loops[name]
+                gc.collect()
+                gc.disable()
+                started = time.perf_counter()
+                for _ in range(n):
+                    fn()
+                samples[name].append((time.perf_counter() - started) / n * 1e9)
+                gc.enable()
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+        else:
+            gc.disable()
+    return {name: (samples[name], loops[name]) for name in benchmarks}
+
+
+def summarize(samples, loops, reference):
+    """Baseline entry for one benchmark: loops, sample count, median and deciles, raw and relative to the reference loop."""
+    relative = [sample / ref for sample, ref in zip(samples, reference)]
+    return {
+        'loops': loops,
+        'n': len(samples),
+        'median_ns': round(statistics.median(samples), 1),
+        'deciles_ns': [round(float(value), 1) for value in np.percentile(samples, DECILES)],
+        'deciles_relative': [round(float(value), 4) for value in np.percentile(relative, DECILES)],
+    }
+
+
+def from_deciles(deciles, n):
+    """n evenly spaced quantiles interpolated from saved deciles: the baseline's samples, as far as the summary keeps them."""
+    return np.interp((np.arange(n) + 0.5) / n, np.array(DECILES) / 100, deciles)
+
+
+def p_greater(a, b):
+    """One-sided Mann-Whitney U p-value that samples a tend to be larger than samples b."""
+    return float(mannwhitneyu(a, b, alternative='greater').pvalue)
+
+
+def machine_info():
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+    }
+
+
+def pinned_requirements():
+    """{package: version} for the == pins in requirements.txt."""
+    pins = {}
+    with open(REQUIREMENTS) as f:
+        for line in f:
+            name, sep, version = line.split('#')[0].strip().partition('==')
+            if sep:
+                pins[name.strip()] = version.strip()
+    return pins
+
+
+def installed_packages():
+    """Installed versions of the pinned packages (None if missing): numpy or scipy builds change the timings."""
+    versions = {}
+    for name in pinned_requirements():
+        try:
+            versions[name] = importlib.metadata.version(name)
+        except importlib.metadata.PackageNotFoundError:
+            versions[name] = None
+    return versions
+
+
+def environment_differences(recorded, current):
+    """'name: recorded -> current' for every field that differs between two {name: value} dicts."""
+    return [f"{name}: {recorded.get(name)} -> {current.get(name)}"
+            for name in sorted(set(recorded) | set(current)) if recorded.get(name) != current.get(name)]
+
+
+def warn_unpinned():
+    differences = environment_differences(pinned_requirements(), installed_packages())
+    if differences:
+        print(f"Warning: installed packages don't match requirements.txt ({'; '.join(differences)})")
+
+
+def holm_significant(p_values, alpha):
+    """Names whose p-value survives the Holm-Bonferroni correction for testing them all at once.
+
+    With ~50 benchmarks, an uncorrected alpha of 0.01 would flag one every
+    other run by chance alone.
+    """
+    significant = set()
+    ordered = sorted(p_values.items(), key=lambda item: item[1])
+    for rank, (name, p) in enumerate(ordered):
+        if p >= alpha / (len(ordered) - rank):
+            break
+        significant.add(name)
+    return significant
+
+
+def compare(results, samples, baseline, alpha, threshold, key='relative'):
+    """Prints a comparison table and returns the names of regressed benchmarks.
+
+    results are this run's summaries and samples its {name: {'ns': [...], 'relative': [...]}};
+    key picks which are compared: 'relative' (to the reference loop) or 'ns'.
+    """
+    compared = {}
+    for name in results:
+        base = baseline['benchmarks'].get(name)
+        if base is not None and name != REFERENCE:
+            compared[name] = (samples[name][key], from_deciles(base[f'deciles_{key}'], base['n']))
+    p_slower = {name: p_greater(now, base) for name, (now, base) in compared.items()}
+    p_faster = {name: p_greater(base, now) for name, (now, base) in compared.items()}
+    slower = holm_significant(p_slower, alpha)
+    faster = holm_significant(p_faster, alpha)
+
+    regressions = []
+    print(f"{'benchmark':<44} {'baseline':>10} {'now':>10} {'change':>8} {'p':>7}")
+    for name, result in results.items():
+        base = baseline['benchmarks'].get(name)
+        if base is None:
+            print(f"{name:<44} {'-':>10} {_ns(result['median_ns']):>10} {'new':>8}")
+            continue
+        if name not in compared:
+            # The reference loop itself: how much faster or slower the machine is running
+            print(f"{name:<44} {_ns(base['median_ns']):>10} {_ns(result['median_ns']):>10} "
+                  f"{result['median_ns'] / base['median_ns'] - 1:>+8.1%}")
+            continue
+        now_samples, base_samples = compared[name]
+        ratio = statistics.median(now_samples) / float(np.median(base_samples)) - 1
+        if name in slower and ratio > threshold:
+            verdict, p = 'REGRESSED', p_slower[name]
+            regressions.append(name)
+        elif name in faster and ratio < -threshold:
+            verdict, p = 'faster', p_faster[name]
+        else:
+            verdict, p = '', min(p_slower[name], p_faster[name])
+        print(f"{name:<44} {_ns(base['median_ns']):>10} {_ns(result['median_ns']):>10} {ratio:>+8.1%} {p:>7.3f} "
+              f"{verdict}")
+    return regressions
+
+
+def write_baseline(path, header, benchmarks):
+    """Writes the baseline JSON with one line per benchmark, so re-recording it gives a readable diff."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    entries = [f"  {json.dumps(name)}: {json.dumps(summary)}" for name, summary in sorted(benchmarks.items())]
+    with open(path, 'w') as f:
+        f.write('{\n')
+        for key, value in header.items():
+            f.write(f" {json.dumps(key)}: {json.dumps(value)},\n")
+        f.write(' "benchmarks": {\n' + ',\n'.join(entries) + '\n }\n}\n')
+
+
+def _ns(value):
+    if value >= 1e6:
+        return f"{value / 1e6:.2f}ms"
+    if value >= 1e3:
+        return f"{value / 1e3:.2f}us"
+    return f"{value:.0f}ns"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmark the hot paths against a saved baseline")
+    parser.add_argument('--filter', help="only run benchmarks whose name contains this")
+    parser.add_argument('--repeat', type=int, default=15, help="samples per benchmark")
+    parser.add_argument('--min-time', type=float, default=0.02, help="seconds per sample")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--save', action='store_true', help="write the results as the new baseline")
+    parser.add_argument('--compare', action='store_true', help="compare with the baseline, exit 1 on regressions")
+    parser.add_argument('--alpha', type=float, default=0.05, help="family-wise significance level")
+    parser.add_argument('--threshold', type=float, default=0.05, help="smallest slowdown worth flagging")
+    parser.add_argument('--absolute', action='store_true', help="compare raw times, not relative to the reference loop")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        benchmarks = {}
+        benchmarks.update(question_benchmarks(tmp))
+        benchmarks.update(engine_benchmarks())
+        benchmarks.update(damage_benchmarks())
+        if args.filter:
+            benchmarks = {name: fn for name, fn in benchmarks.items() if args.filter in name}
+        benchmarks[REFERENCE] = reference_loop
+
+        results = {}
+        samples = {}
+        timings = run_benchmarks(benchmarks, args.repeat, args.min_time)
+        reference = timings[REFERENCE][0]
+        for name, (ns, loops) in timings.items():
+            results[name] = summarize(ns, loops, reference)
+            samples[name] = {'ns': ns, 'relative': [sample / ref for sample, ref in zip(ns, reference)]}
+            if not args.compare:
+                print(f"{name:<44} {_ns(results[name]['median_ns']):>10}")
+
+    if args.compare:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        differences = (environment_differences(baseline.get('machine', {}), machine_info())
+                       + environment_differences(baseline.get('packages', {}), installed_packages()))
+        if differences:
+            print(f"Warning: baseline was recorded in a different environment ({'; '.join(differences)}); "
+                  f"timings may differ for that reason alone")
+        warn_unpinned()
+        regressions = compare(results, samples, baseline, args.alpha, args.threshold,
+                              'ns' if args.absolute else 'relative')
+        if regressions:
+            print(f"{len(regressions)} regressions: {', '.join(regressions)}")
+            sys.exit(1)
+        print("No regressions")
+
+    if args.save:
+        warn_unpinned()
+        if args.filter and os.path.exists(args.baseline):
+            # A filtered run only replaces the benchmarks it ran
+            with open(args.baseline) as f:
+                saved = json.load(f)['benchmarks']
+            saved.update(results)
+            results = saved
+        write_baseline(args.baseline, {'machine': machine_info(), 'packages': installed_packages(),
+                                       'recorded_at': time.strftime('%Y-%m-%d')}, results)
+        print(f"Saved {len(results)} benchmarks to {args.baseline}")
+
+
+if __name__ == '__main__':
+    main()
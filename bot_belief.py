@@ -0,0 +1,166 @@
+"""What a bot believes about the answer when it isn't told it.
+
+A Belief is a lognormal posterior over the answer, kept as the mean and
+variance of log(answer). It starts from a prior for the question's tags or
+units and is only ever updated from what the player does: the width they
+set, the widths they reduce to and the markets they quote. Every update is
+a closed-form Gaussian step in log space, so it costs a few float ops.
+
+Priors come from the table scripts/compute_priors.py writes from the
+questions table, loaded once per process. Categories it doesn't cover (or
+no table at all) fall back to the hand-set values below.
+"""
+import json
+import logging
+import math
+import os
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PRIORS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'question_priors.json')
+
+# (median, log-space standard deviation) by question tag, then by units.
+# Rough hand-set values covering what dbpedia_utils fetches.
+TAG_PRIORS = {
+    'population': (300000, 1.5),
+    'length': (300, 1.0),
+    'elevation': (2500, 0.6),
+    'employees': (5000, 2.0),
+}
+UNIT_PRIORS = {
+    'people': TAG_PRIORS['population'],
+    'km': TAG_PRIORS['length'],
+    'meters': TAG_PRIORS['elevation'],
+    'employees': TAG_PRIORS['employees'],
+}
+# Anything else: somewhere between 1 and a million, give or take
+DEFAULT_PRIOR = (1000, 3.0)
+
+# A width is taken as roughly twice the player's estimate, the same rule the bots use
+# for their own first width, but it's only a weak hint
+WIDTH_RATIO = 2.0
+WIDTH_LOG_SD = 1.0
+# A quoted market is centred on the player's estimate, which is usually within ~50%
+QUOTE_LOG_SD = 0.5
+# Never become certain: the player can be wrong too
+MIN_LOG_SD = 0.05
+# A computed prior narrower than this (e.g. a category with a handful of similar answers) is widened
+MIN_PRIOR_LOG_SD = 0.25
+
+_priors = None
+
+
+def priors_path():
+    return os.environ.get('QUESTION_PRIORS_PATH', DEFAULT_PRIORS_PATH)
+
+
+def load_priors(path=None):
+    """Reads a compute_priors.py table, or returns an empty one if there isn't a usable file."""
+    path = path or priors_path()
+    try:
+        with open(path) as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return {'tags': {}, 'units': {}}
+    except (OSError, ValueError) as e:
+        logger.warning("Ignoring question priors in %s: %s", path, e)
+        return {'tags': {}, 'units': {}}
+    return {'tags': data.get('tags', {}), 'units': data.get('units', {})}
+
+
+def get_priors():
+    global _priors
+    if _priors is None:
+        _priors = load_priors()
+    return _priors
+
+
+def reload_priors(path=None):
+    global _priors
+    _priors = load_priors(path)
+    return _priors
+
+
+def _computed(entry):
+    return entry['log_mean'], max(entry['log_std'], MIN_PRIOR_LOG_SD)
+
+
+def _normal_pdf(x):
+    return math.exp(-0.5 * x * x) / math.sqrt(2 * math.pi)
+
+
+class Belief:
+    """Lognormal belief about one answer: log(answer) ~ N(mu, var)."""
+
+    __slots__ = ('mu', 'var')
+
+    def __init__(self, mu, var):
+        self.mu = mu
+        self.var = var
+
+    @staticmethod
+    def from_question(units=None, tags=None):
+        """The prior for a question: the first of its tags with a prior, then its units, computed before hand-set."""
+        computed = get_priors()
+        tag_list = [tag.strip() for tag in (tags or '').split(',') if tag.strip()]
+        for tag in tag_list:
+            if tag in computed['tags']:
+                log_mean, log_sd = _computed(computed['tags'][tag])
+                return Belief(log_mean, log_sd ** 2)
+        if units in computed['units']:
+            log_mean, log_sd = _computed(computed['units'][units])
+            return Belief(log_mean, log_sd ** 2)
+        prior = next((TAG_PRIORS[tag] for tag in tag_list if tag in TAG_PRIORS), None)
+        median, log_sd = prior or UNIT_PRIORS.get(units) or DEFAULT_PRIOR
+        return Belief(math.log(median), log_sd ** 2)
+
+    @property
+    def estimate(self):
+        """The posterior median."""
+        return math.exp(self.mu)
+
+    @property
+    def sigma(self):
+        """Standard deviation of log(answer), i.e. roughly the relative uncertainty."""
+        return math.sqrt(self.var)
+
+    def observe(self, log_value, log_sd):
+        """Conjugate update on a noisy reading of log(answer)."""
+        obs_var = log_sd ** 2
+        gain = self.var / (self.var + obs_var)
+        self.mu += gain * (log_value - self.mu)
+        self.var = max(self.var * (1 - gain), MIN_LOG_SD ** 2)
+
+    def observe_at_least(self, value):
+        """Moment-matched update on answer >= value (a truncated normal in log space)."""
+        if value <= 0:
+            return
+        sigma = self.sigma
+        alpha = (math.log(value) - self.mu) / sigma
+        tail = 0.5 * math.erfc(alpha / math.sqrt(2))
+        # Inverse Mills ratio; far in the tail it tends to alpha
+        ratio = _normal_pdf(alpha) / tail if tail > 1e-12 else alpha
+        self.mu += sigma * ratio
+        self.var = max(self.var * (1 - ratio * (ratio - alpha)), MIN_LOG_SD ** 2)
+
+    def observe_width(self, width):
+        """The player set the first width: a hint at the scale, and bid >= 0 means answer >= width / 2."""
+        if width > 0:
+            self.observe(math.log(width / WIDTH_RATIO), WIDTH_LOG_SD)
+            self.observe_at_least(width / 2)
+
+    def observe_reduction(self, width):
+        """The player was happy to quote this width, so their estimate is at least width / 2."""
+        self.observe_at_least(width / 2)
+
+    def observe_quote(self, bid, ask):
+        mid = (bid + ask) / 2
+        if mid > 0:
+            self.observe(math.log(mid), QUOTE_LOG_SD)
+
+    def to_list(self):
+        return [self.mu, self.var]
+
+    @staticmethod
+    def from_list(data):
+        return Belief(*data) if data is not None else None
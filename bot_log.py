@@ -0,0 +1,56 @@
+import logging
+from collections import deque
+
+DEBUG = logging.DEBUG
+INFO = logging.INFO
+
+
+class BotLog:
+    """Bounded, lazily formatted record of a bot's decisions.
+
+    Entries are stored as (level, message, args) and only %-formatted when
+    render() is called, so a log nobody reads costs a tuple per entry. Entries
+    below `level` are dropped before anything is stored, and only the newest
+    `capacity` entries are kept.
+    """
+
+    __slots__ = ('capacity', 'level', '_entries')
+
+    default_capacity = 50
+    default_level = INFO
+
+    def __init__(self, capacity=None, level=None, entries=()):
+        self.capacity = capacity if capacity is not None else self.default_capacity
+        self.level = level if level is not None else self.default_level
+        self._entries = deque(entries, maxlen=self.capacity)
+
+    def add(self, level, message, *args):
+        if level >= self.level:
+            self._entries.append((level, message, args))
+
+    def debug(self, message, *args):
+        self.add(DEBUG, message, *args)
+
+    def info(self, message, *args):
+        self.add(INFO, message, *args)
+
+    def render(self):
+        return [message % args if args else message for _, message, args in self._entries]
+
+    def __len__(self):
+        return len(self._entries)
+
+    def to_list(self):
+        return [[level, message, list(args)] for level, message, args in self._entries]
+
+    @staticmethod
+    def from_list(data, capacity=None, level=None):
+        """Rebuilds a log from to_list() output; plain strings from older saved games are kept as INFO."""
+        entries = []
+        for entry in data or ():
+            if isinstance(entry, str):
+                entries.append((INFO, entry, ()))
+            else:
+                entry_level, message, args = entry
+                entries.append((entry_level, message, tuple(args)))
+        return BotLog(capacity, level, entries)
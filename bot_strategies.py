@@ -1,340 +1,290 @@
 import random
 import abc
+from bot_log import BotLog
+from bot_belief import Belief
 
-class Bot(abc.ABC):
-    def __init__(self, true_value, initial_estimate_noise=0.5, std_dev_multiplier=4.0, width_reduction_multiplier=0.9, market_willingness=0.5):
-        self.true_value = true_value
-        self.initial_estimate_noise = initial_estimate_noise
-        self.current_estimate = self.generate_initial_estimate()
-        self.std_dev_multiplier = std_dev_multiplier
-        self.log = []
-        self.width_reduction_multiplier = width_reduction_multiplier
-        self.market_willingness = market_willingness  # Base willingness
+# Every concrete Bot subclass, by class name. app.py's bot_types is this same dict.
+BOT_CLASSES = {}
 
-    def generate_initial_estimate(self):
-        noise = random.uniform(-self.initial_estimate_noise, self.initial_estimate_noise)
-        return self.true_value * (1 + noise)
+# Bumped whenever the to_tuple() layout changes
+SERIAL_VERSION = 2
 
-    def generate_initial_width(self):
-        initial_width = int(round(abs(self.current_estimate) * 2))
-        return initial_width
 
-    def _validate_market(self, bid, ask):
-        std_dev = abs(self.current_estimate) * self.initial_estimate_noise
-        min_value = max(0, int(round(self.current_estimate - self.std_dev_multiplier * std_dev)))
-        bid = max(int(round(bid)), min_value)
-        ask = max(int(round(ask)), int(round(min_value + 1)))
-        if bid >= ask:
-            ask = bid + 1
-        return bid, ask
+class Persona:
+    """Everything that makes one bot class behave differently from another.
 
-    @abc.abstractmethod
-    def update_belief(self, player_action, player_width):
-        pass
+    Any of the *_factor / belief_* fields may be a (low, high) tuple, meaning
+    a fresh uniform draw each time it is used. threshold_factor=None means
+    the bot flips a coin instead of weighing the risk of making a market.
+    """
 
-    @abc.abstractmethod
-    def choose_action(self, current_width):
-        pass
+    __slots__ = ('initial_estimate_noise', 'std_dev_multiplier', 'width_reduction_multiplier',
+                 'market_willingness', 'threshold_factor', 'market_factor',
+                 'belief_estimate_weight', 'belief_true_weight', 'belief_extra_weight')
 
-    @abc.abstractmethod
-    def make_market(self, current_width):
-        pass
+    def __init__(self, initial_estimate_noise=0.5, std_dev_multiplier=4.0, width_reduction_multiplier=0.9,
+                 market_willingness=0.5, threshold_factor=1.0, market_factor=0.5,
+                 belief_estimate_weight=1.0, belief_true_weight=1.0, belief_extra_weight=None):
+        # Constructor defaults for the class
+        self.initial_estimate_noise = initial_estimate_noise
+        self.std_dev_multiplier = std_dev_multiplier
+        self.width_reduction_multiplier = width_reduction_multiplier
+        self.market_willingness = market_willingness
+        # Decision kernel weights
+        self.threshold_factor = threshold_factor
+        self.market_factor = market_factor
+        self.belief_estimate_weight = belief_estimate_weight
+        self.belief_true_weight = belief_true_weight
+        # Defaults to estimate + true weight, i.e. a plain weighted average
+        self.belief_extra_weight = belief_extra_weight
 
-    def get_log(self):
-        return self.log
 
-    @abc.abstractmethod
-    def trade(self, bid, ask):
-        pass
+def _draw(value):
+    return random.uniform(*value) if isinstance(value, tuple) else value
 
-    def to_dict(self):
-        """Converts the bot object to a dictionary."""
-        return {
-            'true_value': self.true_value,
-            'initial_estimate_noise': self.initial_estimate_noise,
-            'current_estimate': self.current_estimate,
-            'std_dev_multiplier': self.std_dev_multiplier,
-            'log': self.log,
-            'width_reduction_multiplier': self.width_reduction_multiplier,
-            'market_willingness': self.market_willingness,
-            '__class__': self.__class__.__name__  # Store the class name!
-        }
 
-    @staticmethod
-    def from_dict(data):
-        """Creates a bot object from a dictionary."""
-        class_name = data.pop('__class__')  # Get and remove the class name
-        log = data.pop('log') #Get the log, and remove that entry.  <-- **THIS LINE**
-        if class_name == 'AggressiveBot':
-            return AggressiveBot(**data, log=log)  # Pass log explicitly <-- **AND THIS LINE**
-        elif class_name == 'PassiveBot':
-            return PassiveBot(**data, log=log) # <-- **AND HERE**
-        elif class_name == 'MarketLoverBot':
-            return MarketLoverBot(**data, log=log) # <-- **AND HERE**
-        elif class_name == 'MarketHaterBot':
-            return MarketHaterBot(**data, log=log) # <-- **AND HERE**
-        elif class_name == 'RandomBot':
-            return RandomBot(**data, log=log) # <-- **AND HERE**
-        else:
-            raise ValueError(f"Unknown bot class: {class_name}")
+# The decision kernel. Every bot class runs these same functions with its
+# own Persona; batch_sim.py is the NumPy mirror of them.
 
-class AggressiveBot(Bot):
-    def __init__(self, true_value, initial_estimate_noise=0.5, std_dev_multiplier=4.0, width_reduction_multiplier=0.8, market_willingness=0.7, current_estimate=None, log=None):
-        super().__init__(true_value, initial_estimate_noise, std_dev_multiplier, width_reduction_multiplier, market_willingness)
-        self.current_estimate = current_estimate if current_estimate is not None else self.generate_initial_estimate()
-        self.log = log if log is not None else []
-    # ... rest of AggressiveBot ...
-    def update_belief(self, player_action, player_width):
-        if player_action == 'reduce_width':
-            self.current_estimate = (self.current_estimate * (player_width + 1) + self.true_value) / (player_width + 2)
-            self.log.append(f"Belief updated. New estimate: {self.current_estimate:.2f}")
+def potential_loss(estimate, true_value, width):
+    """What quoting a market of this width around estimate stands to lose."""
+    if estimate > true_value:
+        return abs(estimate - round(estimate - width / 2))
+    if estimate < true_value:
+        return abs(round(estimate + width / 2) - estimate)
+    return width / 2
 
-    def choose_action(self, current_width):
-        self.log.append(f"Current width: {current_width}, Current estimate: {self.current_estimate:.2f}")
-        potential_bid = int(round(self.current_estimate - (current_width / 2)))
-        potential_ask = int(round(self.current_estimate + (current_width / 2)))
-        if self.current_estimate > self.true_value:
-            potential_loss = abs(self.current_estimate - potential_bid)
-        elif self.current_estimate < self.true_value:
-            potential_loss = abs(potential_ask - self.current_estimate)
-        else:
-            potential_loss = current_width / 2
-        uncertainty = abs(self.current_estimate) * self.initial_estimate_noise
-        risk_threshold = uncertainty * self.market_willingness  # Use base willingness
 
-        if potential_loss < risk_threshold:
-            action = 'make_market'
-        else:
-            action = 'reduce_width'
-        self.log.append(f"Choosing action: {action}, Potential Loss: {potential_loss}, Risk Threshold: {risk_threshold:.2f}")
-        return action
+def risk_threshold(estimate, noise, market_willingness):
+    return abs(estimate) * noise * market_willingness
 
-    def make_market(self, current_width):
-        bid = int(round(self.current_estimate - (current_width / 2)))
-        ask = int(round(self.current_estimate + (current_width / 2)))
-        bid, ask = self._validate_market(bid, ask)
-        self.log.append(f"Making market: Bid={bid}, Ask={ask}")
-        return bid, ask
 
-    def trade(self, bid, ask):
-        self.log.append(f"Bot trading after player made market.")
-        self.log.append(f"Current estimate: {self.current_estimate:.2f}, Bid: {bid}, Ask: {ask}")
-        if bid < 1:  # Handle low bid
-            action = 'sell' if self.current_estimate < ask * 2 else 'buy'
-        elif self.current_estimate > ask:
-            action = 'buy'
-        elif self.current_estimate < bid:
-            action = 'sell'
-        else:
-            action = random.choice(['buy', 'sell'])
-        self.log.append(f"Bot chooses to: {action}")
-        return action
-
-class PassiveBot(Bot):
-    def __init__(self, true_value, initial_estimate_noise=0.6, std_dev_multiplier=4.0, width_reduction_multiplier=0.95, market_willingness=0.3, current_estimate=None, log=None):
-        super().__init__(true_value, initial_estimate_noise, std_dev_multiplier, width_reduction_multiplier, market_willingness)
-        self.current_estimate = current_estimate if current_estimate is not None else self.generate_initial_estimate()
-        self.log = log if log is not None else []
+def quote(estimate, width, bid_factor, ask_factor):
+    return round(estimate - width * bid_factor), round(estimate + width * ask_factor)
 
-    def update_belief(self, player_action, player_width):
-        if player_action == 'reduce_width':
-            # Passive bot updates its belief less aggressively
-            self.current_estimate = (self.current_estimate * (player_width + 5) + self.true_value) / (player_width + 6)
-            self.log.append(f"Belief updated. New estimate: {self.current_estimate:.2f}")
-
-    def choose_action(self, current_width):
-        self.log.append(f"Current width: {current_width}, Current estimate: {self.current_estimate:.2f}")
-        potential_bid = int(round(self.current_estimate - (current_width / 2)))
-        potential_ask = int(round(self.current_estimate + (current_width / 2)))
-
-        if self.current_estimate > self.true_value:
-            potential_loss = abs(self.current_estimate - potential_bid)
-        elif self.current_estimate < self.true_value:
-            potential_loss = abs(potential_ask - self.current_estimate)
-        else:
-            potential_loss = current_width / 2
 
-        uncertainty = abs(self.current_estimate) * self.initial_estimate_noise
-        risk_threshold = uncertainty * self.market_willingness  # Use base willingness
+def validate_market(estimate, noise, std_dev_multiplier, bid, ask):
+    min_value = max(0, round(estimate - std_dev_multiplier * (abs(estimate) * noise)))
+    bid = max(round(bid), min_value)
+    ask = max(round(ask), min_value + 1)
+    if bid >= ask:
+        ask = bid + 1
+    return bid, ask
 
-        if potential_loss < risk_threshold:
-            action = 'make_market'
-        else:
-            action = 'reduce_width'
-        self.log.append(f"Choosing action: {action}, Potential Loss: {potential_loss}, Risk Threshold: {risk_threshold:.2f}")
-        return action
 
-    def make_market(self, current_width):
-        bid = int(round(self.current_estimate - (current_width / 2)))
-        ask = int(round(self.current_estimate + (current_width / 2)))
-        bid, ask = self._validate_market(bid, ask)  # Ensure bid < ask
-        self.log.append(f"Making market: Bid={bid}, Ask={ask}")
-        return bid, ask
+def trade_action(estimate, bid, ask):
+    """'buy' or 'sell', or None when the estimate sits inside the market and it's a coin flip."""
+    if bid < 1:  # Handle low bid
+        return 'sell' if estimate < ask * 2 else 'buy'
+    if estimate > ask:
+        return 'buy'
+    if estimate < bid:
+        return 'sell'
+    return None
 
-    def trade(self, bid, ask):
-        self.log.append(f"Bot trading after player made market.")
-        self.log.append(f"Current estimate: {self.current_estimate:.2f}, Bid: {bid}, Ask: {ask}")
-        if bid < 1:  # Handle low bid
-            action = 'sell' if self.current_estimate < ask * 2 else 'buy'
-        elif self.current_estimate > ask:
-            action = 'buy'
-        elif self.current_estimate < bid:
-            action = 'sell'
-        else:
-            action = random.choice(['buy', 'sell'])
-        self.log.append(f"Bot chooses to: {action}")
-        return action
 
-class MarketLoverBot(Bot):
-    def __init__(self, true_value, initial_estimate_noise=0.4, std_dev_multiplier=4.0, width_reduction_multiplier=0.95, market_willingness=0.9, current_estimate=None, log=None):
-        super().__init__(true_value, initial_estimate_noise, std_dev_multiplier, width_reduction_multiplier, market_willingness)
-        self.current_estimate = current_estimate if current_estimate is not None else self.generate_initial_estimate()
-        self.log = log if log is not None else []
+def updated_belief(estimate, true_value, width, estimate_weight, true_weight, extra_weight):
+    return (estimate * (width + estimate_weight) + true_value * true_weight) / (width + extra_weight)
 
-    def update_belief(self, player_action, player_width):
-        if player_action == 'reduce_width':
-            # Market-loving bot updates its belief very slightly
-            self.current_estimate = (self.current_estimate * (player_width + 10) + self.true_value) / (player_width + 11)
-            self.log.append(f"Belief updated. New estimate: {self.current_estimate:.2f}")
 
-    def choose_action(self, current_width):
-        self.log.append(f"Current width: {current_width}, Current estimate: {self.current_estimate:.2f}")
-        potential_bid = int(round(self.current_estimate - (current_width / 2)))
-        potential_ask = int(round(self.current_estimate + (current_width / 2)))
-        if self.current_estimate > self.true_value:
-            potential_loss = abs(self.current_estimate - potential_bid)
-        elif self.current_estimate < self.true_value:
-            potential_loss = abs(potential_ask - self.current_estimate)
-        else:
-            potential_loss = current_width / 2
+class Bot(abc.ABC):
+    __slots__ = ('true_value', 'initial_estimate_noise', 'current_estimate', 'std_dev_multiplier',
+                 'log', 'width_reduction_multiplier', 'market_willingness', 'belief')
+
+    # Set by every concrete subclass; classes without one are abstract and not registered
+    persona = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if cls.persona is not None:
+            BOT_CLASSES[cls.__name__] = cls
+
+    def __init__(self, true_value, initial_estimate_noise=None, std_dev_multiplier=None, width_reduction_multiplier=None, market_willingness=None, current_estimate=None, log=None, belief=None):
+        """A bot given a Belief plays blind: true_value should be None and its estimate comes from the belief."""
+        if self.persona is None:
+            raise TypeError(f"{type(self).__name__} has no persona")
+        persona = self.persona
+        self.true_value = true_value
+        self.initial_estimate_noise = initial_estimate_noise if initial_estimate_noise is not None else persona.initial_estimate_noise
+        self.std_dev_multiplier = std_dev_multiplier if std_dev_multiplier is not None else persona.std_dev_multiplier
+        self.width_reduction_multiplier = width_reduction_multiplier if width_reduction_multiplier is not None else persona.width_reduction_multiplier
+        self.market_willingness = market_willingness if market_willingness is not None else persona.market_willingness  # Base willingness
+        self.belief = belief
+        if current_estimate is None:
+            current_estimate = belief.estimate if belief is not None else self.generate_initial_estimate()
+        self.current_estimate = current_estimate
+        self.log = log if isinstance(log, BotLog) else BotLog.from_list(log)
 
-        uncertainty = abs(self.current_estimate) * self.initial_estimate_noise
-        risk_threshold = uncertainty * self.market_willingness  # Use base willingness
-        # Market-loving bot is *very* willing to make a market
-        if potential_loss < risk_threshold * 2:  # Higher tolerance
-            action = 'make_market'
-        else:
-            action = 'reduce_width'
-        self.log.append(f"Choosing action: {action}, Potential Loss: {potential_loss}, Risk Threshold: {risk_threshold:.2f}")
-        return action
+    def generate_initial_estimate(self):
+        noise = random.uniform(-self.initial_estimate_noise, self.initial_estimate_noise)
+        return self.true_value * (1 + noise)
 
-    def make_market(self, current_width):
-        bid = int(round(self.current_estimate - (current_width / 2)))
-        ask = int(round(self.current_estimate + (current_width / 2)))
-        bid, ask = self._validate_market(bid, ask)
-        self.log.append(f"Making market: Bid={bid}, Ask={ask}")
-        return bid, ask
+    def generate_initial_width(self):
+        initial_width = int(round(abs(self.current_estimate) * 2))
+        return initial_width
 
-    def trade(self, bid, ask):
-        self.log.append(f"Bot trading after player made market.")
-        self.log.append(f"Current estimate: {self.current_estimate:.2f}, Bid: {bid}, Ask: {ask}")
-        if bid < 1:  # Handle low bid
-            action = 'sell' if self.current_estimate < ask * 2 else 'buy'
-        elif self.current_estimate > ask:
-            action = 'buy'
-        elif self.current_estimate < bid:
-            action = 'sell'
-        else:
-            action = random.choice(['buy', 'sell'])
-        self.log.append(f"Bot chooses to: {action}")
-        return action
+    def _noise(self):
+        # A blind bot's relative uncertainty is its posterior spread rather than the noise it was dealt
+        return self.belief.sigma if self.belief is not None else self.initial_estimate_noise
 
-class MarketHaterBot(Bot):
-    def __init__(self, true_value, initial_estimate_noise=0.6, std_dev_multiplier=4.0, width_reduction_multiplier=0.8, market_willingness=0.1, current_estimate=None, log=None):
-        super().__init__(true_value, initial_estimate_noise, std_dev_multiplier, width_reduction_multiplier, market_willingness)
-        self.current_estimate = current_estimate if current_estimate is not None else self.generate_initial_estimate()
-        self.log = log if log is not None else []
+    def _validate_market(self, bid, ask):
+        return validate_market(self.current_estimate, self._noise(), self.std_dev_multiplier, bid, ask)
 
     def update_belief(self, player_action, player_width):
-        if player_action == 'reduce_width':
-            # Market-hating bot updates belief somewhat aggressively
-            self.current_estimate = (self.current_estimate * (player_width + 2) + self.true_value * 0.8) / (
-                        player_width + 2.8)
-            self.log.append(f"Belief updated. New estimate: {self.current_estimate:.2f}")
+        """Moves the estimate after a player width move; a blind bot (true_value None) updates its Belief via observe()."""
+        if self.true_value is None:
+            self.observe(player_action, player_width)
+        elif player_action == 'reduce_width':
+            persona = self.persona
+            self.current_estimate = updated_belief(
+                self.current_estimate, self.true_value, player_width,
+                _draw(persona.belief_estimate_weight), _draw(persona.belief_true_weight),
+                _draw(persona.belief_extra_weight) if persona.belief_extra_weight is not None
+                else persona.belief_estimate_weight + persona.belief_true_weight)
+            self.log.debug("Belief updated. New estimate: %.2f", self.current_estimate)
+
+    def observe(self, player_action, width=None, bid=None, ask=None):
+        """Updates a blind bot's belief from a player move: 'set_width', 'reduce_width' or 'provide_market'.
+
+        Bots that were given the answer ignore this.
+        """
+        belief = self.belief
+        if belief is None:
+            return
+        if player_action == 'set_width':
+            belief.observe_width(width)
+        elif player_action == 'reduce_width':
+            belief.observe_reduction(width)
+        elif player_action == 'provide_market':
+            belief.observe_quote(bid, ask)
+        self.current_estimate = belief.estimate
+        self.log.debug("Observed %s. New estimate: %.2f (log sd %.3f)", player_action, self.current_estimate, belief.sigma)
 
     def choose_action(self, current_width):
-        self.log.append(f"Current width: {current_width}, Current estimate: {self.current_estimate:.2f}")
-        potential_bid = int(round(self.current_estimate - (current_width / 2)))
-        potential_ask = int(round(self.current_estimate + (current_width / 2)))
-
-        if self.current_estimate > self.true_value:
-            potential_loss = abs(self.current_estimate - potential_bid)
-        elif self.current_estimate < self.true_value:
-            potential_loss = abs(potential_ask - self.current_estimate)
-        else:
-            potential_loss = current_width / 2
-
-        uncertainty = abs(self.current_estimate) * self.initial_estimate_noise
-        risk_threshold = uncertainty * self.market_willingness  # Use base willingness
-
-        # Market-hating bot is *very* reluctant to make a market
-        if potential_loss < risk_threshold * 0.2:  # Much lower tolerance
-            action = 'make_market'
+        self.log.debug("Current width: %s, Current estimate: %.2f", current_width, self.current_estimate)
+        threshold_factor = self.persona.threshold_factor
+        if threshold_factor is None:
+            action = random.choice(['reduce_width', 'make_market'])
+            self.log.info("Choosing action: %s", action)
+            return action
+        if self.belief is not None:
+            # Without the answer there's no telling which side of the market would lose
+            loss = current_width / 2
         else:
-            action = 'reduce_width'
-        self.log.append(f"Choosing action: {action}, Potential Loss: {potential_loss}, Risk Threshold: {risk_threshold:.2f}")
+            loss = potential_loss(self.current_estimate, self.true_value, current_width)
+        threshold = risk_threshold(self.current_estimate, self._noise(), self.market_willingness)
+        action = 'make_market' if loss < threshold * threshold_factor else 'reduce_width'
+        self.log.info("Choosing action: %s, Potential Loss: %s, Risk Threshold: %.2f", action, loss, threshold)
         return action
 
     def make_market(self, current_width):
-        # Market-hating bot makes a wider market
-        bid = int(round(self.current_estimate - (current_width * 0.75)))
-        ask = int(round(self.current_estimate + (current_width * 0.75)))
+        market_factor = self.persona.market_factor
+        bid, ask = quote(self.current_estimate, current_width, _draw(market_factor), _draw(market_factor))
         bid, ask = self._validate_market(bid, ask)
-        self.log.append(f"Making market: Bid={bid}, Ask={ask}")
+        self.log.info("Making market: Bid=%s, Ask=%s", bid, ask)
         return bid, ask
 
     def trade(self, bid, ask):
-        self.log.append(f"Bot trading after player made market.")
-        self.log.append(f"Current estimate: {self.current_estimate:.2f}, Bid: {bid}, Ask: {ask}")
-        if bid < 1:  # Handle low bid
-            action = 'sell' if self.current_estimate < ask * 2 else 'buy'
-        elif self.current_estimate > ask:
-            action = 'buy'
-        elif self.current_estimate < bid:
-            action = 'sell'
-        else:
+        self.log.debug("Bot trading after player made market.")
+        self.log.debug("Current estimate: %.2f, Bid: %s, Ask: %s", self.current_estimate, bid, ask)
+        action = trade_action(self.current_estimate, bid, ask)
+        if action is None:
             action = random.choice(['buy', 'sell'])
-        self.log.append(f"Bot chooses to: {action}")
+        self.log.info("Bot chooses to: %s", action)
         return action
 
-class RandomBot(Bot):
-    def __init__(self, true_value, initial_estimate_noise=0.5, std_dev_multiplier=4.0, width_reduction_multiplier=0.85, market_willingness=0.5, current_estimate=None, log=None):
-        super().__init__(true_value, initial_estimate_noise, std_dev_multiplier, width_reduction_multiplier, market_willingness)
-        self.current_estimate = current_estimate if current_estimate is not None else self.generate_initial_estimate()
-        self.log = log if log is not None else []
+    def get_log(self):
+        return self.log.render()
 
+    def to_dict(self, include_log=True):
+        """Converts the bot object to a dictionary; include_log=False leaves the decision log out."""
+        return {
+            'true_value': self.true_value,
+            'initial_estimate_noise': self.initial_estimate_noise,
+            'current_estimate': self.current_estimate,
+            'std_dev_multiplier': self.std_dev_multiplier,
+            'log': self.log.to_list() if include_log else [],
+            'width_reduction_multiplier': self.width_reduction_multiplier,
+            'market_willingness': self.market_willingness,
+            'belief': self.belief.to_list() if self.belief is not None else None,
+            '__class__': self.__class__.__name__  # Store the class name!
+        }
 
-    def update_belief(self, player_action, player_width):
-        if player_action == 'reduce_width':
-            # Random bot updates its belief randomly
-            self.current_estimate = (self.current_estimate * (player_width + random.uniform(1,5)) + self.true_value * random.uniform(0.7, 1.3)) / (player_width + random.uniform(1.7, 6.3))
-            self.log.append(f"Belief updated. New estimate: {self.current_estimate:.2f}")
+    @staticmethod
+    def from_dict(data):
+        """Creates a bot object from a to_dict() dictionary, leaving the dictionary untouched."""
+        bot_class = BOT_CLASSES.get(data['__class__'])
+        if bot_class is None:
+            raise ValueError(f"Unknown bot class: {data['__class__']}")
+        return bot_class._restore(data['true_value'], data['initial_estimate_noise'], data['current_estimate'],
+                                  data['std_dev_multiplier'], data['width_reduction_multiplier'],
+                                  data['market_willingness'], BotLog.from_list(data.get('log')),
+                                  Belief.from_list(data.get('belief')))
+
+    def to_tuple(self):
+        """Compact form for storing between requests: positional fields, no key strings and no log."""
+        return (SERIAL_VERSION, self.__class__.__name__, self.true_value, self.initial_estimate_noise,
+                self.current_estimate, self.std_dev_multiplier, self.width_reduction_multiplier,
+                self.market_willingness, self.belief.to_list() if self.belief is not None else None)
 
-    def choose_action(self, current_width):
-        self.log.append(f"Current width: {current_width}, Current estimate: {self.current_estimate:.2f}")
-        # Random bot chooses an action randomly
-        action = random.choice(['reduce_width', 'make_market'])
-        self.log.append(f"Choosing action: {action}")
-        return action
+    @staticmethod
+    def from_tuple(data):
+        """Creates a bot object from to_tuple() output (or the list JSON turns it into)."""
+        if data[0] == 1:
+            # Version 1 had no belief
+            data = list(data) + [None]
+        elif data[0] != SERIAL_VERSION:
+            raise ValueError(f"Unsupported bot serialization version: {data[0]}")
+        bot_class = BOT_CLASSES.get(data[1])
+        if bot_class is None:
+            raise ValueError(f"Unknown bot class: {data[1]}")
+        return bot_class._restore(*data[2:8], BotLog(), Belief.from_list(data[8]))
+
+    @classmethod
+    def _restore(cls, true_value, initial_estimate_noise, current_estimate, std_dev_multiplier,
+                 width_reduction_multiplier, market_willingness, log, belief=None):
+        # Skips __init__, which would draw (and then throw away) fresh initial estimates
+        bot = cls.__new__(cls)
+        bot.true_value = true_value
+        bot.initial_estimate_noise = initial_estimate_noise
+        bot.current_estimate = current_estimate
+        bot.std_dev_multiplier = std_dev_multiplier
+        bot.width_reduction_multiplier = width_reduction_multiplier
+        bot.market_willingness = market_willingness
+        bot.log = log
+        bot.belief = belief
+        return bot
 
-    def make_market(self, current_width):
-        # Random bot makes a somewhat random market
-        bid = int(round(self.current_estimate - (current_width * random.uniform(0.4, 0.6))))
-        ask = int(round(self.current_estimate + (current_width * random.uniform(0.4, 0.6))))
-        bid, ask = self._validate_market(bid, ask)
-        self.log.append(f"Making market: Bid={bid}, Ask={ask}")
-        return bid, ask
+class AggressiveBot(Bot):
+    __slots__ = ()
+    persona = Persona(initial_estimate_noise=0.5, width_reduction_multiplier=0.8, market_willingness=0.7,
+                      threshold_factor=1.0, market_factor=0.5,
+                      belief_estimate_weight=1, belief_true_weight=1)
 
-    def trade(self, bid, ask):
-        self.log.append(f"Bot trading after player made market.")
-        self.log.append(f"Current estimate: {self.current_estimate:.2f}, Bid: {bid}, Ask: {ask}")
-        if bid < 1:  # Handle low bid
-            action = 'sell' if self.current_estimate < ask * 2 else 'buy'
-        elif self.current_estimate > ask:
-            action = 'buy'
-        elif self.current_estimate < bid:
-            action = 'sell'
-        else:
-            action = random.choice(['buy', 'sell'])
-        self.log.append(f"Bot chooses to: {action}")
-        return action
\ No newline at end of file
+class PassiveBot(Bot):
+    __slots__ = ()
+    # Updates its belief less aggressively
+    persona = Persona(initial_estimate_noise=0.6, width_reduction_multiplier=0.95, market_willingness=0.3,
+                      threshold_factor=1.0, market_factor=0.5,
+                      belief_estimate_weight=5, belief_true_weight=1)
+
+class MarketLoverBot(Bot):
+    __slots__ = ()
+    # *Very* willing to make a market and updates its belief very slightly
+    persona = Persona(initial_estimate_noise=0.4, width_reduction_multiplier=0.95, market_willingness=0.9,
+                      threshold_factor=2.0, market_factor=0.5,
+                      belief_estimate_weight=10, belief_true_weight=1)
+
+class MarketHaterBot(Bot):
+    __slots__ = ()
+    # *Very* reluctant to make a market, quotes wider and updates its belief somewhat aggressively
+    persona = Persona(initial_estimate_noise=0.6, width_reduction_multiplier=0.8, market_willingness=0.1,
+                      threshold_factor=0.2, market_factor=0.75,
+                      belief_estimate_weight=2, belief_true_weight=0.8)
+
+class RandomBot(Bot):
+    __slots__ = ()
+    # Chooses randomly, quotes a somewhat random market and updates its belief randomly
+    persona = Persona(initial_estimate_noise=0.5, width_reduction_multiplier=0.85, market_willingness=0.5,
+                      threshold_factor=None, market_factor=(0.4, 0.6),
+                      belief_estimate_weight=(1, 5), belief_true_weight=(0.7, 1.3), belief_extra_weight=(1.7, 6.3))
@@ -1,69 +1,19 @@
-import math
+"""Interactive damage calculator: every formula in damage.py for one trade at a time.
 
-def calculate_damage_option1(true_answer, bid, ask, player_action):
-    market_width = ask - bid #not used
-    if bid <= true_answer <= ask:
-        if player_action == 'buy':
-            error = abs(true_answer - ask)
-        else:  # player_action == 'sell'
-            error = abs(true_answer - bid)
-    else:
-        error = abs(true_answer - (bid if true_answer < bid else ask))
+For whole batches of trades see scripts/damage_harness.py.
+"""
+from damage import FORMULAS
 
-    percentage_error = (error / true_answer) * 100
-    damage = int(round(percentage_error * 10))  #factor can be improved
-    return damage
-
-def calculate_damage_option2(true_answer, bid, ask, player_action):
-    market_width = ask - bid
-    if bid <= true_answer <= ask:
-        if player_action == 'buy':
-            error = abs(true_answer - ask)
-        else:  # player_action == 'sell'
-            error = abs(true_answer - bid)
-    else:
-        error = abs(true_answer - (bid if true_answer < bid else ask))
-
-    percentage_error = (error / market_width) * 100
-    damage = int(round(percentage_error * 10))
-    return damage
-
-def calculate_damage_option3(true_answer, bid, ask, player_action):
-    market_width = ask - bid
-    if bid <= true_answer <= ask:
-        if player_action == 'buy':
-            error = abs(true_answer - ask)
-        else:
-            error = abs(true_answer - bid)
-    else:
-        error = abs(true_answer - (bid if true_answer < bid else ask))
-
-    normalized_error = error / (true_answer + market_width)
-    damage = int(round(normalized_error * 10000))
-    return damage
-
-def calculate_damage_option4(true_answer, bid, ask, player_action):
-    market_width = ask-bid #still needed for consistency
-    if bid <= true_answer <= ask:
-        if player_action == 'buy':
-            error = abs(true_answer - ask)
-        else:
-            error = abs(true_answer-bid)
-    else:
-        error = abs(true_answer - (bid if true_answer < bid else ask))
-
-    normalized_error = error / true_answer  # Using Option 1's normalization
-    damage = int(round(10000 * math.log(1 + normalized_error)))  # Scaling factor of 1000, natural log
-    return damage
 
 def main():
     print("Trader Titan Damage Calculator")
 
     while True:
         try:
-            true_answer = float(input("Enter the true answer (or 'q' to quit): "))
-            if str(true_answer).lower() == 'q':
+            text = input("Enter the true answer (or 'q' to quit): ")
+            if text.strip().lower() == 'q':
                 break
+            true_answer = float(text)
 
             bid = float(input("Enter the bid: "))
             ask = float(input("Enter the ask: "))
@@ -77,16 +27,9 @@ def main():
                 print("Error: Invalid player action. Must be 'buy' or 'sell'.")
                 continue
 
-            damage1 = calculate_damage_option1(true_answer, bid, ask, player_action)
-            damage2 = calculate_damage_option2(true_answer, bid, ask, player_action)
-            damage3 = calculate_damage_option3(true_answer, bid, ask, player_action)
-            damage4 = calculate_damage_option4(true_answer, bid, ask, player_action)
-
             print("\nDamage Calculations:")
-            print(f"  Option 1 (Percentage of True Answer): {damage1}")
-            print(f"  Option 2 (Percentage of Market Width): {damage2}")
-            print(f"  Option 3 (Combination): {damage3}")
-            print(f"  Option 4 (Logarithmic): {damage4}")
+            for name, formula in FORMULAS.items():
+                print(f"  {name}: {float(formula(true_answer, bid, ask, player_action == 'buy')):.0f}")
             print("-" * 30)
 
         except ValueError:
@@ -95,4 +38,4 @@ def main():
             print(f"An error occurred: {e}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,84 @@
+"""Every damage formula the game has tried, vectorized with NumPy.
+
+Each formula takes arrays (or scalars) of true answers, bids, asks and a
+boolean `buys` (True where the trader lifted the ask, False where they hit
+the bid) and returns the damage per trade as a float array. Damage always
+goes to the side that lost the trade; see trader_loses().
+
+- absolute: what game_engine charges today, the distance from the trade price to the answer
+- percent_of_answer, percent_of_width, combined, logarithmic: options 1-4 from the old
+  damage-calc.py prototype. combined is also the formula app.calculate_damage used.
+"""
+import numpy as np
+
+
+def _arrays(true_answer, bid, ask, buys):
+    return (np.asarray(true_answer, dtype=float), np.asarray(bid, dtype=float),
+            np.asarray(ask, dtype=float), np.asarray(buys, dtype=bool))
+
+
+def trade_price(bid, ask, buys):
+    return np.where(buys, ask, bid)
+
+
+def trader_loses(true_answer, bid, ask, buys):
+    """True where the trader loses: they bought above the answer or sold below it (game_engine's rule)."""
+    true_answer, bid, ask, buys = _arrays(true_answer, bid, ask, buys)
+    return np.where(buys, true_answer < ask, true_answer > bid)
+
+
+def market_error(true_answer, bid, ask, buys):
+    """The prototype formulas' error: the traded side when the answer is inside the market, else the nearer side."""
+    true_answer, bid, ask, buys = _arrays(true_answer, bid, ask, buys)
+    inside = (bid <= true_answer) & (true_answer <= ask)
+    return np.where(inside, np.abs(true_answer - trade_price(bid, ask, buys)),
+                    np.where(true_answer < bid, bid - true_answer, true_answer - ask))
+
+
+def absolute(true_answer, bid, ask, buys):
+    true_answer, bid, ask, buys = _arrays(true_answer, bid, ask, buys)
+    return np.abs(true_answer - trade_price(bid, ask, buys))
+
+
+def percent_of_answer(true_answer, bid, ask, buys):
+    return np.rint(market_error(true_answer, bid, ask, buys) / np.asarray(true_answer, dtype=float) * 100 * 10)
+
+
+def percent_of_width(true_answer, bid, ask, buys):
+    width = np.asarray(ask, dtype=float) - np.asarray(bid, dtype=float)
+    return np.rint(market_error(true_answer, bid, ask, buys) / width * 100 * 10)
+
+
+def combined(true_answer, bid, ask, buys):
+    width = np.asarray(ask, dtype=float) - np.asarray(bid, dtype=float)
+    return np.rint(market_error(true_answer, bid, ask, buys) / (np.asarray(true_answer, dtype=float) + width) * 10000)
+
+
+def logarithmic(true_answer, bid, ask, buys):
+    return np.rint(10000 * np.log1p(market_error(true_answer, bid, ask, buys) / np.asarray(true_answer, dtype=float)))
+
+
+FORMULAS = {
+    'absolute': absolute,
+    'percent_of_answer': percent_of_answer,
+    'percent_of_width': percent_of_width,
+    'combined': combined,
+    'logarithmic': logarithmic,
+}
+
+
+def game_lengths(damage, trader_lost, trader_is_player, capital, games=2000, max_rounds=100, rng=None):
+    """Resamples rounds into whole games and returns how many rounds each one lasted.
+
+    Each simulated game draws rounds at random from the given trades and
+    charges the damage to whichever side lost; it ends when a side's capital
+    runs out, or after max_rounds (counted as max_rounds).
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    damage = np.asarray(damage, dtype=float)
+    player_lost = np.asarray(trader_lost, dtype=bool) == np.asarray(trader_is_player, dtype=bool)
+    picks = rng.integers(0, len(damage), size=(games, max_rounds))
+    player_taken = np.cumsum(np.where(player_lost[picks], damage[picks], 0), axis=1)
+    bot_taken = np.cumsum(np.where(player_lost[picks], 0, damage[picks]), axis=1)
+    over = (player_taken >= capital) | (bot_taken >= capital)
+    return np.where(over.any(axis=1), over.argmax(axis=1) + 1, max_rounds)
@@ -0,0 +1,380 @@
+import abc
+import os
+import queue
+import sqlite3
+import threading
+import time
+import logging
+from contextlib import contextmanager
+from dotenv import load_dotenv
+
+logger = logging.getLogger(__name__)
+
+load_dotenv()
+
+DEFAULT_SQLITE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'game.db')
+
+
+class PoolTimeout(Exception):
+    """Raised when no connection could be checked out within the timeout."""
+
+
+def _dict_factory(cursor, row):
+    return {col[0]: row[idx] for idx, col in enumerate(cursor.description)}
+
+
+class StorageBackend(abc.ABC):
+    """The database engine behind the pool; everything engine-specific lives on a backend.
+
+    Callers write plain SQL with `param` placeholders and ask the backend for
+    the few statements that differ between engines.
+    """
+    name = None
+    param = None
+    random_func = None
+
+    @abc.abstractmethod
+    def connect(self):
+        pass
+
+    @abc.abstractmethod
+    def ping(self, conn):
+        pass
+
+    @abc.abstractmethod
+    def dict_cursor(self, conn):
+        """A cursor whose rows are dicts keyed by column name."""
+        pass
+
+    def begin(self, conn):
+        """Starts an explicit transaction, ended by conn.commit()."""
+
+    def enable_wal(self, conn):
+        """Lets readers run alongside a writer, where the engine needs telling (scripts/init_db.py)."""
+
+    @abc.abstractmethod
+    def column_names(self, cursor, table):
+        pass
+
+    @abc.abstractmethod
+    def questions_ddl(self):
+        pass
+
+    @abc.abstractmethod
+    def create_unique_index(self, cursor, table, name, column):
+        pass
+
+    @abc.abstractmethod
+    def insert_sql(self, table, columns, rows, update_columns=None, key=None):
+        """An INSERT of `rows` rows that skips rows hitting the unique `key` column, or overwrites update_columns in them.
+
+        A backend with multi_row_insert takes all the rows' values flattened in
+        one execute(); otherwise the statement is for one row and is run with
+        executemany().
+        """
+
+
+class MySQLBackend(StorageBackend):
+    name = 'mysql'
+    param = '%s'
+    random_func = 'RAND()'
+    multi_row_insert = True
+
+    def __init__(self, host=None, user=None, password=None, database=None):
+        self.host = host if host is not None else os.environ.get('MYSQL_HOST')
+        self.user = user if user is not None else os.environ.get('MYSQL_USER')
+        self.password = password if password is not None else os.environ.get('MYSQL_PASSWORD')
+        self.database = database if database is not None else os.environ.get('MYSQL_DATABASE')
+
+    def connect(self):
+        import mysql.connector  # only needed when MySQL is actually in use
+        return mysql.connector.connect(
+            host=self.host,
+            user=self.user,
+            password=self.password,
+            database=self.database,
+            autocommit=True  # pooled connections must not pin a stale REPEATABLE READ snapshot
+        )
+
+    def ping(self, conn):
+        conn.ping(reconnect=False)
+
+    def dict_cursor(self, conn):
+        return conn.cursor(dictionary=True)
+
+    def begin(self, conn):
+        # Pooled connections autocommit, so a multi-statement write has to ask for a transaction
+        conn.start_transaction()
+
+    def column_names(self, cursor, table):
+        cursor.execute(f"SHOW COLUMNS FROM {table}")
+        return {row['Field'] for row in cursor.fetchall()}
+
+    def questions_ddl(self):
+        return """
+            CREATE TABLE IF NOT EXISTS questions (
+                id INT AUTO_INCREMENT PRIMARY KEY,
+                question TEXT NOT NULL,
+                answer REAL NOT NULL,
+                units TEXT NOT NULL,
+                tags TEXT,
+                question_hash CHAR(64),
+                UNIQUE KEY uniq_question_hash (question_hash)
+            )
+        """
+
+    def create_unique_index(self, cursor, table, name, column):
+        cursor.execute(f"SHOW INDEX FROM {table} WHERE Key_name = %s", (name,))
+        if not cursor.fetchall():
+            cursor.execute(f"ALTER TABLE {table} ADD UNIQUE KEY {name} ({column})")
+
+    def insert_sql(self, table, columns, rows, update_columns=None, key=None):
+        values = ', '.join(['(' + ', '.join(['%s'] * len(columns)) + ')'] * rows)
+        sql = f"INSERT {'' if update_columns else 'IGNORE '}INTO {table} ({', '.join(columns)}) VALUES {values}"
+        if update_columns:
+            sql += " ON DUPLICATE KEY UPDATE " + ', '.join(f"{c} = VALUES({c})" for c in update_columns)
+        return sql
+
+
+class SQLiteBackend(StorageBackend):
+    """SQLite, in WAL mode once init_db has switched the file over, so request threads can read while a script writes.
+
+    WAL is a property of the file, so it's set once by enable_wal() rather
+    than on every connect: that would rewrite the header of the bundled
+    game.db on the first run. Pass wal=True for runtime-only files such as
+    the game store. sqlite3 keeps a per-connection cache of prepared
+    statements; since every query here is parameterized, the hot ones are
+    compiled once per pooled connection.
+    """
+    name = 'sqlite'
+    param = '?'
+    random_func = 'RANDOM()'
+    # executemany() of one prepared statement is as fast as a multi-row VALUES in SQLite
+    multi_row_insert = False
+
+    def __init__(self, path=None, busy_timeout=5.0, statement_cache_size=256, wal=False):
+        self.path = path or os.environ.get('SQLITE_PATH') or DEFAULT_SQLITE_PATH
+        self.busy_timeout = busy_timeout
+        self.statement_cache_size = statement_cache_size
+        self.wal = wal
+
+    def connect(self):
+        # Connections are handed between request threads by the pool, never shared concurrently
+        conn = sqlite3.connect(self.path, check_same_thread=False, timeout=self.busy_timeout,
+                               cached_statements=self.statement_cache_size)
+        conn.row_factory = _dict_factory
+        if self.wal:
+            self.enable_wal(conn)
+        if conn.execute("PRAGMA journal_mode").fetchone()['journal_mode'] == 'wal':
+            # Safe with WAL: a crash can lose the last commits but never corrupts the file
+            conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def enable_wal(self, conn):
+        conn.execute("PRAGMA journal_mode=WAL")
+
+    def ping(self, conn):
+        conn.execute("SELECT 1").fetchone()
+
+    def dict_cursor(self, conn):
+        return conn.cursor()
+
+    def column_names(self, cursor, table):
+        cursor.execute(f"PRAGMA table_info({table})")
+        return {row['name'] for row in cursor.fetchall()}
+
+    def questions_ddl(self):
+        return """
+            CREATE TABLE IF NOT EXISTS questions (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                question TEXT NOT NULL,
+                answer REAL NOT NULL,
+                units TEXT NOT NULL,
+                tags TEXT,
+                question_hash TEXT
+            )
+        """
+
+    def create_unique_index(self, cursor, table, name, column):
+        cursor.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS {name} ON {table} ({column})")
+
+    def insert_sql(self, table, columns, rows, update_columns=None, key=None):
+        values = '(' + ', '.join(['?'] * len(columns)) + ')'
+        if not update_columns:
+            return f"INSERT OR IGNORE INTO {table} ({', '.join(columns)}) VALUES {values}"
+        return (f"INSERT INTO {table} ({', '.join(columns)}) VALUES {values} ON CONFLICT({key}) DO UPDATE SET "
+                + ', '.join(f"{c} = excluded.{c}" for c in update_columns))
+
+
+class PoolMetrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.waits = 0
+        self.wait_time = 0.0
+        self.timeouts = 0
+        self.errors = 0
+        self.created = 0
+        self.discarded = 0
+
+    def incr(self, name, amount=1):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + amount)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'checkouts': self.checkouts,
+                'waits': self.waits,
+                'wait_time': self.wait_time,
+                'timeouts': self.timeouts,
+                'errors': self.errors,
+                'created': self.created,
+                'discarded': self.discarded,
+            }
+
+
+class ConnectionPool:
+    """Fixed-size pool of DB connections shared by all request threads.
+
+    Idle connections are kept in a LIFO queue so the warmest one is reused first.
+    Connections that have been idle longer than health_check_interval are pinged
+    before being handed out and replaced if the ping fails.
+    """
+
+    def __init__(self, backend, pool_size=5, timeout=5.0, health_check_interval=30.0):
+        if pool_size < 1:
+            raise ValueError("pool_size must be at least 1")
+        self.backend = backend
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+        self.metrics = PoolMetrics()
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(pool_size)
+        self._closed = False
+
+    def _new_connection(self):
+        try:
+            conn = self.backend.connect()
+        except Exception:
+            self.metrics.incr('errors')
+            raise
+        self.metrics.incr('created')
+        return conn
+
+    def _discard(self, conn):
+        self.metrics.incr('discarded')
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def _healthy(self, conn, last_used):
+        if time.monotonic() - last_used < self.health_check_interval:
+            return True
+        try:
+            self.backend.ping(conn)
+            return True
+        except Exception as e:
+            logger.warning("Discarding unhealthy %s connection: %s", self.backend.name, e)
+            self.metrics.incr('errors')
+            return False
+
+    def get(self, timeout=None):
+        if self._closed:
+            raise PoolTimeout("Connection pool is closed")
+        timeout = self.timeout if timeout is None else timeout
+
+        if not self._slots.acquire(blocking=False):
+            self.metrics.incr('waits')
+            started = time.perf_counter()
+            acquired = self._slots.acquire(timeout=timeout)
+            self.metrics.incr('wait_time', time.perf_counter() - started)
+            if not acquired:
+                self.metrics.incr('timeouts')
+                raise PoolTimeout(f"No {self.backend.name} connection available after {timeout}s")
+
+        try:
+            while True:
+                try:
+                    conn, last_used = self._idle.get_nowait()
+                except queue.Empty:
+                    conn = self._new_connection()
+                    break
+                if self._healthy(conn, last_used):
+                    break
+                self._discard(conn)
+        except Exception:
+            self._slots.release()
+            raise
+
+        self.metrics.incr('checkouts')
+        return conn
+
+    def release(self, conn, discard=False):
+        if discard or self._closed:
+            self._discard(conn)
+        else:
+            self._idle.put((conn, time.monotonic()))
+        self._slots.release()
+
+    @contextmanager
+    def connection(self, timeout=None):
+        conn = self.get(timeout)
+        broken = False
+        try:
+            yield conn
+        except Exception:
+            # The connection may be mid-transaction or dead; don't hand it to the next request
+            broken = True
+            self.metrics.incr('errors')
+            raise
+        finally:
+            self.release(conn, discard=broken)
+
+    def close(self):
+        self._closed = True
+        while True:
+            try:
+                conn, _ = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(conn)
+
+    def stats(self):
+        stats = self.metrics.snapshot()
+        stats['backend'] = self.backend.name
+        stats['pool_size'] = self.pool_size
+        stats['idle'] = self._idle.qsize()
+        return stats
+
+
+def backend_from_env():
+    """DB_BACKEND picks the engine; unset, it's MySQL if MYSQL_HOST is configured and the bundled SQLite file if not."""
+    backend_name = os.environ.get('DB_BACKEND') or ('mysql' if os.environ.get('MYSQL_HOST') else 'sqlite')
+    backend_name = backend_name.lower()
+    if backend_name == 'sqlite':
+        return SQLiteBackend()
+    if backend_name == 'mysql':
+        return MySQLBackend()
+    raise ValueError(f"Unknown DB_BACKEND: {backend_name}")
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """Returns the process-wide pool, creating it from the environment on first use."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(
+                    backend_from_env(),
+                    pool_size=int(os.environ.get('DB_POOL_SIZE', 5)),
+                    timeout=float(os.environ.get('DB_POOL_TIMEOUT', 5.0)),
+                    health_check_interval=float(os.environ.get('DB_POOL_HEALTH_CHECK', 30.0)),
+                )
+    return _pool
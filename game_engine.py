@@ -0,0 +1,384 @@
+"""Trader Titan game rules, free of Flask, sessions and templates.
+
+A GameState holds everything about one game. The functions below are the
+only things that change it; they raise InvalidMove for moves the rules
+don't allow and return any messages meant for the player as
+(category, text) pairs. The web routes are a thin layer that parses forms,
+flashes those messages and stores GameState.to_dict(). Simulations and
+load tests can drive the same functions directly.
+"""
+import random
+import logging
+from bot_strategies import BOT_CLASSES, Bot
+from bot_belief import Belief
+
+logger = logging.getLogger(__name__)
+
+STARTING_CAPITAL = 10000
+
+bot_types = BOT_CLASSES
+
+
+class InvalidMove(ValueError):
+    """Raised when the player tries a move the rules don't allow; the message is shown to them."""
+
+
+# Called with a dict for every settled trade (the web app appends them to game_store's trade log)
+trade_listeners = []
+
+
+def _trade_settled(state, trader, trade_action, damage):
+    trade = {
+        'true_answer': state.true_answer,
+        'bid': state.bid,
+        'ask': state.ask,
+        'action': trade_action,
+        'trader': trader,
+        'damage': damage,
+        'mode': state.mode,
+        'bot_type': state.bot_type_name,
+    }
+    for listener in trade_listeners:
+        listener(trade)
+
+
+def create_bot(true_answer, bot_type_name=None, bot_params=None, question_data=None):
+    """Builds a bot for one question.
+
+    With question_data the bot plays blind: it isn't given true_answer, starts
+    from a prior for the question's tags/units and learns from the player's moves.
+    """
+    if bot_type_name is None:
+        bot_type_name = random.choice(list(bot_types.keys()))
+
+    if bot_params is None:
+        bot_params = {
+            'initial_estimate_noise': 0.5,
+            'width_reduction_multiplier': 0.9,
+            'market_willingness': 0.5,
+            'std_dev_multiplier': 4.0
+        }
+
+    if bot_type_name in bot_types:
+        if question_data is not None:
+            belief = Belief.from_question(question_data.get('units'), question_data.get('tags'))
+            return bot_types[bot_type_name](None, belief=belief, **bot_params)
+        bot = bot_types[bot_type_name](true_answer, **bot_params)
+        return bot
+    else:
+        logger.error("Unknown bot type: %s", bot_type_name)
+        return None
+
+
+class GameState:
+    FIELDS = (
+        'mode', 'question', 'true_answer', 'units', 'current_mover', 'current_width',
+        'game_over', 'market_made', 'market_maker', 'bid', 'ask', 'bot_type_name',
+        'bot', 'bot_log', 'player_capital', 'bot_capital', 'winner', 'round_ended',
+        'last_round_damage', 'last_round_winner', 'round_summary', 'waiting_for_market',
+    )
+
+    def __init__(self, mode, bot_type_name=None, player_capital=STARTING_CAPITAL, bot_capital=STARTING_CAPITAL):
+        self.mode = mode
+        self.question = None
+        self.true_answer = None
+        self.units = None
+        self.current_mover = 'player'
+        self.current_width = None
+        self.game_over = False
+        self.market_made = False
+        self.market_maker = None
+        self.bid = None
+        self.ask = None
+        self.bot_type_name = bot_type_name
+        self.bot = None
+        self.bot_log = []
+        self.player_capital = player_capital
+        self.bot_capital = bot_capital
+        self.winner = None
+        self.round_ended = False
+        self.last_round_damage = None
+        self.last_round_winner = None
+        self.round_summary = None
+        self.waiting_for_market = False
+
+    # The bot's decision log is never shown to the player, so by default it isn't saved between requests
+    keep_bot_log = False
+
+    def to_dict(self):
+        """Converts the game to a JSON-serializable dictionary."""
+        data = {field: getattr(self, field) for field in self.FIELDS}
+        if self.bot is None:
+            data['bot'] = None
+        elif self.keep_bot_log:
+            data['bot'] = self.bot.to_dict()
+        else:
+            data['bot'] = self.bot.to_tuple()
+        return data
+
+    @staticmethod
+    def from_dict(data):
+        """Rebuilds a game from to_dict() output."""
+        state = GameState(data['mode'])
+        for field in GameState.FIELDS:
+            if field in data:
+                setattr(state, field, data[field])
+        bot_data = data.get('bot')
+        if isinstance(bot_data, (list, tuple)):
+            state.bot = Bot.from_tuple(bot_data)
+        elif bot_data is not None:
+            state.bot = Bot.from_dict(bot_data)
+        if state.bot_log is None:
+            state.bot_log = []
+        return state
+
+
+def start_round(state, question_data, bot, first_mover):
+    """Loads a new question and bot into state, keeping mode and both capitals."""
+    state.question = f"{question_data['question']} (in {question_data['units']})"
+    state.true_answer = float(question_data['answer'])
+    state.units = str(question_data['units'])
+    state.current_mover = first_mover
+    state.current_width = None
+    state.market_made = False
+    state.market_maker = None
+    state.bid = None
+    state.ask = None
+    state.bot = bot
+    state.bot_type_name = type(bot).__name__
+    state.bot_log = []
+    state.game_over = False
+    state.winner = None
+    state.round_summary = None
+    state.round_ended = False
+    state.last_round_damage = None
+    state.last_round_winner = None
+    state.waiting_for_market = False
+
+
+def new_game(mode, question_data, bot, first_mover='player'):
+    state = GameState(mode)
+    start_round(state, question_data, bot, first_mover)
+    return state
+
+
+def _require_player_turn(state):
+    if state.game_over:
+        raise InvalidMove("The game is over.")
+    if state.current_mover != 'player':
+        raise InvalidMove("It's not your turn.")
+
+
+def set_initial_width(state, width):
+    _require_player_turn(state)
+    if state.current_width is not None:
+        raise InvalidMove("The width has already been set.")
+    if width < 1:
+        raise InvalidMove("Initial width must be at least 1.")
+    state.current_width = width
+    state.current_mover = 'bot'
+    state.bot.observe('set_width', width)
+
+
+def reduce_width(state, width):
+    _require_player_turn(state)
+    if state.current_width is None or state.market_maker is not None:
+        raise InvalidMove("You can't reduce the width now.")
+    if width < 1:
+        raise InvalidMove("Width cannot be less than 1.")
+    if width > int(state.current_width * 0.9):
+        raise InvalidMove("Width reduction must be at least 10%.")
+    state.current_width = width
+    state.current_mover = 'bot'
+    state.bot.observe('reduce_width', width)
+
+
+def ask_for_market(state):
+    """The player tells the bot to make a market at the current width."""
+    _require_player_turn(state)
+    if state.current_width is None or state.market_maker is not None:
+        raise InvalidMove("You can't ask for a market now.")
+    state.market_maker = 'player'
+    state.current_mover = 'bot'
+
+
+def provide_market(state, bid, ask):
+    """The player quotes a market after the bot asked for one."""
+    _require_player_turn(state)
+    if state.market_maker != 'bot' or state.market_made:
+        raise InvalidMove("The bot hasn't asked you for a market.")
+    if ask - bid != state.current_width:
+        raise InvalidMove("The spread must equal the current width!")
+    state.bid = bid
+    state.ask = ask
+    state.market_made = True
+    state.current_mover = 'bot'
+    state.bot.observe('provide_market', bid=bid, ask=ask)
+
+
+def player_trade(state, trade_action):
+    """The player trades on the bot's market, ending the round."""
+    _require_player_turn(state)
+    if trade_action not in ['buy', 'sell']:
+        raise InvalidMove("Invalid trade action.")
+    if not state.market_made:
+        raise InvalidMove("There is no market to trade on.")
+    correct_price = state.true_answer
+    if trade_action == 'buy':
+        trade_price = state.ask
+        damage = abs(correct_price - trade_price)
+    else:  # sell
+        trade_price = state.bid
+        damage = abs(trade_price - correct_price)
+
+    # Calculate who won this round
+    if (trade_action == 'buy' and correct_price < trade_price) or \
+       (trade_action == 'sell' and correct_price > trade_price):
+        state.player_capital -= damage
+        state.winner = 'bot'
+        state.last_round_winner = 'bot'
+    else:
+        state.bot_capital -= damage
+        state.winner = 'player'
+        state.last_round_winner = 'player'
+
+    state.last_round_damage = damage
+    state.round_ended = True
+    _trade_settled(state, 'player', trade_action, damage)
+
+    if state.player_capital <= 0:
+        state.game_over = True
+
+
+def bot_move(state):
+    """Plays one bot move: trading on the player's market, setting the width, quoting or reducing."""
+    messages = []
+    bot = state.bot
+
+    # bot to trade
+    if state.market_made and state.market_maker == 'bot':
+        trade_action = bot.trade(state.bid, state.ask)
+        correct_price = state.true_answer
+
+        if trade_action == 'buy':
+            trade_price = state.ask
+            if trade_price > correct_price:
+                damage = abs(correct_price - trade_price)
+                state.bot_capital -= damage
+                state.winner = 'player'
+                state.bot_log.append(f"Bot bought at {trade_price} (above true value {correct_price})")
+                state.bot_log.append(f"Bot takes damage: {damage}")
+            else:
+                damage = abs(correct_price - trade_price)
+                state.player_capital -= damage
+                state.winner = 'bot'
+                state.bot_log.append(f"Bot bought at {trade_price} (below true value {correct_price})")
+                state.bot_log.append(f"Player takes damage: {damage}")
+        else:  # sell
+            trade_price = state.bid
+            if trade_price < correct_price:
+                damage = abs(trade_price - correct_price)
+                state.bot_capital -= damage
+                state.winner = 'player'
+                state.bot_log.append(f"Bot sold at {trade_price} (below true value {correct_price})")
+                state.bot_log.append(f"Bot takes damage: {damage}")
+            else:
+                damage = abs(trade_price - correct_price)
+                state.player_capital -= damage
+                state.winner = 'bot'
+                state.bot_log.append(f"Bot sold at {trade_price} (above true value {correct_price})")
+                state.bot_log.append(f"Player takes damage: {damage}")
+
+        state.last_round_damage = damage
+        state.round_summary = {
+            'true_answer': correct_price,
+            'trade_action': trade_action,
+            'trade_price': trade_price,
+            'damage': damage,
+            'winner': state.winner
+        }
+        _trade_settled(state, 'bot', trade_action, damage)
+
+        messages.append(('info', f"""Round Summary:
+        True Answer: {correct_price}
+        Bot {trade_action} at {trade_price}
+        Damage Dealt: {damage}
+        Winner: {state.winner}
+        New Player Capital: {state.player_capital}
+        New Bot Capital: {state.bot_capital}"""))
+
+        #game over
+        if state.bot_capital <= 0 or state.player_capital <= 0:
+            state.game_over = True
+        else:
+            #new round
+            state.round_ended = True
+
+    elif state.current_width is None:
+        state.current_width = bot.generate_initial_width()
+        state.current_mover = 'player'
+        state.bot_log.append(f"Bot set initial width: {state.current_width}")
+
+    elif state.market_maker == 'player' and not state.market_made:
+        state.bid, state.ask = bot.make_market(state.current_width)
+        state.market_made = True
+        state.bot_log.append(f"Bot made market: Bid={state.bid}, Ask={state.ask}")
+        state.current_mover = 'player'
+
+    else:
+        action = bot.choose_action(state.current_width)
+        state.bot_log.append(f"Bot chooses to: {action}")
+
+        if action == 'make_market':
+            state.market_maker = 'bot'
+            state.market_made = False
+            state.current_mover = 'player'
+            state.waiting_for_market = True
+
+        else:
+            new_width = int(round(state.current_width * bot.width_reduction_multiplier))
+            state.current_width = max(1, new_width)
+            state.current_mover = 'player'
+
+    return messages
+
+
+def _play_until_round_change(state, messages):
+    """Plays bot moves until it's the player's move, the game is over, or a round has just ended (returns True)."""
+    while not state.game_over:
+        if state.round_ended:
+            messages.append(('info', f"Round Complete! {state.winner} won. Damage: {state.last_round_damage}"))
+            state.round_ended = False
+            return True
+        if state.current_mover == 'bot':
+            messages.extend(bot_move(state))
+        else:
+            break
+    return False
+
+
+def _no_next_round(state, messages):
+    messages.append(('error', "Could not load a new question!"))
+    state.game_over = True
+
+
+def advance(state, next_round):
+    """Plays bot moves and round changes until it's the player's move or the game is over.
+
+    next_round(state) must load the next question (usually via start_round)
+    and return False if there isn't one, which ends the game.
+    """
+    messages = []
+    while _play_until_round_change(state, messages):
+        if not next_round(state):
+            _no_next_round(state, messages)
+    return messages
+
+
+async def advance_async(state, next_round):
+    """advance() for the ASGI app, where next_round is a coroutine function so loading a question doesn't block."""
+    messages = []
+    while _play_until_round_change(state, messages):
+        if not await next_round(state):
+            _no_next_round(state, messages)
+    return messages
@@ -0,0 +1,243 @@
+import abc
+import os
+import json
+import secrets
+import threading
+import time
+import logging
+from db_pool import ConnectionPool, SQLiteBackend
+
+logger = logging.getLogger(__name__)
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def new_game_id():
+    return secrets.token_urlsafe(16)
+
+
+class GameStore(abc.ABC):
+    """Server-side home for game_state dicts, keyed by the game id kept in the cookie.
+
+    Games expire ttl seconds after they were last saved. Expired games are
+    treated as missing on load and swept out every purge_interval seconds.
+    """
+
+    def __init__(self, ttl=24 * 3600, purge_interval=600):
+        self.ttl = ttl
+        self.purge_interval = purge_interval
+        self._last_purge = time.monotonic()
+
+    def create(self, game_state):
+        game_id = new_game_id()
+        self.save(game_id, game_state)
+        self._maybe_purge()
+        return game_id
+
+    def _maybe_purge(self):
+        if time.monotonic() - self._last_purge >= self.purge_interval:
+            self._last_purge = time.monotonic()
+            purged = self.purge_expired()
+            if purged:
+                logger.info("Purged %d expired games", purged)
+
+    @abc.abstractmethod
+    def load(self, game_id):
+        pass
+
+    @abc.abstractmethod
+    def save(self, game_id, game_state):
+        pass
+
+    @abc.abstractmethod
+    def delete(self, game_id):
+        pass
+
+    @abc.abstractmethod
+    def purge_expired(self):
+        pass
+
+    @abc.abstractmethod
+    def iter_states(self):
+        """Yields every unexpired game_state, for offline analysis."""
+
+
+class MemoryGameStore(GameStore):
+    """Keeps games in a dict. Only suitable for a single worker process."""
+
+    def __init__(self, ttl=24 * 3600, purge_interval=600):
+        super().__init__(ttl, purge_interval)
+        self._games = {}
+        self._lock = threading.Lock()
+
+    def load(self, game_id):
+        with self._lock:
+            entry = self._games.get(game_id)
+        if entry is None or entry[1] < time.time():
+            return None
+        # Callers mutate the state freely, so hand out a copy like the other stores do
+        return json.loads(entry[0])
+
+    def save(self, game_id, game_state):
+        with self._lock:
+            self._games[game_id] = (json.dumps(game_state), time.time() + self.ttl)
+
+    def delete(self, game_id):
+        with self._lock:
+            self._games.pop(game_id, None)
+
+    def purge_expired(self):
+        now = time.time()
+        with self._lock:
+            expired = [game_id for game_id, (_, expires_at) in self._games.items() if expires_at < now]
+            for game_id in expired:
+                del self._games[game_id]
+        return len(expired)
+
+    def iter_states(self):
+        now = time.time()
+        with self._lock:
+            entries = list(self._games.values())
+        for state, expires_at in entries:
+            if expires_at >= now:
+                yield json.loads(state)
+
+
+class SQLiteGameStore(GameStore):
+    """Keeps games in a SQLite table, shared by every worker on the host."""
+
+    def __init__(self, path, ttl=24 * 3600, purge_interval=600, pool_size=5):
+        super().__init__(ttl, purge_interval)
+        self.pool = ConnectionPool(SQLiteBackend(path, wal=True), pool_size=pool_size)
+        with self.pool.connection() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS games (
+                    id TEXT PRIMARY KEY,
+                    state TEXT NOT NULL,
+                    expires_at REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_games_expires_at ON games (expires_at)")
+            conn.commit()
+
+    def load(self, game_id):
+        with self.pool.connection() as conn:
+            row = conn.execute("SELECT state FROM games WHERE id = ? AND expires_at >= ?",
+                               (game_id, time.time())).fetchone()
+        return json.loads(row['state']) if row else None
+
+    def save(self, game_id, game_state):
+        with self.pool.connection() as conn:
+            conn.execute("INSERT OR REPLACE INTO games (id, state, expires_at) VALUES (?, ?, ?)",
+                         (game_id, json.dumps(game_state), time.time() + self.ttl))
+            conn.commit()
+
+    def delete(self, game_id):
+        with self.pool.connection() as conn:
+            conn.execute("DELETE FROM games WHERE id = ?", (game_id,))
+            conn.commit()
+
+    def purge_expired(self):
+        with self.pool.connection() as conn:
+            purged = conn.execute("DELETE FROM games WHERE expires_at < ?", (time.time(),)).rowcount
+            conn.commit()
+        return purged
+
+    def iter_states(self):
+        with self.pool.connection() as conn:
+            rows = conn.execute("SELECT state FROM games WHERE expires_at >= ?", (time.time(),)).fetchall()
+        for row in rows:
+            yield json.loads(row['state'])
+
+
+class FileGameStore(GameStore):
+    """Keeps one JSON file per game in a directory; expiry is based on file mtime."""
+
+    def __init__(self, directory, ttl=24 * 3600, purge_interval=600):
+        super().__init__(ttl, purge_interval)
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, game_id):
+        # Game ids come back from the client, so never let one escape the directory
+        if not game_id or not all(c.isalnum() or c in '-_' for c in game_id):
+            return None
+        return os.path.join(self.directory, f"{game_id}.json")
+
+    def load(self, game_id):
+        path = self._path(game_id)
+        if path is None:
+            return None
+        try:
+            if os.path.getmtime(path) + self.ttl < time.time():
+                return None
+            with open(path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def save(self, game_id, game_state):
+        path = self._path(game_id)
+        if path is None:
+            raise ValueError(f"Invalid game id: {game_id}")
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(game_state, f)
+        os.replace(tmp_path, path)
+
+    def delete(self, game_id):
+        path = self._path(game_id)
+        if path is None:
+            return
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    def purge_expired(self):
+        cutoff = time.time() - self.ttl
+        purged = 0
+        for name in os.listdir(self.directory):
+            if not name.endswith('.json'):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+                    purged += 1
+            except OSError:
+                continue
+        return purged
+
+    def iter_states(self):
+        for name in os.listdir(self.directory):
+            if name.endswith('.json'):
+                state = self.load(name[:-len('.json')])
+                if state is not None:
+                    yield state
+
+
+def store_from_env():
+    backend = os.environ.get('GAME_STORE', 'sqlite').lower()
+    ttl = float(os.environ.get('GAME_TTL', 24 * 3600))
+    if backend == 'memory':
+        return MemoryGameStore(ttl=ttl)
+    if backend == 'sqlite':
+        return SQLiteGameStore(os.environ.get('GAME_STORE_PATH') or os.path.join(APP_DIR, 'games.db'), ttl=ttl)
+    if backend == 'file':
+        return FileGameStore(os.environ.get('GAME_STORE_PATH') or os.path.join(APP_DIR, 'games'), ttl=ttl)
+    raise ValueError(f"Unknown GAME_STORE: {backend}")
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_game_store():
+    """Returns the process-wide game store, configured from the environment."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = store_from_env()
+    return _store
@@ -0,0 +1,152 @@
+"""Logging for the web app: JSON lines written off the request path.
+
+configure_logging() puts a QueueHandler on the root logger and a
+QueueListener thread behind it that does the formatting and the file I/O. A
+request thread only builds a LogRecord, and only for enabled levels; the
+message's %-args are formatted by the writer thread, so pass them as args
+(logger.debug("x %s", y)) rather than in an f-string. Anything expensive to
+compute just for a log line belongs behind logger.isEnabledFor().
+
+Each line is a JSON object with ts, level, logger and msg, plus any fields
+passed with extra={...} and the traceback as exc. The file rotates by size.
+
+Settled trades (log_trade, a game_engine trade listener) go through the same
+queue to a file of their own, one trade per JSON line, but only when
+TRADE_LOG names one; it rotates like the main log.
+
+Env vars:
+- LOG_FILE (trader_titan.log), LOG_MAX_BYTES (10 MB), LOG_BACKUP_COUNT (5)
+- LOG_LEVEL (INFO) - root level
+- LOG_LEVELS - per-logger overrides, e.g. "question_sampler=DEBUG,werkzeug=WARNING"
+- LOG_FORMAT - json (default) or text
+- TRADE_LOG - trade file; unset (the default) means trades aren't logged
+
+With several worker processes, give each its own LOG_FILE; rotation isn't
+coordinated between processes.
+"""
+import atexit
+import json
+import logging
+import os
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+DEFAULT_LOG_FILE = 'trader_titan.log'
+TRADE_LOGGER = 'trades'
+TEXT_FORMAT = '%(asctime)s - %(levelname)s - %(name)s - %(message)s'
+
+# Attributes every LogRecord has; anything else on a record came from extra={...}
+_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {'message', 'asctime', 'taskName'}
+
+_listener = None
+trade_logger = logging.getLogger(TRADE_LOGGER)
+
+
+class JSONFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            'ts': round(record.created, 3),
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS:
+                entry[key] = value
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class TradeFormatter(logging.Formatter):
+    """Writes just the trade dict from log_trade(), plus ts."""
+
+    def format(self, record):
+        return json.dumps(dict(record.trade, ts=round(record.created, 3)), default=str)
+
+
+class LazyQueueHandler(QueueHandler):
+    """Queues records as they are instead of formatting them on the calling thread.
+
+    The stock QueueHandler formats in prepare() so records can cross process
+    boundaries; this queue never leaves the process. Args are formatted later,
+    so don't log an object that is about to be mutated.
+    """
+
+    def prepare(self, record):
+        return record
+
+
+def parse_levels(spec):
+    """'a=DEBUG, b.c=warning' -> {'a': 'DEBUG', 'b.c': 'WARNING'}"""
+    levels = {}
+    for item in (spec or '').split(','):
+        if '=' in item:
+            name, level = item.split('=', 1)
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+def trade_log_path():
+    """TRADE_LOG, or None when trade logging is off."""
+    return os.environ.get('TRADE_LOG') or None
+
+
+def log_trade(trade):
+    """game_engine trade listener; app.py only registers it when TRADE_LOG is set."""
+    trade_logger.info("trade", extra={'trade': trade})
+
+
+def configure_logging(path=None, level=None, levels=None, max_bytes=None, backup_count=None, fmt=None,
+                      trade_path=None):
+    """Routes all logging through a queue to a rotating file; arguments default to the env vars. Safe to call twice."""
+    global _listener
+    if _listener is not None:
+        return _listener
+
+    path = path or os.environ.get('LOG_FILE', DEFAULT_LOG_FILE)
+    level = (level or os.environ.get('LOG_LEVEL', 'INFO')).upper()
+    levels = levels if levels is not None else parse_levels(os.environ.get('LOG_LEVELS'))
+    max_bytes = max_bytes if max_bytes is not None else int(os.environ.get('LOG_MAX_BYTES', 10 * 2 ** 20))
+    backup_count = backup_count if backup_count is not None else int(os.environ.get('LOG_BACKUP_COUNT', 5))
+    fmt = fmt or os.environ.get('LOG_FORMAT', 'json')
+    trade_path = trade_path or trade_log_path()
+
+    file_handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8')
+    file_handler.setFormatter(JSONFormatter() if fmt == 'json' else logging.Formatter(TEXT_FORMAT))
+    file_handler.addFilter(lambda record: record.name != TRADE_LOGGER)
+    handlers = [file_handler]
+    if trade_path:
+        trade_handler = RotatingFileHandler(trade_path, maxBytes=max_bytes, backupCount=backup_count,
+                                            encoding='utf-8')
+        trade_handler.setFormatter(TradeFormatter())
+        trade_handler.addFilter(logging.Filter(TRADE_LOGGER))
+        handlers.append(trade_handler)
+
+    log_queue = queue.SimpleQueue()
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(LazyQueueHandler(log_queue))
+    root.setLevel(level)
+    for name, logger_level in levels.items():
+        logging.getLogger(name).setLevel(logger_level)
+    if trade_path:
+        # Trades are data, not diagnostics; LOG_LEVEL=WARNING shouldn't drop them
+        trade_logger.setLevel(logging.INFO)
+
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logging)
+    return _listener
+
+
+def stop_logging():
+    """Writes out whatever is still queued and stops the writer thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+trade_logger = logging.getLogger(TRADE_LOGGER)
@@ -0,0 +1,208 @@
+"""In-process latency histograms and sampled counters, exposed in the Prometheus text format.
+
+Observing is kept off the hot path: a timer just appends (labels, seconds)
+to a deque (atomic, no lock), and the histogram folds pending samples into
+its buckets when it is rendered, or every FOLD_EVERY samples so the deque
+stays small between scrapes. A timed block costs about a microsecond.
+Each worker process keeps its own numbers; scrape every worker (or run one).
+METRICS_ENABLED=0 turns every timer into a no-op. Sampled counters and
+gauges (the question cache's and connection pool's stats) are read from
+their owners at render time.
+
+RequestProfiler is the optional cProfile hook: it profiles a random sample
+of requests and writes the ones slower than a threshold to disk as .prof
+files (open them with `python -m pstats` or snakeviz).
+"""
+import cProfile
+import os
+import random
+import re
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Seconds; requests here are mostly sub-millisecond, so the low end is fine-grained
+DEFAULT_BUCKETS = (.0001, .00025, .0005, .001, .0025, .005, .01, .025, .05, .1, .25, .5, 1, 2.5)
+FOLD_EVERY = 4096
+
+enabled = os.environ.get('METRICS_ENABLED', '1') != '0'
+
+_registry = []
+_perf_counter = time.perf_counter
+
+
+class _Timer:
+    __slots__ = ('histogram', 'labels', 'started')
+
+    def __init__(self, histogram, labels):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.started = _perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # Histogram.observe() inlined; every call counts at this scale
+        pending = self.histogram._pending
+        pending.append((self.labels, _perf_counter() - self.started))
+        if len(pending) >= FOLD_EVERY:
+            self.histogram._fold()
+
+
+class _NullTimer:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        pass
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class Histogram:
+    def __init__(self, name, help_text, label_names=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        # label values -> [count per bucket (last one is +Inf), sum]
+        self._series = {}
+        self._pending = deque()
+        self._fold_lock = threading.Lock()
+        _registry.append(self)
+
+    def observe(self, seconds, *labels):
+        self._pending.append((labels, seconds))
+        if len(self._pending) >= FOLD_EVERY:
+            self._fold()
+
+    def time(self, *labels):
+        """Context manager that observes the time spent inside it."""
+        return _Timer(self, labels) if enabled else _NULL_TIMER
+
+    def _fold(self):
+        with self._fold_lock:
+            pending = self._pending
+            buckets = self.buckets
+            while True:
+                try:
+                    labels, seconds = pending.popleft()
+                except IndexError:
+                    break
+                series = self._series.get(labels)
+                if series is None:
+                    series = self._series[labels] = [[0] * (len(buckets) + 1), 0.0]
+                series[0][bisect_left(buckets, seconds)] += 1
+                series[1] += seconds
+
+    def render(self):
+        self._fold()
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._fold_lock:
+            series = [(labels, list(counts), total) for labels, (counts, total) in sorted(self._series.items())]
+        for labels, counts, total in series:
+            pairs = [f'{name}="{_escape(value)}"' for name, value in zip(self.label_names, labels)]
+            cumulative = 0
+            for bound, count in zip(self.buckets + ('+Inf',), counts):
+                cumulative += count
+                bucket_labels = ','.join(pairs + [f'le="{bound}"'])
+                lines.append(f"{self.name}_bucket{{{bucket_labels}}} {cumulative}")
+            suffix = '{' + ','.join(pairs) + '}' if pairs else ''
+            lines.append(f"{self.name}_sum{suffix} {total}")
+            lines.append(f"{self.name}_count{suffix} {cumulative}")
+        return lines
+
+
+class Sampled:
+    """A counter or gauge read from somewhere else when /metrics is rendered.
+
+    collect() returns {label values: number}; for the stats other modules
+    already keep (cache hits, pool waits), so nothing extra happens per event.
+    """
+
+    def __init__(self, name, help_text, kind, collect, label_names=()):
+        self.name = name
+        self.help_text = help_text
+        self.kind = kind
+        self.collect = collect
+        self.label_names = tuple(label_names)
+        _registry.append(self)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+        for labels, value in sorted(self.collect().items()):
+            pairs = [f'{name}="{_escape(value)}"' for name, value in zip(self.label_names, labels)]
+            suffix = '{' + ','.join(pairs) + '}' if pairs else ''
+            lines.append(f"{self.name}{suffix} {value}")
+        return lines
+
+
+def _escape(value):
+    return str(value).replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')
+
+
+def render_metrics():
+    """Every registered metric in the Prometheus text exposition format."""
+    return '\n'.join(line for histogram in _registry for line in histogram.render()) + '\n'
+
+
+class RequestProfiler:
+    """Profiles a random sample of requests, one at a time, and saves the slow ones.
+
+    cProfile only sees the thread that enabled it, and only one profiler can
+    be active per process, so a request that arrives while another is being
+    profiled just isn't sampled.
+    """
+
+    def __init__(self, directory, sample_rate=0.01, slow_seconds=0.2, max_files=100):
+        self.directory = directory
+        self.sample_rate = sample_rate
+        self.slow_seconds = slow_seconds
+        self.max_files = max_files
+        self.saved = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def start(self):
+        """Returns a running profiler if this request is sampled, else None."""
+        if self.saved >= self.max_files or random.random() >= self.sample_rate:
+            return None
+        if not self._lock.acquire(blocking=False):
+            return None
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Another tool (a debugger, coverage) already holds the profiling hook
+            self._lock.release()
+            return None
+        return profiler
+
+    def finish(self, profiler, name, seconds):
+        """Stops the profiler and writes its stats if the request took at least slow_seconds."""
+        profiler.disable()
+        self._lock.release()
+        if seconds < self.slow_seconds:
+            return None
+        self.saved += 1
+        safe_name = re.sub(r'[^A-Za-z0-9_.-]', '_', name or 'unknown')
+        path = os.path.join(self.directory, f"{int(time.time() * 1000)}-{safe_name}-{seconds * 1000:.0f}ms.prof")
+        profiler.dump_stats(path)
+        return path
+
+
+def profiler_from_env():
+    """A RequestProfiler if PROFILE_DIR is set, configured by PROFILE_SAMPLE_RATE and PROFILE_SLOW_MS."""
+    directory = os.environ.get('PROFILE_DIR')
+    if not directory:
+        return None
+    return RequestProfiler(directory,
+                           sample_rate=float(os.environ.get('PROFILE_SAMPLE_RATE', 0.01)),
+                           slow_seconds=float(os.environ.get('PROFILE_SLOW_MS', 200)) / 1000,
+                           max_files=int(os.environ.get('PROFILE_MAX_FILES', 100)))
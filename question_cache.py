@@ -0,0 +1,220 @@
+import os
+import threading
+import time
+import logging
+from collections import OrderedDict, deque
+from question_sampler import get_sampler
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STAMP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.questions_version')
+
+
+def _stamp_path():
+    return os.environ.get('QUESTION_CACHE_STAMP', DEFAULT_STAMP_PATH)
+
+
+def notify_questions_changed(path=None):
+    """Tells every running app process that the questions table has changed.
+
+    Scripts that write to the table run in their own process, so they can't
+    reach the in-memory cache directly. Instead they bump a stamp file whose
+    mtime the cache's prefetch thread watches.
+    """
+    path = path or _stamp_path()
+    with open(path, 'w') as f:
+        f.write(str(time.time()))
+
+
+class QuestionCache:
+    """Bounded in-memory working set of question rows.
+
+    Rows are kept in an LRU keyed by id and expire after ttl seconds. A
+    background thread keeps a short queue of pre-sampled rows per requested
+    tag, so random_question() normally pops a row from memory without touching
+    the database. Sampling still goes through QuestionSampler, so questions
+    stay uniformly distributed over the whole table.
+    """
+
+    def __init__(self, sampler, capacity=256, ttl=300.0, prefetch_size=16, stamp_path=None, check_interval=5.0):
+        self.sampler = sampler
+        self.capacity = capacity
+        self.ttl = ttl
+        self.prefetch_size = prefetch_size
+        self.stamp_path = stamp_path or _stamp_path()
+        self.check_interval = check_interval
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.prefetched = 0
+        self.invalidations = 0
+        self._rows = OrderedDict()
+        self._ready = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stamp = self._read_stamp()
+        self._thread = None
+        self._stopped = False
+
+    def _read_stamp(self):
+        try:
+            return os.stat(self.stamp_path).st_mtime_ns
+        except OSError:
+            return None
+
+    def _put(self, row):
+        self._rows[row['id']] = (row, time.monotonic() + self.ttl)
+        self._rows.move_to_end(row['id'])
+        while len(self._rows) > self.capacity:
+            self._rows.popitem(last=False)
+            self.evictions += 1
+
+    def _lookup(self, question_id):
+        entry = self._rows.get(question_id)
+        if entry is None:
+            return None
+        row, expires_at = entry
+        if time.monotonic() >= expires_at:
+            del self._rows[question_id]
+            self.expirations += 1
+            return None
+        self._rows.move_to_end(question_id)
+        return row
+
+    def get(self, question_id):
+        """Returns the row for question_id, loading it on a miss."""
+        with self._lock:
+            row = self._lookup(question_id)
+            if row is not None:
+                self.hits += 1
+                return row
+            self.misses += 1
+        row = self.sampler.fetch(question_id)
+        if row is not None:
+            with self._lock:
+                self._put(row)
+        return row
+
+    def take_prefetched(self, tag=None):
+        """Pops a pre-sampled row for tag from memory, or returns None (and wakes the prefetcher) if none is ready."""
+        self._ensure_prefetcher()
+        with self._lock:
+            ready = self._ready.setdefault(tag, deque())
+            while ready:
+                question_id = ready.popleft()
+                row = self._lookup(question_id)
+                if row is not None:
+                    self.hits += 1
+                    if len(ready) < self.prefetch_size // 2:
+                        self._wake.set()
+                    return row
+        self._wake.set()
+        return None
+
+    def store(self, row):
+        """Caches a row the caller sampled itself after take_prefetched() came up empty; counts as a miss."""
+        with self._lock:
+            self.misses += 1
+            self._put(row)
+
+    def random_question(self, tag=None):
+        """Returns a random question row, served from the prefetch queue when possible."""
+        row = self.take_prefetched(tag)
+        if row is not None:
+            return row
+        # Queue ran dry: sample directly; get() still serves it from the LRU if it's cached
+        question_id = self.sampler.sample_id(tag)
+        if question_id is None:
+            return None
+        return self.get(question_id)
+
+    def invalidate(self):
+        """Drops every cached row and queued sample and reloads the sampler index."""
+        with self._lock:
+            self._rows.clear()
+            for ready in self._ready.values():
+                ready.clear()
+            self.invalidations += 1
+        self.sampler.invalidate()
+        self._wake.set()
+        logger.info("Question cache invalidated")
+
+    def _check_stamp(self):
+        stamp = self._read_stamp()
+        if stamp != self._stamp:
+            self._stamp = stamp
+            self.invalidate()
+
+    def prefetch(self):
+        """Tops up the ready queue of every tag that has been asked for."""
+        with self._lock:
+            wanted = {tag: self.prefetch_size - len(ready) for tag, ready in self._ready.items()}
+        for tag, count in wanted.items():
+            if count <= 0:
+                continue
+            ids = [self.sampler.sample_id(tag) for _ in range(count)]
+            ids = [question_id for question_id in ids if question_id is not None]
+            if not ids:
+                continue
+            with self._lock:
+                missing = list({question_id for question_id in ids if self._lookup(question_id) is None})
+            rows = self.sampler.fetch_many(missing)
+            with self._lock:
+                for row in rows:
+                    self._put(row)
+                self._ready[tag].extend(question_id for question_id in ids if question_id in self._rows)
+                self.prefetched += len(rows)
+
+    def _run(self):
+        while not self._stopped:
+            self._wake.wait(self.check_interval)
+            self._wake.clear()
+            try:
+                self._check_stamp()
+                self.prefetch()
+            except Exception as e:
+                logger.error("Question prefetch failed: %s", e)
+
+    def _ensure_prefetcher(self):
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name='question-prefetch', daemon=True)
+                    self._thread.start()
+
+    def stop(self):
+        self._stopped = True
+        self._wake.set()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'prefetched': self.prefetched,
+                'invalidations': self.invalidations,
+                'size': len(self._rows),
+                'capacity': self.capacity,
+            }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_question_cache():
+    """Returns the process-wide question cache, configured from the environment."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = QuestionCache(
+                    get_sampler(),
+                    capacity=int(os.environ.get('QUESTION_CACHE_SIZE', 256)),
+                    ttl=float(os.environ.get('QUESTION_CACHE_TTL', 300.0)),
+                    prefetch_size=int(os.environ.get('QUESTION_PREFETCH_SIZE', 16)),
+                )
+    return _cache
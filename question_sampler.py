@@ -0,0 +1,239 @@
+import asyncio
+import random
+import threading
+import time
+import logging
+from db_pool import get_pool
+
+logger = logging.getLogger(__name__)
+
+
+def build_index(rows):
+    """(ids, ids_by_tag) from rows of {id, tags}."""
+    ids = []
+    ids_by_tag = {}
+    for row in rows:
+        ids.append(row['id'])
+        for tag in (row['tags'] or '').split(','):
+            tag = tag.strip()
+            if tag:
+                ids_by_tag.setdefault(tag, []).append(row['id'])
+    return ids, ids_by_tag
+
+
+def pick_id(rng, ids, ids_by_tag, tag=None, tag_weights=None):
+    if tag is None and tag_weights:
+        tags = [t for t in tag_weights if ids_by_tag.get(t)]
+        if not tags:
+            return None
+        tag = rng.choices(tags, weights=[tag_weights[t] for t in tags])[0]
+    ids = ids if tag is None else ids_by_tag.get(tag, [])
+    if not ids:
+        return None
+    return ids[rng.randrange(len(ids))]
+
+
+INDEX_SQL = "SELECT id, tags FROM questions"
+MAX_ID_SQL = "SELECT MAX(id) AS max_id FROM questions"
+
+
+def fetch_sql(param, count=1):
+    """SELECT for count question rows by id, with the backend's placeholder."""
+    if count == 1:
+        return f"SELECT * FROM questions WHERE id = {param}"
+    return f"SELECT * FROM questions WHERE id IN ({', '.join([param] * count)})"
+
+
+class QuestionIndex:
+    """Every question id, plus ids grouped by tag, and when to look for new rows.
+
+    Holds no connection: QuestionSampler and AsyncQuestionSampler run the
+    queries (INDEX_SQL, MAX_ID_SQL) their own way and hand the rows in, so
+    both follow the same refresh rules. The index is replaced as a whole, so
+    concurrent readers never see a half-built one.
+    """
+
+    def __init__(self, refresh_interval=60.0, rng=None):
+        self.refresh_interval = refresh_interval
+        self.rng = rng or random.Random()
+        self.ids = []
+        self.ids_by_tag = {}
+        self.max_id = None
+        self.checked_at = None
+
+    def load(self, rows):
+        """Swaps in the index built from INDEX_SQL rows."""
+        ids, ids_by_tag = build_index(rows)
+        self.ids, self.ids_by_tag = ids, ids_by_tag
+        self.max_id = max(ids) if ids else None
+        self.checked_at = time.monotonic()
+        logger.debug("Question index refreshed: %d questions, %d tags", len(ids), len(ids_by_tag))
+
+    def invalidate(self):
+        self.checked_at = None
+
+    @property
+    def stale(self):
+        """True when the index has never been loaded or was invalidated."""
+        return self.checked_at is None
+
+    @property
+    def check_due(self):
+        """True when it's time to look at MAX(id) for new rows."""
+        return time.monotonic() - self.checked_at >= self.refresh_interval
+
+    def is_current(self, max_id):
+        """Whether the table's MAX(id) matches the index; if so, the next check is another interval away."""
+        if max_id != self.max_id:
+            return False
+        self.checked_at = time.monotonic()
+        return True
+
+    def pick(self, tag=None, tag_weights=None):
+        return pick_id(self.rng, self.ids, self.ids_by_tag, tag, tag_weights)
+
+    def tags(self):
+        return sorted(self.ids_by_tag)
+
+
+class QuestionSampler:
+    """Picks random questions in O(1) from a cached index of question ids.
+
+    The index (every id, plus ids grouped by tag) is loaded once and reused
+    until refresh_interval has passed and MAX(id) shows new rows. A sampled id
+    that has since been deleted forces an immediate refresh, so the index can't
+    keep serving stale rows.
+    """
+
+    def __init__(self, pool, refresh_interval=60.0, rng=None, index=None):
+        self.pool = pool
+        self.index = index or QuestionIndex(refresh_interval, rng)
+        self._lock = threading.Lock()
+
+    def _query(self, sql, params=()):
+        with self.pool.connection() as conn:
+            cursor = self.pool.backend.dict_cursor(conn)
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+            cursor.close()
+        return rows
+
+    def refresh(self):
+        """Reloads the id index from the questions table."""
+        with self._lock:
+            self.index.load(self._query(INDEX_SQL))
+
+    def invalidate(self):
+        """Forces the next sample to reload the index."""
+        self.index.invalidate()
+
+    def _maybe_refresh(self):
+        if self.index.stale:
+            self.refresh()
+        elif self.index.check_due:
+            # MAX(id) is a primary-key lookup, so checking for new rows stays cheap
+            if not self.index.is_current(self._query(MAX_ID_SQL)[0]['max_id']):
+                self.refresh()
+
+    def tags(self):
+        self._maybe_refresh()
+        return self.index.tags()
+
+    def sample_id(self, tag=None, tag_weights=None):
+        """Returns a random question id, or None if nothing matches.
+
+        With tag, picks uniformly among questions carrying that tag. With
+        tag_weights ({tag: weight}), first picks a tag by weight and then a
+        question within it.
+        """
+        self._maybe_refresh()
+        return self.index.pick(tag, tag_weights)
+
+    def fetch(self, question_id):
+        rows = self._query(fetch_sql(self.pool.backend.param), (question_id,))
+        return rows[0] if rows else None
+
+    def fetch_many(self, question_ids):
+        """Fetches several rows in one query; ids that no longer exist are skipped."""
+        if not question_ids:
+            return []
+        return self._query(fetch_sql(self.pool.backend.param, len(question_ids)), tuple(question_ids))
+
+    def sample(self, tag=None, tag_weights=None):
+        """Returns a random question row as a dict, or None if nothing matches."""
+        question_id = self.sample_id(tag, tag_weights)
+        if question_id is None:
+            return None
+        question_data = self.fetch(question_id)
+        if question_data is None:
+            # Row was deleted since the index was built
+            self.refresh()
+            question_id = self.sample_id(tag, tag_weights)
+            if question_id is None:
+                return None
+            question_data = self.fetch(question_id)
+        return question_data
+
+
+class AsyncQuestionSampler:
+    """QuestionSampler for the ASGI app: the same QuestionIndex, queries awaited on an async_db pool.
+
+    Pass the sync sampler's index to share it, so an invalidation from the
+    question cache (e.g. after notify_questions_changed()) reaches both.
+    """
+
+    def __init__(self, pool, refresh_interval=60.0, rng=None, index=None):
+        self.pool = pool
+        self.index = index or QuestionIndex(refresh_interval, rng)
+        self._lock = asyncio.Lock()
+
+    async def refresh(self):
+        async with self._lock:
+            self.index.load(await self.pool.fetchall(INDEX_SQL))
+
+    def invalidate(self):
+        self.index.invalidate()
+
+    async def _maybe_refresh(self):
+        if self.index.stale:
+            await self.refresh()
+        elif self.index.check_due:
+            if not self.index.is_current((await self.pool.fetchall(MAX_ID_SQL))[0]['max_id']):
+                await self.refresh()
+
+    async def sample_id(self, tag=None, tag_weights=None):
+        await self._maybe_refresh()
+        return self.index.pick(tag, tag_weights)
+
+    async def fetch(self, question_id):
+        rows = await self.pool.fetchall(fetch_sql(self.pool.backend.param), (question_id,))
+        return rows[0] if rows else None
+
+    async def sample(self, tag=None, tag_weights=None):
+        """Returns a random question row as a dict, or None if nothing matches."""
+        question_id = await self.sample_id(tag, tag_weights)
+        if question_id is None:
+            return None
+        question_data = await self.fetch(question_id)
+        if question_data is None:
+            # Row was deleted since the index was built
+            await self.refresh()
+            question_id = await self.sample_id(tag, tag_weights)
+            if question_id is None:
+                return None
+            question_data = await self.fetch(question_id)
+        return question_data
+
+
+_sampler = None
+_sampler_lock = threading.Lock()
+
+
+def get_sampler():
+    """Returns the process-wide sampler over the shared connection pool."""
+    global _sampler
+    if _sampler is None:
+        with _sampler_lock:
+            if _sampler is None:
+                _sampler = QuestionSampler(get_pool())
+    return _sampler
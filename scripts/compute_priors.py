@@ -0,0 +1,97 @@
+"""Offline job: per-category answer statistics for the bots' priors.
+
+Reads every answer in the questions table once and writes, for each tag and
+each units value, the count, mean and standard deviation of log(answer)
+and a few quantiles. bot_belief.py loads the result once per process, so
+starting a round is a dict lookup rather than a scan of the table. Rerun it
+after populate_db.py and restart the app to pick up the new table.
+
+Usage:
+    python scripts/compute_priors.py
+    python scripts/compute_priors.py --output question_priors.json --min-count 10
+"""
+import argparse
+import json
+import math
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from bot_belief import priors_path
+from db_pool import get_pool
+
+QUANTILES = (5, 25, 50, 75, 95)
+
+
+def load_answers():
+    """Yields (answer, units, tags) for every question."""
+    pool = get_pool()
+    with pool.connection() as conn:
+        cursor = pool.backend.dict_cursor(conn)
+        cursor.execute("SELECT answer, units, tags FROM questions")
+        rows = cursor.fetchall()
+        cursor.close()
+    for row in rows:
+        yield float(row['answer']), row['units'], row['tags']
+
+
+def summarize(values):
+    """Statistics for one category from its (positive) answers."""
+    values = sorted(values)
+    logs = [math.log(v) for v in values]
+    log_mean = sum(logs) / len(logs)
+    log_std = math.sqrt(sum((x - log_mean) ** 2 for x in logs) / len(logs))
+    return {
+        'count': len(values),
+        'log_mean': log_mean,
+        'log_std': log_std,
+        'quantiles': {f"p{q}": values[min(len(values) - 1, int(len(values) * q / 100))] for q in QUANTILES},
+    }
+
+
+def compute_priors(rows, min_count=1):
+    by_tag = {}
+    by_units = {}
+    skipped = 0
+    for answer, units, tags in rows:
+        if answer <= 0:
+            # A lognormal can't hold these, and no current category produces them
+            skipped += 1
+            continue
+        for tag in (tags or '').split(','):
+            tag = tag.strip()
+            if tag:
+                by_tag.setdefault(tag, []).append(answer)
+        if units:
+            by_units.setdefault(units, []).append(answer)
+    return {
+        'generated_at': time.time(),
+        'skipped': skipped,
+        'tags': {tag: summarize(values) for tag, values in sorted(by_tag.items()) if len(values) >= min_count},
+        'units': {units: summarize(values) for units, values in sorted(by_units.items()) if len(values) >= min_count},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compute per-tag and per-units answer priors for the bots")
+    parser.add_argument('--output', default=priors_path())
+    parser.add_argument('--min-count', type=int, default=5, help="leave out categories with fewer answers")
+    args = parser.parse_args()
+
+    table = compute_priors(load_answers(), args.min_count)
+    tmp_path = f"{args.output}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(table, f, indent=2)
+    os.replace(tmp_path, args.output)
+
+    print(f"Wrote {len(table['tags'])} tags and {len(table['units'])} units to {args.output}"
+          + (f" ({table['skipped']} non-positive answers skipped)" if table['skipped'] else ""))
+    for kind in ('tags', 'units'):
+        for name, stats in table[kind].items():
+            print(f"  {kind[:-1]:<5} {name:<12} n={stats['count']:<6} median={stats['quantiles']['p50']:<12,.0f} "
+                  f"log sd={stats['log_std']:.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,162 @@
+"""Compares every damage formula in damage.py over a batch of trades.
+
+Trades come from batch_sim rounds between every ordered pair of bot classes
+(the default), from the trades logged by the web game (TRADE_LOG), or from a
+JSON-lines file of {true_answer, bid, ask, action[, trader]} rows. For each
+formula it prints the damage distribution, how long games would last if
+that formula were charged (bootstrapped from the same trades) and how many
+trades per second it evaluates.
+
+Usage:
+    python scripts/damage_harness.py --rounds 200000
+    python scripts/damage_harness.py --questions questions.jsonl --output damage.json
+    python scripts/damage_harness.py --store
+    python scripts/damage_harness.py --trades trades.jsonl
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from itertools import permutations
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import damage
+from batch_sim import simulate_rounds, PLAYER_ASKED
+from bot_strategies import BOT_CLASSES
+from game_engine import STARTING_CAPITAL
+from tournament import load_questions_file, load_questions_db
+
+PERCENTILES = (5, 50, 95, 99)
+
+
+def simulated_trades(true_values, rng):
+    """Splits true_values across every ordered pair of bot classes and returns the traded markets."""
+    pairs = list(permutations(BOT_CLASSES, 2))
+    columns = {'true_answer': [], 'bid': [], 'ask': [], 'buys': [], 'trader_is_player': []}
+    for (player_type, opponent_type), chunk in zip(pairs, np.array_split(true_values, len(pairs))):
+        rounds = simulate_rounds(player_type, opponent_type, chunk, rng=rng)
+        columns['true_answer'].append(chunk)
+        columns['bid'].append(rounds['bid'])
+        columns['ask'].append(rounds['ask'])
+        columns['buys'].append(rounds['buys'])
+        # The player trades on the bot's market when the player asked for it
+        columns['trader_is_player'].append(rounds['market_asked'] == PLAYER_ASKED)
+    return {name: np.concatenate(parts) for name, parts in columns.items()}
+
+
+def stored_trades():
+    """Every trade settled in the web game, from the TRADE_LOG file and its rotated backups."""
+    from log_config import trade_log_path
+    path = trade_log_path()
+    if not path:
+        return _columns([])
+    # Oldest first: trades.jsonl.N ... trades.jsonl.1, then trades.jsonl
+    backups = sorted(glob.glob(glob.escape(path) + '.[0-9]*'), key=lambda name: int(name.rsplit('.', 1)[1]),
+                     reverse=True)
+    return file_trades(*[name for name in backups + [path] if os.path.exists(name)])
+
+
+def file_trades(*paths):
+    rows = []
+    for path in paths:
+        with open(path) as f:
+            for line in f:
+                if line.strip():
+                    row = json.loads(line)
+                    rows.append((float(row['true_answer']), float(row['bid']), float(row['ask']),
+                                 row['action'] == 'buy', row.get('trader', 'player') == 'player'))
+    return _columns(rows)
+
+
+def _columns(rows):
+    names = ('true_answer', 'bid', 'ask', 'buys', 'trader_is_player')
+    if not rows:
+        return {name: np.array([]) for name in names}
+    return {name: np.array(values) for name, values in zip(names, zip(*rows))}
+
+
+def throughput(formula, trades, min_time=0.2):
+    """Trades per second, timing whole-array calls until min_time has passed."""
+    calls = 0
+    started = time.perf_counter()
+    while True:
+        formula(trades['true_answer'], trades['bid'], trades['ask'], trades['buys'])
+        calls += 1
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time:
+            return calls * len(trades['true_answer']) / elapsed
+
+
+def evaluate(trades, games, max_rounds, rng):
+    trader_lost = damage.trader_loses(trades['true_answer'], trades['bid'], trades['ask'], trades['buys'])
+    results = {}
+    for name, formula in damage.FORMULAS.items():
+        values = formula(trades['true_answer'], trades['bid'], trades['ask'], trades['buys'])
+        lengths = damage.game_lengths(values, trader_lost, trades['trader_is_player'], STARTING_CAPITAL,
+                                      games=games, max_rounds=max_rounds, rng=rng)
+        results[name] = {
+            'mean': float(values.mean()),
+            'zero_rate': float((values == 0).mean()),
+            'max': float(values.max()),
+            'percentiles': {f"p{p}": float(v) for p, v in zip(PERCENTILES, np.percentile(values, PERCENTILES))},
+            'game_rounds_median': float(np.median(lengths)),
+            'game_rounds_mean': float(lengths.mean()),
+            'game_rounds_p95': float(np.percentile(lengths, 95)),
+            'games_capped': float((lengths >= max_rounds).mean()),
+            'trades_per_second': throughput(formula, trades),
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare damage formulas over a batch of trades")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument('--store', action='store_true', help="use the trades logged by the web game (TRADE_LOG)")
+    source.add_argument('--trades', help="JSON-lines file of {true_answer, bid, ask, action[, trader]} rows")
+    source.add_argument('--questions', help="simulate on answers resampled from this question file")
+    source.add_argument('--from-db', action='store_true', help="simulate on answers resampled from the database")
+    parser.add_argument('--rounds', type=int, default=100000, help="simulated rounds, spread over every pairing")
+    parser.add_argument('--games', type=int, default=2000, help="bootstrapped games per formula")
+    parser.add_argument('--max-rounds', type=int, default=100)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="write the results as JSON here")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    if args.store:
+        trades = stored_trades()
+    elif args.trades:
+        trades = file_trades(args.trades)
+    else:
+        if args.questions or args.from_db:
+            questions = load_questions_file(args.questions) if args.questions else load_questions_db()
+            true_values = rng.choice(np.array([q['answer'] for q in questions]), args.rounds)
+        else:
+            # Log-uniform from 100 to 10M covers the scale of every question category
+            true_values = np.exp(rng.uniform(np.log(100), np.log(1e7), args.rounds))
+        trades = simulated_trades(true_values, rng)
+    if not len(trades['true_answer']):
+        sys.exit("No trades to evaluate.")
+
+    results = evaluate(trades, args.games, args.max_rounds, rng)
+    print(f"{len(trades['true_answer'])} trades, {STARTING_CAPITAL} starting capital")
+    print(f"{'formula':<18} {'mean':>12} {'p50':>10} {'p95':>12} {'p99':>12} {'zero':>6} "
+          f"{'rounds p50':>10} {'p95':>5} {'capped':>7} {'trades/s':>14}")
+    for name, row in results.items():
+        p = row['percentiles']
+        print(f"{name:<18} {row['mean']:>12,.1f} {p['p50']:>10,.0f} {p['p95']:>12,.0f} {p['p99']:>12,.0f} "
+              f"{row['zero_rate']:>6.1%} {row['game_rounds_median']:>10.0f} {row['game_rounds_p95']:>5.0f} "
+              f"{row['games_capped']:>7.1%} {row['trades_per_second']:>14,.0f}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'trades': int(len(trades['true_answer'])), 'seed': args.seed, 'results': results}, f, indent=2)
+        print(f"Wrote {args.output}")
+
+
+if __name__ == '__main__':
+    main()
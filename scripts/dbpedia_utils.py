@@ -1,18 +1,100 @@
-from SPARQLWrapper import SPARQLWrapper, JSON
+"""SPARQL queries against DBpedia, with an on-disk response cache.
 
-def fetch_dbpedia_data(query):
-    sparql = SPARQLWrapper("http://dbpedia.org/sparql")
+Raw JSON responses are cached in SPARQL_CACHE_DIR (scripts/.sparql_cache by
+default) under the SHA-256 of the query text, so reruns don't hit the
+network and can work fully offline. The category queries draw their
+sample in a seeded pseudo-random order (sample_order) instead of ORDER BY
+RAND(), so a given seed always returns the same rows and is cached like the
+harvest pages; another seed draws, and caches, another sample. Queries that
+still use RAND() aren't cached by default, since a cached one would be
+replayed on every run. DBPEDIA_ENDPOINT points the queries at another
+endpoint, e.g. scripts/sparql_standin.py.
+"""
+import hashlib
+import json
+import os
+import time
+
+DEFAULT_ENDPOINT = "http://dbpedia.org/sparql"
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.sparql_cache')
+
+def dbpedia_endpoint():
+    return os.environ.get('DBPEDIA_ENDPOINT', DEFAULT_ENDPOINT)
+
+def sparql_cache_dir():
+    return os.environ.get('SPARQL_CACHE_DIR', DEFAULT_CACHE_DIR)
+
+def query_key(query):
+    """Cache key for a query; indentation and blank lines don't change it."""
+    normalized = '\n'.join(line.strip() for line in query.strip().splitlines() if line.strip())
+    return hashlib.sha256(normalized.encode()).hexdigest()
+
+def is_sampled(query):
+    """True for queries that return a different random sample on every run."""
+    return 'RAND()' in query.upper()
+
+def sample_order(seed):
+    """ORDER BY key that shuffles rows by wikiPageID, the same way every time for the same seed."""
+    return f'MD5(CONCAT(STR(?pageID), "{int(seed)}"))'
+
+def run_query(query, endpoint=None, timeout=60):
+    # Imported here so cached runs work without SPARQLWrapper installed
+    from SPARQLWrapper import SPARQLWrapper, JSON
+    sparql = SPARQLWrapper(endpoint or dbpedia_endpoint())
     sparql.setReturnFormat(JSON)
     sparql.setQuery(query)
+    sparql.setTimeout(timeout)
+    return sparql.query().convert()
 
+def fetch_dbpedia_json(query, endpoint=None, cache_dir=None, refresh=False, retries=3, backoff=1.0, cache=None):
+    """Returns the raw JSON response for query, from the cache unless refresh is set.
+
+    cache=None caches only deterministic queries (see is_sampled); True caches
+    sampled ones too, e.g. to record fixtures, and False never touches the cache.
+    Network errors are retried with exponential backoff; the last one is raised.
+    """
+    if cache is None:
+        cache = not is_sampled(query)
+    cache_dir = cache_dir or sparql_cache_dir()
+    path = os.path.join(cache_dir, f"{query_key(query)}.json")
+    if cache and not refresh:
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            pass
+
+    for attempt in range(retries + 1):
+        try:
+            data = run_query(query, endpoint)
+            break
+        except ImportError:
+            raise
+        except Exception as e:
+            if attempt == retries:
+                raise
+            delay = backoff * 2 ** attempt
+            print(f"SPARQL query failed ({e}), retrying in {delay:.0f}s")
+            time.sleep(delay)
+
+    if not cache:
+        return data
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+    return data
+
+def fetch_dbpedia_data(query, **kwargs):
     try:
-        results = sparql.query().convert()
+        results = fetch_dbpedia_json(query, **kwargs)
         return results["results"]["bindings"]
     except Exception as e:
         print(f"An error occurred: {e}")
         return None
 
-def fetch_cities_population(limit=10, min_population=1000000, min_wikilinks=1000, max_page_id=10000000):
+def cities_population_query(limit=10, min_population=1000000, min_wikilinks=1000, max_page_id=10000000, seed=0):
     #make the questions less shit
     query = f"""
         PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
@@ -32,12 +114,15 @@ def fetch_cities_population(limit=10, min_population=1000000, min_wikilinks=1000
         }}
         GROUP BY ?city ?cityName ?population ?pageID
         HAVING (COUNT(?link) > {min_wikilinks})
-        ORDER BY RAND()
+        ORDER BY {sample_order(seed)}
         LIMIT {limit}
     """
-    return fetch_dbpedia_data(query)
+    return query
+
+def fetch_cities_population(limit=10, min_population=1000000, min_wikilinks=1000, max_page_id=10000000, seed=0, **kwargs):
+    return fetch_dbpedia_data(cities_population_query(limit=limit, min_population=min_population, min_wikilinks=min_wikilinks, max_page_id=max_page_id, seed=seed), **kwargs)
 
-def fetch_rivers_length(limit=10, min_length=500000, min_wikilinks=500, max_page_id=5000000):
+def rivers_length_query(limit=10, min_length=500000, min_wikilinks=500, max_page_id=5000000, seed=0):
     query = f"""
         PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
         PREFIX dbpedia-owl: <http://dbpedia.org/ontology/>
@@ -56,12 +141,15 @@ def fetch_rivers_length(limit=10, min_length=500000, min_wikilinks=500, max_page
         }}
         GROUP BY ?river ?riverName ?length ?pageID
         HAVING (COUNT(?link) > {min_wikilinks})
-        ORDER BY RAND()
+        ORDER BY {sample_order(seed)}
         LIMIT {limit}
     """
-    return fetch_dbpedia_data(query)
+    return query
 
-def fetch_mountains_elevation(limit=10, min_elevation=3000, min_wikilinks=200, max_page_id=8000000):
+def fetch_rivers_length(limit=10, min_length=500000, min_wikilinks=500, max_page_id=5000000, seed=0, **kwargs):
+    return fetch_dbpedia_data(rivers_length_query(limit=limit, min_length=min_length, min_wikilinks=min_wikilinks, max_page_id=max_page_id, seed=seed), **kwargs)
+
+def mountains_elevation_query(limit=10, min_elevation=3000, min_wikilinks=200, max_page_id=8000000, seed=0):
     query = f"""
         PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
         PREFIX dbpedia-owl: <http://dbpedia.org/ontology/>
@@ -80,12 +168,15 @@ def fetch_mountains_elevation(limit=10, min_elevation=3000, min_wikilinks=200, m
         }}
         GROUP BY ?mountain ?mountainName ?elevation ?pageID
         HAVING (COUNT(?link) > {min_wikilinks})
-        ORDER BY RAND()
+        ORDER BY {sample_order(seed)}
         LIMIT {limit}
      """
-    return fetch_dbpedia_data(query)
+    return query
+
+def fetch_mountains_elevation(limit=10, min_elevation=3000, min_wikilinks=200, max_page_id=8000000, seed=0, **kwargs):
+    return fetch_dbpedia_data(mountains_elevation_query(limit=limit, min_elevation=min_elevation, min_wikilinks=min_wikilinks, max_page_id=max_page_id, seed=seed), **kwargs)
 
-def fetch_companies_employees(limit=10, min_employees=10000, min_wikilinks=500, max_page_id=10000000):
+def companies_employees_query(limit=10, min_employees=10000, min_wikilinks=500, max_page_id=10000000, seed=0):
       query = f"""
         PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
         PREFIX dbpedia-owl: <http://dbpedia.org/ontology/>
@@ -104,7 +195,36 @@ def fetch_companies_employees(limit=10, min_employees=10000, min_wikilinks=500,
         }}
         GROUP BY ?company ?companyName ?employees ?pageID
         HAVING (COUNT(?link) > {min_wikilinks})
-        ORDER BY RAND()
+        ORDER BY {sample_order(seed)}
         LIMIT {limit}
       """
-      return fetch_dbpedia_data(query)
\ No newline at end of file
+      return query
+
+def fetch_companies_employees(limit=10, min_employees=10000, min_wikilinks=500, max_page_id=10000000, seed=0, **kwargs):
+    return fetch_dbpedia_data(companies_employees_query(limit=limit, min_employees=min_employees, min_wikilinks=min_wikilinks, max_page_id=max_page_id, seed=seed), **kwargs)
+
+def harvest_query(entity_class, value_property, name_var, value_var, min_value, after_page_id=0, page_size=1000):
+    """One page of every en-labelled entity_class with value_property > min_value, in wikiPageID order.
+
+    Pages are keyed on wikiPageID (pass the last one seen as after_page_id),
+    so they're stable across runs and cheap for the endpoint: no RAND(), no
+    aggregates and no OFFSET scan.
+    """
+    query = f"""
+        PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
+        PREFIX dbo: <http://dbpedia.org/ontology/>
+
+        SELECT ?{name_var} ?{value_var} ?pageID
+        WHERE {{
+            ?entity a dbo:{entity_class} ;
+                    rdfs:label ?{name_var} ;
+                    dbo:{value_property} ?{value_var} ;
+                    dbo:wikiPageID ?pageID .
+            FILTER(LANG(?{name_var}) = "en")
+            FILTER (?{value_var} > {min_value})
+            FILTER (?pageID > {after_page_id})
+        }}
+        ORDER BY ?pageID
+        LIMIT {page_size}
+    """
+    return query
@@ -0,0 +1,124 @@
+"""Bulk harvesting of question data from DBpedia, page by page.
+
+Where ingest.py takes a small random sample of each category, this walks
+every matching entity in wikiPageID order with keyset pagination, so a
+harvest can build a question bank of 100k+ rows. harvest() is a generator
+of per-page batches and never holds more than one page. The CLI appends each
+page to --output and then records the category's last page id in
+--checkpoint, so an interrupted harvest resumes where it stopped. A crash
+between those two writes repeats one page in --output; the question text is
+fixed per entity, so load_questions.py skips the repeats by question_hash.
+
+Pages go through dbpedia_utils' cache, so a harvest run once against
+DBpedia doubles as a recording that scripts/sparql_standin.py (or the cache
+alone) can replay offline.
+
+Usage:
+    python scripts/harvest.py --output bank.jsonl --page-size 2000
+    python scripts/harvest.py --categories cities rivers --max-rows 20000 --checkpoint harvest.json
+"""
+import argparse
+import json
+import os
+import time
+
+from dbpedia_utils import fetch_dbpedia_json, harvest_query
+from ingest import CATEGORIES
+
+# category -> (DBpedia class, property, name variable, value variable, minimum value).
+# The variable names match the ingest.py queries so its parsers work unchanged.
+HARVEST_SPECS = {
+    'cities': ('City', 'populationTotal', 'cityName', 'population', 100000),
+    'rivers': ('River', 'length', 'riverName', 'length', 50000),
+    'mountains': ('Mountain', 'elevation', 'mountainName', 'elevation', 1000),
+    'companies': ('Company', 'numberOfEmployees', 'companyName', 'employees', 1000),
+}
+
+
+def harvest(category, page_size=1000, after_page_id=0, **fetch_kwargs):
+    """Yields (last_page_id, rows) for each page of category, rows being (question, answer, units, tags).
+
+    An entity with several values only counts once, and the last page is the
+    first one that comes back short.
+    """
+    entity_class, value_property, name_var, value_var, min_value = HARVEST_SPECS[category]
+    parse = CATEGORIES[category][1]
+    while True:
+        query = harvest_query(entity_class, value_property, name_var, value_var, min_value,
+                              after_page_id=after_page_id, page_size=page_size)
+        results = fetch_dbpedia_json(query, **fetch_kwargs)['results']['bindings']
+        rows = []
+        seen = set()
+        for result in results:
+            page_id = int(result['pageID']['value'])
+            after_page_id = max(after_page_id, page_id)
+            if page_id in seen:
+                continue
+            seen.add(page_id)
+            try:
+                row = parse(result)
+            except (KeyError, ValueError, TypeError):
+                continue
+            if row:
+                rows.append(row)
+        if results:
+            yield after_page_id, rows
+        if len(results) < page_size:
+            return
+
+
+def load_checkpoint(path):
+    if path and os.path.exists(path):
+        with open(path) as f:
+            return json.load(f)
+    return {}
+
+
+def save_checkpoint(path, checkpoint):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(checkpoint, f)
+    os.replace(tmp_path, path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Harvest every matching DBpedia entity into a question file")
+    parser.add_argument('--categories', nargs='+', default=list(HARVEST_SPECS), choices=list(HARVEST_SPECS))
+    parser.add_argument('--page-size', type=int, default=1000)
+    parser.add_argument('--max-rows', type=int, help="stop each category after this many questions")
+    parser.add_argument('--output', default='questions.jsonl', help="JSON-lines file to append to")
+    parser.add_argument('--checkpoint', default='harvest_checkpoint.json')
+    parser.add_argument('--endpoint', help="SPARQL endpoint (default DBPEDIA_ENDPOINT or dbpedia.org)")
+    parser.add_argument('--no-cache', action='store_true', help="don't read or write the response cache")
+    args = parser.parse_args()
+
+    checkpoint = load_checkpoint(args.checkpoint)
+    fetch_kwargs = {'endpoint': args.endpoint}
+    if args.no_cache:
+        fetch_kwargs['cache'] = False
+    started = time.perf_counter()
+    with open(args.output, 'a') as out:
+        for category in args.categories:
+            state = checkpoint.setdefault(category, {'after_page_id': 0, 'rows': 0, 'done': False})
+            if state['done']:
+                print(f"{category}: already harvested ({state['rows']} questions)")
+                continue
+            for last_page_id, rows in harvest(category, args.page_size, state['after_page_id'], **fetch_kwargs):
+                for question, answer, units, tags in rows:
+                    out.write(json.dumps({'question': question, 'answer': answer, 'units': units, 'tags': tags}) + '\n')
+                out.flush()
+                state['after_page_id'] = last_page_id
+                state['rows'] += len(rows)
+                save_checkpoint(args.checkpoint, checkpoint)
+                print(f"  {category}: {state['rows']} questions, up to page id {last_page_id} "
+                      f"({time.perf_counter() - started:.1f}s)")
+                if args.max_rows and state['rows'] >= args.max_rows:
+                    break
+            else:
+                state['done'] = True
+                save_checkpoint(args.checkpoint, checkpoint)
+    print(f"Harvest finished in {time.perf_counter() - started:.1f}s; progress in {args.checkpoint}")
+
+
+if __name__ == '__main__':
+    main()
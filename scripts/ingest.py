@@ -0,0 +1,136 @@
+"""Fetches question data from DBpedia, one SPARQL query per category, concurrently.
+
+Each category is a query builder from dbpedia_utils plus a parser that turns
+a result row into a (question, answer, units, tags) tuple. The queries run
+on a bounded thread pool and go through dbpedia_utils' retrying fetch.
+Each query draws its sample in an order fixed by --seed, so a rerun with
+the same seed is served from the disk cache (offline too) and returns the
+same entities; pass another seed to draw new ones. --no-cache skips the
+cache altogether.
+populate_db.py uses collect_questions(); run this directly to dump the
+questions to a JSON-lines file instead (e.g. for tournament.py --questions).
+
+Usage:
+    python scripts/ingest.py --limit 50 --output questions.jsonl
+    python scripts/ingest.py --limit 50 --seed 7
+    DBPEDIA_ENDPOINT=http://localhost:8890/sparql python scripts/ingest.py --refresh
+"""
+import argparse
+import json
+import random
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+from dbpedia_utils import (fetch_dbpedia_data, cities_population_query, rivers_length_query,
+                           mountains_elevation_query, companies_employees_query)
+
+QUESTION_TEMPLATES = [
+    "What is the {property} of {entity}?",
+    "The {property} of {entity} is what?",
+    "How {property_adj} is {entity}?"
+]
+
+
+def _question(prop, entity, prop_adj):
+    # Picked by entity rather than at random, so fetching an entity again gives the
+    # same text (and question_hash) and the loaders skip it as a duplicate
+    template = QUESTION_TEMPLATES[zlib.crc32(entity.encode()) % len(QUESTION_TEMPLATES)]
+    return template.format(property=prop, entity=entity, property_adj=prop_adj)
+
+
+def parse_city(row):
+    population = int(row['population']['value'])
+    if population > 0:
+        return _question('population', row['cityName']['value'], 'large'), population, 'people', 'population,city'
+
+
+def parse_river(row):
+    length_km = float(row['length']['value']) / 1000
+    if length_km > 1:
+        return _question('length', row['riverName']['value'], 'long'), length_km, 'km', 'length,river'
+
+
+def parse_mountain(row):
+    elevation = float(row['elevation']['value'])
+    if elevation > 0:
+        return _question('elevation', row['mountainName']['value'], 'high'), elevation, 'meters', 'elevation,mountain'
+
+
+def parse_company(row):
+    num_employees = int(row['employees']['value'])
+    if num_employees > 0:
+        return (_question('number of employees', row['companyName']['value'], 'many employees'),
+                num_employees, 'employees', 'employees,company')
+
+
+# name -> (query builder, row parser)
+CATEGORIES = {
+    'cities': (cities_population_query, parse_city),
+    'rivers': (rivers_length_query, parse_river),
+    'mountains': (mountains_elevation_query, parse_mountain),
+    'companies': (companies_employees_query, parse_company),
+}
+
+
+def fetch_category(name, limit, seed=0, **fetch_kwargs):
+    """Runs one category's query and returns (name, rows, seconds); rows is [] if the query failed."""
+    build_query, parse = CATEGORIES[name]
+    started = time.perf_counter()
+    results = fetch_dbpedia_data(build_query(limit=limit, seed=seed), **fetch_kwargs) or []
+    rows = []
+    for result in results:
+        try:
+            row = parse(result)
+        except (KeyError, ValueError, TypeError):
+            continue
+        if row:
+            rows.append(row)
+    return name, rows, time.perf_counter() - started
+
+
+def collect_questions(limit=5, categories=None, concurrency=4, seed=0, **fetch_kwargs):
+    """Fetches every category (all of CATEGORIES by default) and returns the shuffled question tuples.
+
+    seed picks which sample of each category is drawn (see dbpedia_utils.sample_order).
+
+    fetch_kwargs go to dbpedia_utils.fetch_dbpedia_data (endpoint, cache_dir, refresh, retries, cache).
+    """
+    categories = categories or list(CATEGORIES)
+    all_data = []
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = [executor.submit(fetch_category, name, limit, seed, **fetch_kwargs) for name in categories]
+        for future in futures:
+            name, rows, seconds = future.result()
+            print(f"  {name}: {len(rows)} questions in {seconds:.2f}s")
+            all_data.extend(rows)
+    random.shuffle(all_data)
+    return all_data
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fetch question data from DBpedia")
+    parser.add_argument('--limit', type=int, default=5, help="results per category")
+    parser.add_argument('--categories', nargs='+', choices=list(CATEGORIES))
+    parser.add_argument('--concurrency', type=int, default=4, help="queries in flight at once")
+    parser.add_argument('--retries', type=int, default=3)
+    parser.add_argument('--refresh', action='store_true', help="ignore cached responses")
+    parser.add_argument('--seed', type=int, default=0,
+                        help="which sample of each category to draw; each seed is cached separately")
+    parser.add_argument('--no-cache', action='store_true', help="neither read nor write the response cache")
+    parser.add_argument('--endpoint', help="SPARQL endpoint (default DBPEDIA_ENDPOINT or dbpedia.org)")
+    parser.add_argument('--output', default='questions.jsonl')
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    fetch_kwargs = {'cache': False} if args.no_cache else {}
+    all_data = collect_questions(args.limit, args.categories, args.concurrency, args.seed, endpoint=args.endpoint,
+                                 refresh=args.refresh, retries=args.retries, **fetch_kwargs)
+    with open(args.output, 'w') as f:
+        for question, answer, units, tags in all_data:
+            f.write(json.dumps({'question': question, 'answer': answer, 'units': units, 'tags': tags}) + '\n')
+    print(f"Wrote {len(all_data)} questions to {args.output} in {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == '__main__':
+    main()
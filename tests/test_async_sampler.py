@@ -0,0 +1,88 @@
+import asyncio
+
+import pytest
+
+from conftest import question_rows
+from load_questions import bulk_load
+from question_cache import QuestionCache
+from question_sampler import AsyncQuestionSampler, QuestionSampler
+
+pytest.importorskip('aiosqlite')
+from async_db import AsyncConnectionPool, async_backend  # noqa: E402
+
+
+def run_async(question_pool, test):
+    """Runs test(async_pool) on a fresh event loop against question_pool's SQLite file."""
+    async def main():
+        pool = AsyncConnectionPool(async_backend(question_pool.backend), pool_size=2)
+        try:
+            return await test(pool)
+        finally:
+            await pool.close()
+    return asyncio.run(main())
+
+
+def test_async_sample_returns_a_stored_row(question_pool):
+    async def test(pool):
+        sampler = AsyncQuestionSampler(pool)
+        row = await sampler.sample('river')
+        assert row['units'] == 'km'
+        assert row['id'] in sampler.index.ids_by_tag['river']
+        assert await sampler.sample('no-such-tag') is None
+    run_async(question_pool, test)
+
+
+def test_async_sampler_refreshes_after_deletes(question_pool):
+    async def test(pool):
+        sampler = AsyncQuestionSampler(pool, refresh_interval=3600)
+        await sampler.sample_id()
+        with question_pool.connection() as conn:
+            conn.execute("DELETE FROM questions WHERE id > 1")
+            conn.commit()
+        for _ in range(5):
+            assert (await sampler.sample())['id'] == 1
+    run_async(question_pool, test)
+
+
+def test_cache_invalidation_reaches_the_async_sampler(question_pool, tmp_path):
+    cache = QuestionCache(QuestionSampler(question_pool, refresh_interval=3600), stamp_path=str(tmp_path / 'stamp'))
+
+    async def test(pool):
+        sampler = AsyncQuestionSampler(pool, index=cache.sampler.index)
+        await sampler.sample_id()
+        assert len(cache.sampler.index.ids) == 20
+        bulk_load(question_pool, question_rows(5, start=100))
+        await sampler.sample_id()
+        assert len(sampler.index.ids) == 20
+
+        cache.invalidate()
+        await sampler.sample_id()
+        assert len(sampler.index.ids) == 25
+    run_async(question_pool, test)
+    cache.stop()
+
+
+def test_rows_sampled_outside_the_cache_count_as_misses(question_pool, tmp_path):
+    cache = QuestionCache(QuestionSampler(question_pool), stamp_path=str(tmp_path / 'stamp'))
+    cache.stop()
+    assert cache.take_prefetched() is None
+    row = QuestionSampler(question_pool).fetch(3)
+    cache.store(row)
+    assert cache.get(3) is row
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['size']) == (1, 1, 1)
+
+
+def test_async_backend_follows_the_sync_configuration(monkeypatch, tmp_path):
+    from async_db import AsyncMySQLBackend, AsyncSQLiteBackend, async_backend_from_env
+    monkeypatch.setenv('DB_BACKEND', 'sqlite')
+    monkeypatch.setenv('SQLITE_PATH', str(tmp_path / 'q.db'))
+    backend = async_backend_from_env()
+    assert isinstance(backend, AsyncSQLiteBackend)
+    assert (backend.config.path, backend.param) == (str(tmp_path / 'q.db'), '?')
+
+    monkeypatch.setenv('DB_BACKEND', 'mysql')
+    monkeypatch.setenv('MYSQL_HOST', 'db.example')
+    backend = async_backend_from_env()
+    assert isinstance(backend, AsyncMySQLBackend)
+    assert (backend.config.host, backend.param) == ('db.example', '%s')
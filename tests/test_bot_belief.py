@@ -0,0 +1,40 @@
+import pytest
+
+from bot_strategies import BOT_CLASSES
+from game_engine import create_bot
+
+QUESTION = {'question': "How long is the Danube", 'answer': 2850, 'units': 'km', 'tags': 'length,river'}
+
+
+@pytest.mark.parametrize('bot_type', sorted(BOT_CLASSES))
+def test_blind_bot_starts_from_its_prior(bot_type):
+    bot = create_bot(None, bot_type, question_data=QUESTION)
+    assert bot.true_value is None
+    assert bot.current_estimate == bot.belief.estimate > 0
+
+
+@pytest.mark.parametrize('bot_type', sorted(BOT_CLASSES))
+def test_blind_bot_update_belief_goes_through_observe(bot_type):
+    bot = create_bot(None, bot_type, question_data=QUESTION)
+    sigma = bot.belief.sigma
+    bot.update_belief('set_width', 4000)
+    bot.update_belief('reduce_width', 3000)
+    assert bot.current_estimate == bot.belief.estimate
+    assert bot.belief.sigma < sigma
+
+
+def test_blind_bot_learns_from_the_players_market():
+    bot = create_bot(None, 'AggressiveBot', question_data=QUESTION)
+    before = bot.current_estimate
+    bot.observe('provide_market', bid=2800, ask=2900)
+    assert abs(bot.current_estimate - 2850) < abs(before - 2850)
+
+
+def test_informed_bot_ignores_observe():
+    bot = create_bot(2850.0, 'AggressiveBot')
+    estimate = bot.current_estimate
+    bot.observe('provide_market', bid=1, ask=2)
+    assert bot.belief is None
+    assert bot.current_estimate == estimate
+    bot.update_belief('reduce_width', 1000)
+    assert bot.current_estimate > 0
@@ -0,0 +1,54 @@
+import json
+
+import pytest
+
+from bot_strategies import SERIAL_VERSION, Bot
+from game_engine import create_bot
+
+QUESTION = {'question': "How long is the Danube", 'answer': 2850, 'units': 'km', 'tags': 'length,river'}
+
+
+def fields(bot):
+    return (type(bot).__name__, bot.true_value, bot.initial_estimate_noise, bot.current_estimate,
+            bot.std_dev_multiplier, bot.width_reduction_multiplier, bot.market_willingness)
+
+
+@pytest.mark.parametrize('bot_type', ['AggressiveBot', 'PassiveBot'])
+def test_tuple_round_trip(bot_type):
+    bot = create_bot(2850.0, bot_type, question_data=QUESTION)
+    data = bot.to_tuple()
+    assert data[0] == SERIAL_VERSION
+    restored = Bot.from_tuple(data)
+    assert fields(restored) == fields(bot)
+    assert restored.to_tuple() == data
+
+
+def test_tuple_survives_json():
+    bot = create_bot(None, 'AggressiveBot', question_data=QUESTION)
+    bot.belief.observe_width(500)
+    restored = Bot.from_tuple(json.loads(json.dumps(bot.to_tuple())))
+    assert fields(restored) == fields(bot)
+    assert restored.belief.to_list() == bot.belief.to_list()
+    assert restored.get_log() == []
+
+
+def test_version_1_tuple_has_no_belief():
+    bot = create_bot(2850.0, 'AggressiveBot', question_data=QUESTION)
+    restored = Bot.from_tuple([1] + list(bot.to_tuple()[1:8]))
+    assert fields(restored) == fields(bot)
+    assert restored.belief is None
+    assert restored.to_tuple()[0] == SERIAL_VERSION
+
+
+def test_unsupported_version_is_rejected():
+    data = list(create_bot(2850.0, 'AggressiveBot').to_tuple())
+    data[0] = SERIAL_VERSION + 1
+    with pytest.raises(ValueError, match="Unsupported bot serialization version"):
+        Bot.from_tuple(data)
+
+
+def test_unknown_class_is_rejected():
+    data = list(create_bot(2850.0, 'AggressiveBot').to_tuple())
+    data[1] = 'NoSuchBot'
+    with pytest.raises(ValueError, match="Unknown bot class"):
+        Bot.from_tuple(data)
@@ -0,0 +1,98 @@
+import threading
+
+import pytest
+
+from db_pool import ConnectionPool, PoolTimeout, SQLiteBackend, StorageBackend
+
+
+@pytest.fixture
+def pool(tmp_path):
+    pool = ConnectionPool(SQLiteBackend(str(tmp_path / 'pool.db')), pool_size=2, timeout=0.05)
+    yield pool
+    pool.close()
+
+
+def test_checkout_reuses_the_idle_connection(pool):
+    with pool.connection() as conn:
+        first = conn
+    with pool.connection() as conn:
+        assert conn is first
+    stats = pool.stats()
+    assert stats['checkouts'] == 2
+    assert stats['created'] == 1
+    assert stats['idle'] == 1
+
+
+def test_connections_are_not_shared_while_checked_out(pool):
+    with pool.connection() as a, pool.connection() as b:
+        assert a is not b
+    assert pool.stats()['idle'] == 2
+
+
+def test_checkout_times_out_when_the_pool_is_exhausted(pool):
+    with pool.connection(), pool.connection():
+        with pytest.raises(PoolTimeout):
+            pool.get()
+    stats = pool.stats()
+    assert stats['waits'] == 1
+    assert stats['timeouts'] == 1
+    # The slots came back, so checkouts work again
+    with pool.connection():
+        pass
+
+
+def test_waiting_checkout_gets_a_released_connection(pool):
+    held = [pool.get(), pool.get()]
+    timer = threading.Timer(0.01, pool.release, args=(held.pop(),))
+    timer.start()
+    conn = pool.get(timeout=1.0)
+    timer.join()
+    pool.release(conn)
+    pool.release(held.pop())
+    assert pool.stats()['waits'] == 1
+    assert pool.stats()['timeouts'] == 0
+
+
+def test_connection_is_discarded_after_an_error(pool):
+    with pytest.raises(RuntimeError):
+        with pool.connection() as conn:
+            broken = conn
+            raise RuntimeError("query failed")
+    with pool.connection() as conn:
+        assert conn is not broken
+    stats = pool.stats()
+    assert stats['discarded'] == 1
+    assert stats['errors'] == 1
+    assert stats['created'] == 2
+
+
+def test_unhealthy_idle_connection_is_replaced(tmp_path):
+    pool = ConnectionPool(SQLiteBackend(str(tmp_path / 'pool.db')), pool_size=1, health_check_interval=0)
+    with pool.connection() as conn:
+        stale = conn
+    stale.close()
+    with pool.connection() as conn:
+        assert conn is not stale
+        conn.execute("SELECT 1")
+    assert pool.stats()['discarded'] == 1
+    pool.close()
+
+
+def test_closed_pool_refuses_checkouts(pool):
+    pool.close()
+    with pytest.raises(PoolTimeout):
+        pool.get()
+
+
+def test_pool_size_must_be_positive(tmp_path):
+    with pytest.raises(ValueError):
+        ConnectionPool(SQLiteBackend(str(tmp_path / 'pool.db')), pool_size=0)
+
+
+def test_incomplete_backend_fails_when_created():
+    class ConnectOnly(StorageBackend):
+        def connect(self):
+            return None
+
+    with pytest.raises(TypeError, match="abstract"):
+        ConnectOnly()
@@ -0,0 +1,172 @@
+import pytest
+
+import game_engine
+from game_engine import STARTING_CAPITAL, GameState, InvalidMove, create_bot
+
+QUESTION = {'question': "How long is the Danube", 'answer': 2850, 'units': 'km', 'tags': 'length,river'}
+
+
+def new_game(first_mover='player', mode='battle'):
+    return game_engine.new_game(mode, QUESTION, create_bot(None, 'AggressiveBot', question_data=QUESTION),
+                                first_mover=first_mover)
+
+
+def quoted_by_bot(bid, ask):
+    """A game where the player asked for a market and the bot quoted bid/ask."""
+    state = new_game()
+    game_engine.set_initial_width(state, int(ask - bid))
+    state.current_mover = 'player'
+    game_engine.ask_for_market(state)
+    state.bid, state.ask, state.market_made, state.current_mover = bid, ask, True, 'player'
+    return state
+
+
+def test_new_game_starts_a_round():
+    state = new_game()
+    assert state.question == "How long is the Danube (in km)"
+    assert state.true_answer == 2850.0
+    assert (state.current_mover, state.current_width, state.market_maker) == ('player', None, None)
+    assert state.player_capital == state.bot_capital == STARTING_CAPITAL
+
+
+def test_bot_sets_the_initial_width_when_it_moves_first():
+    state = new_game(first_mover='bot')
+    game_engine.bot_move(state)
+    assert state.current_width >= 1
+    assert state.current_mover == 'player'
+
+
+def test_width_then_market_request():
+    state = new_game()
+    game_engine.set_initial_width(state, 1000)
+    assert (state.current_width, state.current_mover) == (1000, 'bot')
+
+    state.current_mover = 'player'
+    game_engine.reduce_width(state, 900)
+    assert (state.current_width, state.current_mover) == (900, 'bot')
+
+    state.current_mover = 'player'
+    game_engine.ask_for_market(state)
+    assert (state.market_maker, state.current_mover) == ('player', 'bot')
+    game_engine.bot_move(state)
+    assert state.market_made
+    assert state.ask - state.bid == pytest.approx(900, abs=1)
+    assert state.current_mover == 'player'
+
+
+@pytest.mark.parametrize('move, message', [
+    (lambda s: game_engine.set_initial_width(s, 0), "Initial width must be at least 1."),
+    (lambda s: game_engine.reduce_width(s, 10), "You can't reduce the width now."),
+    (lambda s: game_engine.ask_for_market(s), "You can't ask for a market now."),
+    (lambda s: game_engine.provide_market(s, 1, 2), "The bot hasn't asked you for a market."),
+    (lambda s: game_engine.player_trade(s, 'buy'), "There is no market to trade on."),
+    (lambda s: game_engine.player_trade(s, 'hold'), "Invalid trade action."),
+])
+def test_invalid_moves_at_the_start_of_a_round(move, message):
+    state = new_game()
+    with pytest.raises(InvalidMove, match=message):
+        move(state)
+    assert state.current_mover == 'player'
+
+
+def test_width_rules():
+    state = new_game()
+    game_engine.set_initial_width(state, 100)
+    state.current_mover = 'player'
+    with pytest.raises(InvalidMove, match="already been set"):
+        game_engine.set_initial_width(state, 50)
+    with pytest.raises(InvalidMove, match="at least 10%"):
+        game_engine.reduce_width(state, 95)
+    with pytest.raises(InvalidMove, match="less than 1"):
+        game_engine.reduce_width(state, 0)
+    assert state.current_width == 100
+
+
+def test_moves_out_of_turn_are_rejected():
+    state = new_game(first_mover='bot')
+    with pytest.raises(InvalidMove, match="not your turn"):
+        game_engine.set_initial_width(state, 100)
+    state.current_mover = 'player'
+    state.game_over = True
+    with pytest.raises(InvalidMove, match="game is over"):
+        game_engine.set_initial_width(state, 100)
+
+
+def test_player_buy_above_the_answer_loses():
+    state = quoted_by_bot(2800, 2900)
+    game_engine.player_trade(state, 'buy')
+    assert state.player_capital == STARTING_CAPITAL - 50
+    assert state.bot_capital == STARTING_CAPITAL
+    assert (state.winner, state.last_round_damage, state.round_ended) == ('bot', 50, True)
+
+
+def test_player_sell_above_the_answer_wins():
+    state = quoted_by_bot(2860, 2960)
+    game_engine.player_trade(state, 'sell')
+    assert state.bot_capital == STARTING_CAPITAL - 10
+    assert state.winner == 'player'
+
+
+def test_losing_all_capital_ends_the_game():
+    state = quoted_by_bot(2800, 2900)
+    state.player_capital = 30
+    game_engine.player_trade(state, 'buy')
+    assert state.game_over
+
+
+def test_bot_trades_on_the_players_market():
+    state = new_game()
+    game_engine.set_initial_width(state, 100)
+    state.current_mover = 'player'
+    state.market_maker = 'bot'
+    with pytest.raises(InvalidMove, match="spread must equal"):
+        game_engine.provide_market(state, 2800, 2850)
+    game_engine.provide_market(state, 2800, 2900)
+    assert (state.market_made, state.current_mover) == (True, 'bot')
+
+    messages = game_engine.bot_move(state)
+    assert state.round_ended
+    assert state.round_summary['damage'] == 50
+    assert state.player_capital + state.bot_capital == 2 * STARTING_CAPITAL - 50
+    assert messages[0][1].startswith("Round Summary:")
+
+
+def test_advance_starts_the_next_round():
+    state = quoted_by_bot(2800, 2900)
+    game_engine.player_trade(state, 'buy')
+    started = []
+
+    def next_round(state):
+        started.append(True)
+        game_engine.start_round(state, QUESTION, create_bot(None, 'PassiveBot', question_data=QUESTION), 'player')
+        return True
+
+    messages = game_engine.advance(state, next_round)
+    assert started == [True]
+    assert messages == [('info', "Round Complete! bot won. Damage: 50.0")]
+    assert (state.round_ended, state.current_width, state.bot_type_name) == (False, None, 'PassiveBot')
+    assert state.player_capital == STARTING_CAPITAL - 50
+
+
+def test_advance_ends_the_game_without_a_next_question():
+    state = quoted_by_bot(2800, 2900)
+    game_engine.player_trade(state, 'buy')
+    messages = game_engine.advance(state, lambda state: False)
+    assert state.game_over
+    assert messages[-1] == ('error', "Could not load a new question!")
+
+
+def test_advance_plays_bot_moves_until_the_players_turn():
+    state = new_game(first_mover='bot')
+    game_engine.advance(state, lambda state: False)
+    assert state.current_mover == 'player'
+    assert state.current_width is not None
+
+
+def test_game_state_round_trip():
+    state = new_game()
+    game_engine.set_initial_width(state, 100)
+    restored = GameState.from_dict(state.to_dict())
+    assert restored.to_dict() == state.to_dict()
+    assert type(restored.bot).__name__ == 'AggressiveBot'
+    assert restored.bot.current_estimate == state.bot.current_estimate
@@ -0,0 +1,37 @@
+import pytest
+
+from game_store import FileGameStore, GameStore, MemoryGameStore, SQLiteGameStore
+
+
+@pytest.fixture(params=['memory', 'sqlite', 'file'])
+def store(request, tmp_path):
+    if request.param == 'memory':
+        return MemoryGameStore()
+    if request.param == 'sqlite':
+        return SQLiteGameStore(str(tmp_path / 'games.db'))
+    return FileGameStore(str(tmp_path / 'games'))
+
+
+def test_save_load_delete(store):
+    game_id = store.create({'round': 1})
+    assert store.load(game_id) == {'round': 1}
+    store.save(game_id, {'round': 2})
+    assert list(store.iter_states()) == [{'round': 2}]
+    store.delete(game_id)
+    assert store.load(game_id) is None
+
+
+def test_expired_games_are_missing_and_purged(store):
+    store.ttl = -1
+    game_id = store.create({'round': 1})
+    assert store.load(game_id) is None
+    assert store.purge_expired() == 1
+
+
+def test_incomplete_store_fails_when_created():
+    class LoadOnly(GameStore):
+        def load(self, game_id):
+            return None
+
+    with pytest.raises(TypeError, match="abstract"):
+        LoadOnly()
@@ -0,0 +1,31 @@
+import json
+
+from dbpedia_utils import cities_population_query, is_sampled, query_key
+from ingest import CATEGORIES, collect_questions
+
+
+def binding(name, population):
+    return {'cityName': {'type': 'literal', 'value': name}, 'population': {'type': 'literal', 'value': str(population)}}
+
+
+def test_category_queries_are_deterministic_per_seed():
+    for build_query, _ in CATEGORIES.values():
+        assert not is_sampled(build_query(limit=5))
+        assert build_query(limit=5, seed=3) == build_query(limit=5, seed=3)
+        assert query_key(build_query(limit=5, seed=3)) != query_key(build_query(limit=5, seed=4))
+
+
+def test_rerun_with_the_same_seed_is_served_from_the_cache(tmp_path, capsys):
+    response = {'head': {'vars': ['cityName', 'population']},
+                'results': {'bindings': [binding("Berlin", 3850809), binding("Lagos", 15388000)]}}
+    (tmp_path / f"{query_key(cities_population_query(limit=2, seed=7))}.json").write_text(json.dumps(response))
+    # Nothing listens on the endpoint, so only cached responses can come back
+    offline = {'endpoint': 'http://127.0.0.1:9/sparql', 'cache_dir': str(tmp_path), 'retries': 0}
+
+    rows = collect_questions(limit=2, categories=['cities'], seed=7, **offline)
+    assert sorted(answer for _, answer, _, _ in rows) == [3850809, 15388000]
+    assert all(tags == 'population,city' for _, _, _, tags in rows)
+
+    assert collect_questions(limit=2, categories=['cities'], seed=8, **offline) == []
+    assert collect_questions(limit=2, categories=['cities'], seed=7, cache=False, **offline) == []
+    assert "An error occurred" in capsys.readouterr().out
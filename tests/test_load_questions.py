@@ -0,0 +1,42 @@
+from conftest import question_rows
+from load_questions import bulk_load, question_hash, read_questions
+
+
+def stored(pool):
+    with pool.connection() as conn:
+        return conn.execute("SELECT question, answer FROM questions ORDER BY id").fetchall()
+
+
+def test_duplicates_are_skipped(question_pool):
+    assert bulk_load(question_pool, question_rows(25)) == 5
+    assert bulk_load(question_pool, question_rows(25)) == 0
+    assert len(stored(question_pool)) == 25
+
+
+def test_duplicates_within_a_load_are_skipped(question_pool):
+    rows = question_rows(3, start=100)
+    assert bulk_load(question_pool, rows + rows, batch_size=2) == 3
+    assert len(stored(question_pool)) == 23
+
+
+def test_whitespace_does_not_make_a_new_question(question_pool):
+    question, answer, units, tags = question_rows(1)[0]
+    assert question_hash(f"  {question}\n") == question_hash(question)
+    assert bulk_load(question_pool, [(f" {question} ", answer, units, tags)]) == 0
+
+
+def test_update_overwrites_existing_answers(question_pool):
+    rows = [(question, answer * 10, units, tags) for question, answer, units, tags in question_rows(2)]
+    assert bulk_load(question_pool, rows) == 0
+    assert stored(question_pool)[0]['answer'] == 1.0
+    assert bulk_load(question_pool, rows, update=True) == 2
+    assert [row['answer'] for row in stored(question_pool)[:2]] == [10.0, 20.0]
+    assert len(stored(question_pool)) == 20
+
+
+def test_read_questions(tmp_path):
+    path = tmp_path / 'questions.jsonl'
+    path.write_text('{"question": "Q1?", "answer": 5, "units": "m", "tags": "a,b"}\n'
+                    '\n'
+                    '{"question": "Q2?", "answer": 7.5, "units": null}\n')
+    assert list(read_questions(str(path))) == [("Q1?", 5.0, "m", "a,b"), ("Q2?", 7.5, None, None)]
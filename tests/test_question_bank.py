@@ -0,0 +1,49 @@
+import pytest
+
+from conftest import question_rows
+from db_pool import ConnectionPool, SQLiteBackend
+from question_bank import export_questions, import_questions, read_binary, write_binary
+
+
+@pytest.fixture
+def empty_pool(tmp_path):
+    pool = ConnectionPool(SQLiteBackend(str(tmp_path / 'copy.db')), pool_size=1)
+    yield pool
+    pool.close()
+
+
+def table(pool):
+    with pool.connection() as conn:
+        return conn.execute("SELECT question, answer, units, tags FROM questions ORDER BY id").fetchall()
+
+
+@pytest.mark.parametrize('name', ['bank.jsonl', 'bank.ttqb'])
+def test_export_import_round_trip(question_pool, empty_pool, tmp_path, name):
+    path = str(tmp_path / name)
+    assert export_questions(question_pool, path, chunk_size=7) == 20
+    assert import_questions(empty_pool, path, batch_size=6) == 20
+    assert table(empty_pool) == table(question_pool)
+    # A second import finds nothing new
+    assert import_questions(empty_pool, path) == 0
+
+
+def test_binary_format_keeps_nulls_and_unicode(tmp_path):
+    path = str(tmp_path / 'bank.ttqb')
+    chunks = [[("Höhe der Zugspitze?", 2962.0, 'm', None), ("", 0.5, None, 'a,b')], question_rows(3)]
+    assert write_binary(path, chunks + [[]]) == 5
+    assert list(read_binary(path)) == chunks
+
+
+def test_binary_reader_rejects_other_files(tmp_path):
+    path = tmp_path / 'bank.ttqb'
+    path.write_bytes(b'not a bank')
+    with pytest.raises(ValueError, match="not a question bank file"):
+        list(read_binary(str(path)))
+
+
+def test_binary_reader_rejects_truncated_files(tmp_path):
+    path = tmp_path / 'bank.ttqb'
+    write_binary(str(path), [question_rows(3)])
+    path.write_bytes(path.read_bytes()[:-10])
+    with pytest.raises(ValueError, match="Truncated"):
+        list(read_binary(str(path)))
@@ -0,0 +1,56 @@
+from conftest import question_rows
+from load_questions import bulk_load
+from question_cache import QuestionCache, notify_questions_changed
+from question_sampler import QuestionSampler
+
+
+def execute(pool, sql, params=()):
+    with pool.connection() as conn:
+        conn.execute(sql, params)
+        conn.commit()
+
+
+def test_cache_counts_hits_misses_and_evictions(question_pool, tmp_path):
+    cache = QuestionCache(QuestionSampler(question_pool), capacity=2, stamp_path=str(tmp_path / 'stamp'))
+    assert cache.get(1)['id'] == 1
+    assert cache.get(1)['id'] == 1
+    cache.get(2)
+    cache.get(3)
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['evictions'], stats['size']) == (1, 3, 1, 2)
+
+
+def test_cache_rows_expire(question_pool, tmp_path):
+    cache = QuestionCache(QuestionSampler(question_pool), ttl=0, stamp_path=str(tmp_path / 'stamp'))
+    cache.get(1)
+    cache.get(1)
+    assert cache.stats()['expirations'] == 1
+    assert cache.stats()['misses'] == 2
+
+
+def test_invalidate_drops_rows_and_reloads_the_index(question_pool, tmp_path):
+    sampler = QuestionSampler(question_pool, refresh_interval=3600)
+    cache = QuestionCache(sampler, stamp_path=str(tmp_path / 'stamp'))
+    cache.get(1)
+    sampler.sample_id()
+    execute(question_pool, "UPDATE questions SET answer = 999 WHERE id = 1")
+    bulk_load(question_pool, question_rows(5, start=100))
+
+    cache.invalidate()
+    assert cache.stats()['size'] == 0
+    assert cache.get(1)['answer'] == 999
+    sampler.sample_id()
+    assert len(sampler.index.ids) == 25
+
+
+def test_stamp_change_invalidates_the_cache(question_pool, tmp_path):
+    stamp = str(tmp_path / 'stamp')
+    cache = QuestionCache(QuestionSampler(question_pool), stamp_path=stamp)
+    cache.get(1)
+    cache._check_stamp()
+    assert cache.stats()['invalidations'] == 0
+
+    notify_questions_changed(stamp)
+    cache._check_stamp()
+    assert cache.stats()['invalidations'] == 1
+    assert cache.stats()['size'] == 0
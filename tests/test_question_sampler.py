@@ -0,0 +1,55 @@
+import random
+
+from conftest import question_rows
+from load_questions import bulk_load
+from question_sampler import QuestionSampler
+
+
+def execute(pool, sql, params=()):
+    with pool.connection() as conn:
+        conn.execute(sql, params)
+        conn.commit()
+
+
+def test_sample_returns_a_stored_row(question_pool):
+    sampler = QuestionSampler(question_pool, rng=random.Random(0))
+    row = sampler.sample()
+    assert row['question'].startswith("How big is thing")
+    assert row['id'] in sampler.index.ids
+
+
+def test_sample_by_tag(question_pool):
+    sampler = QuestionSampler(question_pool, rng=random.Random(0))
+    for _ in range(20):
+        assert sampler.sample('river')['units'] == 'km'
+    assert sampler.sample('no-such-tag') is None
+    assert sampler.tags() == ['city', 'length', 'population', 'river']
+
+
+def test_index_is_reused_until_invalidated(question_pool):
+    sampler = QuestionSampler(question_pool, refresh_interval=3600, rng=random.Random(0))
+    sampler.sample_id()
+    bulk_load(question_pool, question_rows(5, start=100))
+    assert len(sampler.index.ids) == 20
+    sampler.sample_id()
+    assert len(sampler.index.ids) == 20
+
+    sampler.invalidate()
+    sampler.sample_id()
+    assert len(sampler.index.ids) == 25
+
+
+def test_new_rows_are_noticed_after_refresh_interval(question_pool):
+    sampler = QuestionSampler(question_pool, refresh_interval=0, rng=random.Random(0))
+    sampler.sample_id()
+    bulk_load(question_pool, question_rows(5, start=100))
+    sampler.sample_id()
+    assert len(sampler.index.ids) == 25
+
+
+def test_deleted_rows_force_a_refresh(question_pool):
+    sampler = QuestionSampler(question_pool, refresh_interval=3600, rng=random.Random(0))
+    sampler.sample_id()
+    execute(question_pool, "DELETE FROM questions WHERE id > 1")
+    for _ in range(10):
+        assert sampler.sample()['id'] == 1
@@ -0,0 +1,87 @@
+import json
+import logging
+
+import pytest
+
+import game_engine
+import log_config
+from game_engine import create_bot
+
+QUESTION = {'question': "How long is the Danube", 'answer': 2850, 'units': 'km', 'tags': 'length,river'}
+
+
+def quoted_by_bot(bid, ask):
+    state = game_engine.new_game('battle', QUESTION, create_bot(None, 'AggressiveBot', question_data=QUESTION))
+    game_engine.set_initial_width(state, int(ask - bid))
+    state.current_mover = 'player'
+    game_engine.ask_for_market(state)
+    state.bid, state.ask, state.market_made, state.current_mover = bid, ask, True, 'player'
+    return state
+
+
+@pytest.fixture
+def trades():
+    recorded = []
+    game_engine.trade_listeners.append(recorded.append)
+    yield recorded
+    game_engine.trade_listeners.remove(recorded.append)
+
+
+@pytest.fixture
+def logging_to(tmp_path):
+    """Runs configure_logging into tmp_path, then puts the root logger back."""
+    root = logging.getLogger()
+    saved = list(root.handlers), root.level
+
+    def configure(**kwargs):
+        return log_config.configure_logging(path=str(tmp_path / 'app.log'), levels={}, **kwargs)
+
+    yield configure
+    log_config.stop_logging()
+    root.handlers[:], root.level = saved
+    log_config.trade_logger.setLevel(logging.NOTSET)
+
+
+def test_listeners_see_player_and_bot_trades(trades):
+    state = quoted_by_bot(2800, 2900)
+    game_engine.player_trade(state, 'buy')
+    assert trades == [{'true_answer': 2850.0, 'bid': 2800, 'ask': 2900, 'action': 'buy', 'trader': 'player',
+                       'damage': 50, 'mode': 'battle', 'bot_type': 'AggressiveBot'}]
+
+    state = quoted_by_bot(2800, 2900)
+    state.market_maker, state.current_mover = 'bot', 'bot'
+    game_engine.bot_move(state)
+    assert trades[1]['trader'] == 'bot'
+
+
+def test_trades_go_to_their_own_file(logging_to, tmp_path):
+    trade_path = tmp_path / 'trades.jsonl'
+    logging_to(level='WARNING', trade_path=str(trade_path))
+    log_config.log_trade({'true_answer': 10.0, 'bid': 8, 'ask': 12, 'action': 'sell'})
+    logging.getLogger('game_engine').warning("not a trade")
+    log_config.stop_logging()
+
+    lines = [json.loads(line) for line in trade_path.read_text().splitlines()]
+    assert len(lines) == 1
+    assert lines[0]['action'] == 'sell' and 'ts' in lines[0]
+    app_log = (tmp_path / 'app.log').read_text()
+    assert "not a trade" in app_log
+    assert "sell" not in app_log
+
+
+def test_trade_log_is_off_by_default(logging_to, tmp_path, monkeypatch):
+    monkeypatch.delenv('TRADE_LOG', raising=False)
+    assert log_config.trade_log_path() is None
+    listener = logging_to()
+    assert len(listener.handlers) == 1
+
+
+def test_harness_reads_rotated_trade_files(tmp_path, monkeypatch):
+    from damage_harness import stored_trades
+    path = tmp_path / 'trades.jsonl'
+    row = {'true_answer': 10.0, 'bid': 8, 'ask': 12, 'action': 'buy'}
+    path.with_name('trades.jsonl.2').write_text(json.dumps(dict(row, bid=1)) + '\n')
+    path.with_name('trades.jsonl.1').write_text(json.dumps(dict(row, bid=2)) + '\n')
+    path.write_text(json.dumps(dict(row, bid=3)) + '\n')
+    monkeypatch.setenv('TRADE_LOG', str(path))
+    assert stored_trades()['bid'].tolist() == [1.0, 2.0, 3.0]